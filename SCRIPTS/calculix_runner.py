@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+CALCULIX RUNNER: Deck Generation and Parallel Local ccx Jobs
+
+EVIDENCE/multi_die_comparison.json records a local CalculiX study:
+S4 shells on a 21×21 node mesh, one SPRING1 per node as the support.
+This module builds such decks from a support-stiffness map K(x,y) (e.g.
+compute_cartesian_stiffness) and a through-thickness temperature
+difference ΔT(x,y), runs them with ccx, and reads the displacements back
+onto the grid:
+
+    build_deck()         K [N/m³], ΔT [K] on an ny × nx grid → .inp text
+    run_job()            one deck in its own scratch directory
+    run_jobs()           many decks on a bounded process pool, streamed
+    read_frd_displacements / read_dat_displacements   ccx output → U
+
+Deck conventions (units mm, N, MPa, K):
+    nodes        j × nx + i + 1 at (x, y, 0), the grid of generate_thermal_field
+    S4 elements  one per grid cell, counter-clockwise (normal +z)
+    SPRING1      one per node in DOF 3, stiffness K × tributary area; the
+                 node stiffnesses are quantized into at most SPRING_LEVELS
+                 element sets, each sharing one *SPRING card
+    temperature  T_ref initially; in the step, T_mid (default T_ref) on
+                 the mid-surface with gradient ΔT / h through the thickness
+    in-plane     rigid-body motion removed at the centre node (DOF 1, 2)
+                 and the last node of its row (DOF 2)
+
+The executable is taken from the ccx argument, else the CCX environment
+variable, else `ccx` on PATH. Every job runs single-threaded
+(OMP_NUM_THREADS=1), so the pool size is the number of concurrent solves.
+
+Run: python calculix_runner.py
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import NamedTuple
+
+import numpy as np
+
+from compute_cartesian_stiffness import ALPHA_GLASS, E_GLASS, NU_GLASS, H_GLASS
+
+# Maximum number of distinct spring stiffnesses (element sets) per deck
+SPRING_LEVELS = 64
+
+# Jobs in flight per pool worker when streaming a long job list
+JOBS_PER_WORKER = 2
+
+# Deck units: lengths in mm, stresses in MPa
+MM = 1e3
+MPA = 1e-6
+
+# =============================================================================
+# DECK GENERATION
+# =============================================================================
+
+def node_spring_stiffness(K, dx, dy):
+    """
+    Nodal spring stiffness [N/mm] from a distributed support stiffness.
+
+    Each node carries K × its tributary area: a full cell inside, half on
+    an edge and a quarter at a corner.
+
+    Args:
+        K: Support stiffness map [N/m³], shape (ny, nx)
+        dx, dy: Grid spacing [m]
+
+    Returns:
+        (ny, nx) array of spring stiffnesses [N/mm]
+    """
+    ny, nx = K.shape
+    wx = np.full(nx, dx)
+    wy = np.full(ny, dy)
+    wx[[0, -1]] /= 2
+    wy[[0, -1]] /= 2
+    return K * np.outer(wy, wx) / MM
+
+def quantize_springs(k, levels=SPRING_LEVELS):
+    """
+    Group nodal stiffnesses into at most `levels` shared values.
+
+    Exact when k has no more than `levels` distinct values; otherwise the
+    range is split into bins of equal ratio (K spans decades, so this
+    bounds the relative error) and each bin uses its mean.
+
+    Returns:
+        (values, index): values[index] approximates k elementwise
+    """
+    values, index = np.unique(k, return_inverse=True)
+    if len(values) <= levels:
+        return values, index.reshape(k.shape)
+    spacing = np.geomspace if k.min() > 0 else np.linspace
+    edges = spacing(k.min(), k.max(), levels + 1)
+    index = np.clip(np.searchsorted(edges, k, side="right") - 1, 0, levels - 1)
+    counts = np.bincount(index.ravel(), minlength=levels)
+    sums = np.bincount(index.ravel(), weights=k.ravel(), minlength=levels)
+    used = counts > 0
+    remap = np.cumsum(used) - 1
+    return sums[used] / counts[used], remap[index]
+
+def _lines(fmt, *columns):
+    return "\n".join(fmt % row for row in zip(*columns))
+
+def build_deck(K, dT, dx, dy, T_mid=None, T_ref=25.0, E=E_GLASS, nu=NU_GLASS, h=H_GLASS,
+               alpha=ALPHA_GLASS, levels=SPRING_LEVELS, title="PACKAGING OS PLATE"):
+    """
+    CalculiX input deck for a shell plate on nodal springs.
+
+    Args:
+        K: Support stiffness map [N/m³], shape (ny, nx)
+        dT: Through-thickness temperature difference, top minus bottom [K]
+        dx, dy: Grid spacing [m]
+        T_mid: Mid-surface temperature map [°C] (default: T_ref, no
+            membrane strain)
+        T_ref: Stress-free temperature [°C]
+        E, nu, h, alpha: Plate material and thickness (SI units)
+        levels: Maximum number of spring element sets
+
+    Returns:
+        Deck text
+    """
+    K = np.asarray(K, dtype=float)
+    ny, nx = K.shape
+    if np.shape(dT) != K.shape:
+        raise ValueError(f"dT shape {np.shape(dT)} does not match K shape {K.shape}")
+    n_nodes = nx * ny
+    ids = np.arange(1, n_nodes + 1).reshape(ny, nx)
+    x = np.arange(nx) * dx * MM
+    y = np.arange(ny) * dy * MM
+    X, Y = np.meshgrid(x - x[-1] / 2, y - y[-1] / 2)
+
+    n1, n2 = ids[:-1, :-1].ravel(), ids[:-1, 1:].ravel()
+    n3, n4 = ids[1:, 1:].ravel(), ids[1:, :-1].ravel()
+    elements = np.arange(1, len(n1) + 1)
+
+    k_values, level = quantize_springs(node_spring_stiffness(K, dx, dy), levels)
+    spring_ids = len(elements) + ids
+
+    T_mid = np.full(K.shape, T_ref) if T_mid is None else np.broadcast_to(T_mid, K.shape)
+    gradient = np.asarray(dT, dtype=float) / (h * MM)
+
+    centre = ids[ny // 2, nx // 2]
+    deck = [
+        "*HEADING", title,
+        "*NODE, NSET=NALL",
+        _lines("%d, %.9g, %.9g, 0", ids.ravel(), X.ravel(), Y.ravel()),
+        "*ELEMENT, TYPE=S4, ELSET=EPLATE",
+        _lines("%d, %d, %d, %d, %d", elements, n1, n2, n3, n4),
+        "*MATERIAL, NAME=GLASS",
+        "*ELASTIC", f"{E * MPA:.9g}, {nu:.9g}",
+        f"*EXPANSION, ZERO={T_ref:.9g}", f"{alpha:.9g}",
+        "*SHELL SECTION, ELSET=EPLATE, MATERIAL=GLASS", f"{h * MM:.9g}",
+    ]
+    for s, k in enumerate(k_values):
+        members = level.ravel() == s
+        deck += [
+            f"*ELEMENT, TYPE=SPRING1, ELSET=SPR{s}",
+            _lines("%d, %d", spring_ids.ravel()[members], ids.ravel()[members]),
+            f"*SPRING, ELSET=SPR{s}", "3", f"{k:.9g}",
+        ]
+    deck += [
+        "*BOUNDARY", f"{centre}, 1, 2", f"{ids[ny // 2, -1]}, 2, 2",
+        "*INITIAL CONDITIONS, TYPE=TEMPERATURE", f"NALL, {T_ref:.9g}",
+        "*STEP", "*STATIC",
+        "*TEMPERATURE",
+        _lines("%d, %.9g, %.9g", ids.ravel(), T_mid.ravel(), gradient.ravel()),
+        "*NODE FILE", "U",
+        "*NODE PRINT, NSET=NALL", "U",
+        "*END STEP",
+    ]
+    return "\n".join(deck) + "\n"
+
+# =============================================================================
+# OUTPUT PARSING
+# =============================================================================
+
+def read_frd_displacements(path, n_nodes):
+    """
+    Nodal displacements from the last DISP block of a .frd result file.
+
+    Records are fixed width: " -1", node (I10), then E12.5 components.
+
+    Returns:
+        (n_nodes, 3) array [mm]; row i is node i + 1
+    """
+    U = None
+    block = None
+    with open(path) as f:
+        for line in f:
+            if line.startswith(" -4"):
+                block = np.full((n_nodes, 3), np.nan) if line.split()[1] == "DISP" else None
+            elif block is not None and line.startswith(" -1"):
+                node = int(line[3:13])
+                if node <= n_nodes:
+                    block[node - 1] = [float(line[13 + 12 * c:25 + 12 * c]) for c in range(3)]
+            elif block is not None and line.startswith(" -3"):
+                U, block = block, None
+    if U is None:
+        raise ValueError(f"No DISP block in {path}")
+    return U
+
+def read_dat_displacements(path, n_nodes):
+    """
+    Nodal displacements from the last "displacements" table of a .dat file.
+
+    Returns:
+        (n_nodes, 3) array [mm]; row i is node i + 1
+    """
+    U = None
+    block = None
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if line.lstrip().startswith("displacements"):
+                block = np.full((n_nodes, 3), np.nan)
+                U = block
+            elif block is not None and len(fields) == 4:
+                node = int(fields[0])
+                if node <= n_nodes:
+                    block[node - 1] = [float(v) for v in fields[1:]]
+            elif fields and block is not None and not fields[0].isdigit():
+                block = None
+    if U is None:
+        raise ValueError(f"No displacement table in {path}")
+    return U
+
+# =============================================================================
+# JOBS
+# =============================================================================
+
+class CalculixJob(NamedTuple):
+    """One plate deck: support stiffness, thermal load and grid spacing."""
+    name: str
+    K: np.ndarray
+    dT: np.ndarray
+    dx: float
+    dy: float
+    T_mid: np.ndarray = None
+
+class CalculixResult(NamedTuple):
+    """
+    Outcome of one job.
+
+    w is the out-of-plane displacement [m] on the job grid, or None if
+    the job failed; error then holds the reason and the solver's tail.
+    """
+    name: str
+    w: np.ndarray
+    W_pv_nm: float
+    returncode: int
+    wall_time_s: float
+    scratch: str
+    error: str
+
+def find_ccx(ccx=None):
+    """Resolve the ccx executable: argument, then $CCX, then PATH."""
+    candidate = ccx or os.environ.get("CCX") or shutil.which("ccx")
+    if not candidate or not os.path.exists(candidate):
+        raise FileNotFoundError("CalculiX ccx not found: pass ccx=..., set CCX, or add ccx to PATH")
+    return os.path.abspath(candidate)
+
+def run_job(job, ccx, scratch_root=None, keep=False, timeout=None):
+    """
+    Write one deck into a fresh scratch directory, run ccx, read U back.
+
+    Args:
+        job: CalculixJob
+        ccx: Path of the ccx executable
+        scratch_root: Parent of the per-job directory (default: system temp)
+        keep: Keep the scratch directory (its path is returned)
+        timeout: Seconds before the solve is killed
+
+    Returns:
+        CalculixResult
+    """
+    t0 = time.perf_counter()
+    # The job name only labels the directory; keep path separators out of it
+    scratch = tempfile.mkdtemp(prefix=re.sub(r"[^\w.-]", "_", job.name) + "-", dir=scratch_root)
+    ny, nx = np.shape(job.K)
+    returncode, w, error = -1, None, None
+    proc = None
+    try:
+        with open(os.path.join(scratch, "job.inp"), "w") as f:
+            f.write(build_deck(job.K, job.dT, job.dx, job.dy, T_mid=job.T_mid))
+        env = dict(os.environ, OMP_NUM_THREADS="1", CCX_NPROC_EQUATION_SOLVER="1")
+        proc = subprocess.run([ccx, "-i", "job"], cwd=scratch, env=env, capture_output=True,
+                              text=True, timeout=timeout)
+        returncode = proc.returncode
+        if returncode != 0:
+            raise RuntimeError(f"ccx exited with status {returncode}")
+        frd, dat = os.path.join(scratch, "job.frd"), os.path.join(scratch, "job.dat")
+        if os.path.exists(frd) and os.path.getsize(frd):
+            U = read_frd_displacements(frd, nx * ny)
+        else:
+            U = read_dat_displacements(dat, nx * ny)
+        if np.isnan(U).any():
+            raise ValueError("displacements missing for some nodes")
+        w = U[:, 2].reshape(ny, nx) / MM
+    except subprocess.TimeoutExpired:
+        error = f"timed out after {timeout} s"
+    except Exception as e:
+        tail = proc.stdout[-2000:] if proc is not None else traceback.format_exc()
+        error = f"{type(e).__name__}: {e}\n{tail}"
+    finally:
+        if not keep:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    W_pv_nm = float(np.ptp(w) * 1e9) if w is not None else float("nan")
+    return CalculixResult(job.name, w, W_pv_nm, returncode, time.perf_counter() - t0,
+                          scratch if keep else None, error)
+
+def job_inputs(job, ccx):
+    """Everything a job's result depends on, as fem_cache key inputs."""
+    return {
+        "solver": "calculix S4+SPRING1",
+        "ccx": ccx,
+        "K": np.asarray(job.K, dtype=float),
+        "dT": np.asarray(job.dT, dtype=float),
+        "T_mid": None if job.T_mid is None else np.asarray(job.T_mid, dtype=float),
+        "dx": job.dx,
+        "dy": job.dy,
+        "spring_levels": SPRING_LEVELS,
+    }
+
+def _store(cache, inputs, result):
+    if cache is not None and result.error is None:
+        cache.put(inputs, {"w": result.w}, {"W_pv_nm": result.W_pv_nm,
+                                            "wall_time_s": result.wall_time_s})
+
+def _collect(pending, cache):
+    """Wait for at least one pending job; store and yield what finished."""
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        result = future.result()
+        _store(cache, pending.pop(future), result)
+        yield result
+
+def run_jobs(jobs, ccx=None, workers=None, scratch_root=None, keep=False, timeout=None,
+             cache=None):
+    """
+    Run many jobs on a bounded process pool, yielding results as they finish.
+
+    jobs may be any iterable, including a generator over thousands of
+    cases: at most JOBS_PER_WORKER × workers jobs are pending at once.
+
+    Args:
+        jobs: Iterable of CalculixJob
+        ccx: ccx executable (see find_ccx)
+        workers: Concurrent solves (default: one per core)
+        scratch_root, keep, timeout: As for run_job
+        cache: Optional fem_cache.FEMCache; jobs whose inputs are stored
+            are answered from it without running ccx (wall_time_s = 0),
+            and successful runs are added to it
+
+    Yields:
+        CalculixResult, in completion order
+    """
+    ccx = find_ccx(ccx)
+    workers = workers or os.cpu_count() or 1
+
+    def lookups():
+        for job in jobs:
+            inputs = cached = None
+            if cache is not None:
+                inputs = job_inputs(job, ccx)
+                cached = cache.get(inputs)
+            yield job, inputs, cached
+
+    def from_cache(job, cached):
+        return CalculixResult(job.name, cached.fields["w"], cached.metrics["W_pv_nm"], 0, 0.0,
+                              None, None)
+
+    if workers == 1:
+        for job, inputs, cached in lookups():
+            if cached is not None:
+                yield from_cache(job, cached)
+                continue
+            result = run_job(job, ccx, scratch_root, keep, timeout)
+            _store(cache, inputs, result)
+            yield result
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending = {}
+        for job, inputs, cached in lookups():
+            if cached is not None:
+                yield from_cache(job, cached)
+                continue
+            pending[pool.submit(run_job, job, ccx, scratch_root, keep, timeout)] = inputs
+            if len(pending) >= JOBS_PER_WORKER * workers:
+                yield from _collect(pending, cache)
+        while pending:
+            yield from _collect(pending, cache)
+
+# =============================================================================
+# MAIN DEMONSTRATION
+# =============================================================================
+
+# Stand-in for ccx when CalculiX is not installed: reads the deck's nodes
+# and temperature gradients and writes uz = -1e-3 × gradient to job.frd
+STAND_IN_CCX = r'''#!{python}
+import sys
+job = sys.argv[sys.argv.index("-i") + 1]
+nodes, section = [], None
+for line in open(job + ".inp"):
+    if line.startswith("*"):
+        section = line.split(",")[0].strip().upper()
+    elif section == "*TEMPERATURE":
+        node, _, gradient = line.split(",")
+        nodes.append((int(node), -1e-3 * float(gradient)))
+with open(job + ".frd", "w") as f:
+    f.write(" -4  DISP        4    1\n")
+    for node, uz in nodes:
+        f.write(" -1%10d%12.5E%12.5E%12.5E\n" % (node, 0.0, 0.0, uz))
+    f.write(" -3\n")
+'''
+
+def main():
+    import sys
+
+    from compute_cartesian_stiffness import (
+        PANEL_WIDTH, PANEL_HEIGHT, generate_thermal_field, compute_cartesian_stiffness,
+    )
+
+    print("=" * 72)
+    print("CALCULIX RUNNER: Deck Generation and Parallel ccx Jobs")
+    print("=" * 72)
+
+    # The multi-die study mesh: 21 × 21 nodes
+    nx = ny = 21
+    dx, dy = PANEL_WIDTH / (nx - 1), PANEL_HEIGHT / (ny - 1)
+    T, _, _ = generate_thermal_field(nx, ny, pattern="die_array")
+    K, _, _ = compute_cartesian_stiffness(T, dx, dy)
+    dT = T - T.min()
+    deck = build_deck(K, dT, dx, dy)
+    k_values, _ = quantize_springs(node_spring_stiffness(K, dx, dy))
+    print(f"\nDeck for a {nx} × {ny} mesh: {nx * ny} nodes, {(nx - 1) * (ny - 1)} S4, "
+          f"{nx * ny} SPRING1 in {len(k_values)} stiffness sets, "
+          f"{len(deck) / 1024:.0f} KiB")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            ccx = find_ccx()
+            stand_in = False
+            print(f"ccx: {ccx}")
+        except FileNotFoundError:
+            ccx = os.path.join(tmp, "ccx")
+            with open(ccx, "w") as f:
+                f.write(STAND_IN_CCX.format(python=sys.executable))
+            os.chmod(ccx, 0o755)
+            stand_in = True
+            print("ccx: not installed, using a stand-in that echoes -1e-3 × ∇T as uz")
+
+        # One job per power scale of the die-array load
+        scales = np.linspace(0.5, 2.0, 64)
+        jobs = (CalculixJob(f"die_array_{s:.3f}", K, s * dT, dx, dy) for s in scales)
+        t0 = time.perf_counter()
+        results = sorted(run_jobs(jobs, ccx, scratch_root=tmp), key=lambda r: r.name)
+        wall = time.perf_counter() - t0
+        left = os.listdir(tmp)
+
+        # The same sweep again through a FEMCache: the first pass fills it,
+        # the second is answered without starting ccx
+        from fem_cache import FEMCache
+        cache = FEMCache(os.path.join(tmp, "fem_cache"))
+        passes = []
+        for _ in range(2):
+            t0 = time.perf_counter()
+            jobs = (CalculixJob(f"die_array_{s:.3f}", K, s * dT, dx, dy) for s in scales)
+            cached = sorted(run_jobs(jobs, ccx, scratch_root=tmp, cache=cache), key=lambda r: r.name)
+            passes.append(time.perf_counter() - t0)
+
+    failed = [r for r in results if r.error]
+    print(f"\n{len(results)} jobs, {os.cpu_count()} worker(s): {wall:.2f} s "
+          f"({len(results) / wall:.0f} jobs/s), {len(failed)} failed")
+    print(f"Scratch directories left behind: {len([d for d in left if d != 'ccx'])}")
+    print(f"Through a FEMCache: {passes[0]:.2f} s filling, {passes[1]:.2f} s replaying "
+          f"({cache.hits} hits), results identical: "
+          f"{all(np.array_equal(a.w, b.w) for a, b in zip(results, cached))}")
+    for r in results[::16]:
+        print(f"  {r.name:<18} W_pv = {r.W_pv_nm:10.1f} nm  ({r.wall_time_s * 1e3:.0f} ms)")
+
+    if stand_in:
+        h_mm = H_GLASS * MM
+        exact = all(np.allclose(r.w, -1e-6 * s * dT / h_mm, rtol=1e-5, atol=1e-12)
+                    for r, s in zip(results, scales))
+        print(f"Displacements read back through .frd match the stand-in: {exact}")
+    print("=" * 72)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+CLIFF LOCATOR: Adaptive Bisection of Operating-Region Boundaries in k_azi
+
+kazi_dense_sweep.json spends 41 solver runs on a uniform 0.05 grid to
+find where the chaos cliff starts and ends. Most of those runs land
+deep inside a region whose label is never in doubt. This module samples
+adaptively instead:
+
+    1. Evaluate a coarse grid of k_azi values (default 9 points).
+    2. Label every sample with a classifier (warpage band, and
+       "unstable" where the replicate CV exceeds a limit).
+    3. Bisect every interval between neighbours whose labels differ, or
+       whose warpage changes by more than a factor 10^max_log_change,
+       as long as the interval is wider than the tolerance.
+    4. Repeat until no interval needs splitting.
+
+Each round's midpoints go to the evaluator as one batch, so an evaluator
+backed by a process pool (calculix_runner.run_jobs) solves them
+concurrently. Every boundary comes back bracketed by two samples no more
+than tol apart.
+
+Bisection only sees a region if some pair of neighbouring samples
+straddles it. An excursion narrower than the coarse spacing with the
+same label on both sides (the single-case spikes of kazi_dense beyond
+k_azi = 1.15) stays invisible; raise `initial` where that matters.
+
+Evaluators are callables k_azi (n,) → W_pv [nm] (n, m), m replicate
+columns (loads, mesh densities, seeds):
+
+    plate_evaluator()      plate_solver on the azimuthal support
+    calculix_evaluator()   one ccx job per (k_azi, load)
+    evidence_evaluator()   lookup of recorded cases (no solver at all)
+    cached()               wraps any of them in a fem_cache.FEMCache
+
+Run: python cliff_locator.py
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+# Default coarse grid and boundary tolerance in k_azi
+INITIAL_SAMPLES = 9
+BOUNDARY_TOLERANCE = 0.05
+
+# Hard cap on evaluations per locate() call
+MAX_EVALUATIONS = 200
+
+# =============================================================================
+# CLASSIFIERS
+# =============================================================================
+
+def band_classifier(edges_nm, names, cv_limit_percent=None):
+    """
+    Label samples by the warpage band of their worst replicate.
+
+    Args:
+        edges_nm: Increasing band edges [nm]
+        names: len(edges_nm) + 1 band labels, lowest band first
+        cv_limit_percent: Label samples whose CV across replicates exceeds
+            this "unstable" (None: never)
+
+    Returns:
+        classify(W) for W of shape (n, m), returning (n,) labels
+    """
+    edges = np.asarray(edges_nm, dtype=float)
+    names = np.asarray(names)
+    if len(names) != len(edges) + 1:
+        raise ValueError(f"{len(edges)} edges need {len(edges) + 1} names, got {len(names)}")
+
+    def classify(W):
+        labels = names[np.searchsorted(edges, W.max(axis=1), side="right")].astype(object)
+        if cv_limit_percent is not None and W.shape[1] > 1:
+            cv = W.std(axis=1, ddof=1) / W.mean(axis=1) * 100
+            labels[cv > cv_limit_percent] = "unstable"
+        return labels
+
+    return classify
+
+# =============================================================================
+# EVALUATORS
+# =============================================================================
+
+def plate_evaluator(loads=("scan", "gradient", "die_array"), n_harmonic=2, nx=60, ny=60):
+    """
+    Plate warpage on max(K_0 [1 + k_azi cos(nΘ)], K_MIN), one column per load.
+    """
+    from compute_cartesian_stiffness import PANEL_WIDTH, PANEL_HEIGHT, generate_thermal_field
+    from harmonic_sweep import AzimuthalBasis
+    from plate_solver import PlateFactorization, thermal_load
+
+    dx, dy = PANEL_WIDTH / (nx - 1), PANEL_HEIGHT / (ny - 1)
+    T_stack, X, Y = generate_thermal_field(nx, ny, pattern=list(loads))
+    Q = thermal_load(T_stack, dx, dy)
+    basis = AzimuthalBasis(X, Y)
+
+    def evaluate(k_azi):
+        K = basis.stiffness(k_azi, [n_harmonic])[:, 0]
+        return np.array([np.ptp(PlateFactorization(Ki, dx, dy).solve(Q), axis=(-2, -1)) * 1e9
+                         for Ki in K])
+
+    return evaluate
+
+def calculix_evaluator(ccx=None, loads=("scan", "gradient", "die_array"), n_harmonic=2,
+                       nx=21, ny=21, workers=None, cache=None):
+    """
+    CalculiX warpage on the same support, one ccx job per (k_azi, load).
+
+    A round's jobs run together on calculix_runner's process pool; failed
+    jobs raise RuntimeError.
+    """
+    from calculix_runner import CalculixJob, run_jobs
+    from compute_cartesian_stiffness import PANEL_WIDTH, PANEL_HEIGHT, generate_thermal_field
+    from harmonic_sweep import AzimuthalBasis
+
+    dx, dy = PANEL_WIDTH / (nx - 1), PANEL_HEIGHT / (ny - 1)
+    T_stack, X, Y = generate_thermal_field(nx, ny, pattern=list(loads))
+    dT = T_stack - T_stack.min(axis=(-2, -1), keepdims=True)
+    basis = AzimuthalBasis(X, Y)
+
+    def evaluate(k_azi):
+        K = basis.stiffness(k_azi, [n_harmonic])[:, 0]
+        jobs = (CalculixJob(f"k{i}_{j}", K[i], dT[j], dx, dy)
+                for i in range(len(K)) for j in range(len(loads)))
+        W = np.full((len(K), len(loads)), np.nan)
+        for r in run_jobs(jobs, ccx, workers=workers, cache=cache):
+            if r.error:
+                raise RuntimeError(f"ccx job {r.name} failed: {r.error}")
+            i, j = map(int, r.name[1:].split("_"))
+            W[i, j] = r.W_pv_nm
+        return W
+
+    return evaluate
+
+def evidence_evaluator(name="kazi_dense", value="W_pv_nm", atol=1e-6):
+    """
+    Recorded cases of an evidence table, one column per case at a k_azi.
+
+    Asking for a k_azi that was never run raises KeyError, so pair this
+    with locate(grid=...) on the recorded spacing.
+    """
+    from evidence_query import CaseTable
+
+    cases = CaseTable.from_evidence(name)
+    k, W = cases.column("k_azi"), cases.column(value)
+
+    def evaluate(k_azi):
+        rows = []
+        for ki in k_azi:
+            hit = np.abs(k - ki) <= atol
+            if not hit.any():
+                raise KeyError(f"{name} has no case at k_azi = {ki:g}")
+            rows.append(W[hit])
+        if len({len(r) for r in rows}) > 1:
+            raise ValueError(f"{name} has unequal replicate counts across k_azi")
+        return np.array(rows, dtype=float)
+
+    return evaluate
+
+def cached(evaluate, cache, tag):
+    """
+    Answer repeated k_azi values from a FEMCache.
+
+    Args:
+        evaluate: Any evaluator
+        cache: fem_cache.FEMCache
+        tag: Dict describing the evaluator (solver, loads, mesh, ...), so
+            different evaluators never share entries
+
+    Returns:
+        Evaluator with the same signature
+    """
+    def evaluate_cached(k_azi):
+        inputs = [dict(tag, k_azi=float(k)) for k in k_azi]
+        hits = [cache.get(i) for i in inputs]
+        missing = [n for n, hit in enumerate(hits) if hit is None]
+        W = [None if hit is None else hit.fields["W_pv_nm"] for hit in hits]
+        if missing:
+            for n, w in zip(missing, evaluate(np.asarray(k_azi, dtype=float)[missing])):
+                cache.put(inputs[n], {"W_pv_nm": w})
+                W[n] = w
+        return np.array(W)
+
+    return evaluate_cached
+
+# =============================================================================
+# LOCATOR
+# =============================================================================
+
+class RegionMap(NamedTuple):
+    """Samples in increasing k_azi and the regions they resolve."""
+    k_azi: np.ndarray                       # (n,)
+    W_pv_nm: np.ndarray                     # (n, m)
+    labels: np.ndarray                      # (n,)
+    evaluations: int                        # evaluator calls, in k_azi values
+    rounds: int
+
+    def regions(self):
+        """
+        [(label, k_start, k_end)] with each boundary at the midpoint of its
+        bracketing samples.
+        """
+        change = np.flatnonzero(self.labels[1:] != self.labels[:-1])
+        cuts = np.r_[self.k_azi[0], (self.k_azi[change] + self.k_azi[change + 1]) / 2,
+                     self.k_azi[-1]]
+        starts = np.r_[0, change + 1]
+        return [(self.labels[s], float(a), float(b)) for s, a, b in zip(starts, cuts[:-1], cuts[1:])]
+
+    def brackets(self):
+        """[(k_below, k_above)] sample pairs around every boundary."""
+        change = np.flatnonzero(self.labels[1:] != self.labels[:-1])
+        return [(float(self.k_azi[i]), float(self.k_azi[i + 1])) for i in change]
+
+    def label_at(self, k_azi):
+        """Label of the region containing each k_azi."""
+        regions = self.regions()
+        cuts = np.array([end for _, _, end in regions[:-1]])
+        names = np.array([label for label, _, _ in regions], dtype=object)
+        return names[np.searchsorted(cuts, k_azi, side="right")]
+
+def locate(evaluate, classify, k_range=(0.0, 2.0), tol=BOUNDARY_TOLERANCE,
+           initial=INITIAL_SAMPLES, max_log_change=None, grid=None,
+           max_evaluations=MAX_EVALUATIONS):
+    """
+    Resolve the region boundaries of a k_azi sweep by adaptive bisection.
+
+    Args:
+        evaluate: Evaluator, k_azi (n,) → W_pv [nm] (n, m)
+        classify: (n, m) → (n,) labels, e.g. band_classifier(...)
+        k_range: (low, high) k_azi
+        tol: Stop splitting intervals no wider than this
+        initial: Points of the coarse starting grid
+        max_log_change: Also split intervals whose worst-replicate warpage
+            changes by more than this many decades (None: labels only)
+        grid: Snap samples to low + i × grid (e.g. the spacing of recorded
+            cases); an interval with no grid point inside is resolved
+        max_evaluations: Stop after this many evaluations
+
+    Returns:
+        RegionMap
+    """
+    lo, hi = map(float, k_range)
+
+    def snap(k):
+        k = np.asarray(k, dtype=float)
+        return np.round(lo + np.round((k - lo) / grid) * grid, 12) if grid else k
+
+    k = np.unique(snap(np.linspace(lo, hi, initial)))
+    W = np.asarray(evaluate(k), dtype=float).reshape(len(k), -1)
+    labels = classify(W)
+    rounds = 1
+
+    while len(k) < max_evaluations:
+        split = labels[1:] != labels[:-1]
+        if max_log_change is not None:
+            peak = np.log10(W.max(axis=1))
+            split |= np.abs(np.diff(peak)) > max_log_change
+        split &= np.diff(k) > tol + 1e-12
+        mid = snap((k[:-1] + k[1:])[split] / 2)
+        mid = mid[(mid > k[:-1][split]) & (mid < k[1:][split])]
+        mid = mid[:max_evaluations - len(k)]
+        if len(mid) == 0:
+            break
+        W_mid = np.asarray(evaluate(mid), dtype=float).reshape(len(mid), -1)
+        order = np.argsort(np.r_[k, mid], kind="stable")
+        k = np.r_[k, mid][order]
+        W = np.r_[W, W_mid][order]
+        labels = np.r_[labels, classify(W_mid)][order]
+        rounds += 1
+
+    return RegionMap(k, W, labels, len(k), rounds)
+
+# =============================================================================
+# MAIN DEMONSTRATION
+# =============================================================================
+
+def _format_regions(region_map):
+    return "  ".join(f"{label} [{a:.3f}, {b:.3f}]" for label, a, b in region_map.regions())
+
+def main():
+    import tempfile
+    import time
+
+    from fem_cache import FEMCache
+
+    print("=" * 72)
+    print("CLIFF LOCATOR: Adaptive Region Boundaries vs Dense k_azi Sweeps")
+    print("=" * 72)
+
+    # Plate solver, three loads: bands on the worst-load warpage
+    classify = band_classifier([6000.0, 10000.0], ["sweet", "rising", "cliff"])
+    evaluate = plate_evaluator()
+    tol = 0.025
+
+    t0 = time.perf_counter()
+    k_dense = np.linspace(0.0, 1.0, 41)
+    dense_labels = classify(evaluate(k_dense))
+    t_dense = time.perf_counter() - t0
+    dense = RegionMap(k_dense, None, dense_labels, len(k_dense), 1)
+
+    t0 = time.perf_counter()
+    adaptive = locate(evaluate, classify, (0.0, 1.0), tol=tol, grid=tol)
+    t_adaptive = time.perf_counter() - t0
+    same = np.array_equal(adaptive.label_at(k_dense), dense_labels)
+    print(f"\nPlate solver, loads scan / gradient / die_array, bands 6000 / 10000 nm:")
+    print(f"  dense 0.025 grid: {dense.evaluations:>3} k_azi values ({t_dense:.2f} s)   "
+          f"{_format_regions(dense)}")
+    print(f"  adaptive:         {adaptive.evaluations:>3} k_azi values ({t_adaptive:.2f} s)   "
+          f"{_format_regions(adaptive)}")
+    print(f"  {adaptive.rounds} rounds, {dense.evaluations / adaptive.evaluations:.1f}× fewer solves, "
+          f"same label at every dense-grid point: {same}")
+
+    # The recorded 41-case sweep: the locator only looks up cases it asks for.
+    # Beyond 1.15 single-case spikes sit between coarse samples and are missed.
+    classify = band_classifier([600.0, 700.0], ["sweet", "rising", "cliff"])
+    records = evidence_evaluator("kazi_dense")
+    k_dense = np.round(np.linspace(0.0, 2.0, 41), 12)
+    dense_labels = classify(records(k_dense))
+    dense = RegionMap(k_dense, None, dense_labels, len(k_dense), 1)
+    print(f"\nkazi_dense_sweep.json, bands 600 / 700 nm:")
+    print(f"  dense 0.05 grid:  {dense.evaluations:>3} cases   {len(dense.regions())} regions")
+    for k_stop in (1.15, 2.0):
+        adaptive = locate(records, classify, (0.0, k_stop), tol=0.05, grid=0.05)
+        inside = k_dense <= k_stop + 1e-9
+        same = np.array_equal(adaptive.label_at(k_dense[inside]), dense_labels[inside])
+        print(f"  adaptive on [0, {k_stop:.2f}]: {adaptive.evaluations:>3} of {inside.sum()} cases, "
+              f"{len(adaptive.regions())} regions, same map: {same} "
+              f"({np.sum(adaptive.label_at(k_dense[inside]) != dense_labels[inside])} labels differ)")
+        print(f"    {_format_regions(adaptive)}")
+
+    # Re-running a locate through a FEMCache costs no solves
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FEMCache(tmp)
+        plate = cached(evaluate, cache, {"solver": "plate", "nx": 60, "ny": 60, "n_harmonic": 2})
+        runs = []
+        for _ in range(2):
+            t0 = time.perf_counter()
+            locate(plate, band_classifier([6000.0, 10000.0], ["sweet", "rising", "cliff"]),
+                   (0.0, 1.0), tol=tol, grid=tol)
+            runs.append(time.perf_counter() - t0)
+        print(f"\nThrough a FEMCache: {runs[0]:.2f} s first locate, {runs[1]:.2f} s repeat "
+              f"({cache.hits} hits, {cache.misses} misses)")
+    print("=" * 72)
+
+if __name__ == "__main__":
+    main()
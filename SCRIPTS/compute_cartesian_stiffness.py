@@ -15,8 +15,11 @@ Run: python compute_cartesian_stiffness.py
 
 import numpy as np
 import json
+import sys
 from pathlib import Path
 
+from verification import CheckResult, printer
+
 # =============================================================================
 # PHYSICAL CONSTANTS
 # =============================================================================
@@ -39,56 +42,218 @@ PANEL_HEIGHT = 0.515      # [m]
 K_MIN = 1e6               # Minimum stiffness [N/m³]
 K_MAX = 1e9               # Maximum stiffness [N/m³]
 
+# Die kernels are truncated where exp(-r²/s²) falls below this fraction
+# of the die's peak rise
+DIE_KERNEL_CUTOFF = 1e-8
+
+# Tile edge [nodes] used to bin dies when evaluating a layout
+DIE_BIN_TILE = 64
+
+# Default working-set budget [bytes] for compute_cartesian_stiffness_batch.
+# Cache-sized chunks run as fast as one whole-stack pass and bound the
+# temporaries; raise it freely, the per-panel overhead is already amortized.
+BATCH_MEMORY_BUDGET = 8 * 2**20
+
 # =============================================================================
 # THERMAL FIELD GENERATION
 # =============================================================================
 
-def generate_thermal_field(nx=100, ny=100, pattern="die_array"):
+def regular_die_layout(n_cols, n_rows, pitch_x, pitch_y, size=0.015, power=30.0):
+    """
+    Build a centred rectangular die array.
+    
+    Args:
+        n_cols, n_rows: Array dimensions
+        pitch_x, pitch_y: Die pitch [m]
+        size: Gaussian radius of each die hotspot [m]
+        power: Peak temperature rise of each die [K]
+    
+    Returns:
+        (centers, sizes, powers): (n, 2), (n,), (n,) arrays
+    """
+    cx = (np.arange(n_cols) - (n_cols - 1) / 2) * pitch_x
+    cy = (np.arange(n_rows) - (n_rows - 1) / 2) * pitch_y
+    CX, CY = np.meshgrid(cx, cy)
+    centers = np.column_stack([CX.ravel(), CY.ravel()])
+    n = len(centers)
+    return centers, np.full(n, float(size)), np.full(n, float(power))
+
+def demo_die_layout():
+    """3×3 array of dies at 80mm spacing, center die hotter (the "die_array" pattern)."""
+    centers, sizes, powers = regular_die_layout(3, 3, 0.08, 0.08, size=0.015, power=30.0)
+    powers[4] = 50.0
+    return centers, sizes, powers
+
+# Shared default layout; read-only so no caller can alter it for everyone else
+DEMO_DIE_LAYOUT = demo_die_layout()
+for _arr in DEMO_DIE_LAYOUT:
+    _arr.setflags(write=False)
+del _arr
+
+def die_layout_field(x, y, centers, sizes, powers, base=25.0, tile=DIE_BIN_TILE):
+    """
+    Temperature field of an arbitrary die layout.
+    
+    Each die is a Gaussian hotspot:
+        T += P_d × exp(-((x - cx_d)² + (y - cy_d)²) / s_d²)
+    
+    evaluated only inside its cutoff box (where the kernel exceeds
+    DIE_KERNEL_CUTOFF). Dies are binned into tile × tile blocks of the
+    grid, and each block sums its dies as one separable product
+    (n_dies × ny_tile)ᵀ @ (n_dies × nx_tile), so cost grows with die
+    footprint rather than n_dies × nx × ny.
+    
+    Args:
+        x, y: 1-D grid coordinates [m], ascending
+        centers: (n, 2) die centres [m]
+        sizes: (n,) Gaussian radius of each die [m]
+        powers: (n,) peak temperature rise of each die [K]
+        base: Background temperature [K above ambient]
+        tile: Binning tile edge [nodes]
+    
+    Returns:
+        T: (len(y), len(x)) temperature field [K above ambient]
+    """
+    centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+    sizes = np.broadcast_to(np.asarray(sizes, dtype=float), len(centers))
+    powers = np.broadcast_to(np.asarray(powers, dtype=float), len(centers))
+    nx, ny = len(x), len(y)
+    T = np.full((ny, nx), float(base))
+    if len(centers) == 0:
+        return T
+    
+    # Index range [lo, hi) of each die's cutoff box along each axis
+    r_cut = sizes * np.sqrt(np.log(1.0 / DIE_KERNEL_CUTOFF))
+    c_lo = np.searchsorted(x, centers[:, 0] - r_cut, side="left")
+    c_hi = np.searchsorted(x, centers[:, 0] + r_cut, side="right")
+    r_lo = np.searchsorted(y, centers[:, 1] - r_cut, side="left")
+    r_hi = np.searchsorted(y, centers[:, 1] + r_cut, side="right")
+    live = (c_hi > c_lo) & (r_hi > r_lo)
+    
+    # Bin dies into every tile their cutoff box overlaps
+    n_tc = -(-nx // tile)
+    tc0, tc1 = c_lo // tile, (c_hi - 1) // tile + 1
+    tr0, tr1 = r_lo // tile, (r_hi - 1) // tile + 1
+    n_tiles = np.where(live, (tc1 - tc0) * (tr1 - tr0), 0)
+    die = np.repeat(np.arange(len(centers)), n_tiles)
+    k = np.arange(len(die)) - np.repeat(np.cumsum(n_tiles) - n_tiles, n_tiles)
+    width = (tc1 - tc0)[die]
+    tile_id = (tr0[die] + k // width) * n_tc + tc0[die] + k % width
+    
+    if len(die) == 0:
+        return T
+    order = np.argsort(tile_id, kind="stable")
+    tile_id, die = tile_id[order], die[order]
+    bounds = np.flatnonzero(np.diff(tile_id)) + 1
+    
+    for ids, dies in zip(np.split(tile_id, bounds), np.split(die, bounds)):
+        r0 = (ids[0] // n_tc) * tile
+        c0 = (ids[0] % n_tc) * tile
+        r1, c1 = min(r0 + tile, ny), min(c0 + tile, nx)
+        cols = np.arange(c0, c1)
+        rows = np.arange(r0, r1)
+        
+        s2 = sizes[dies, None]**2
+        gx = np.exp(-(x[None, c0:c1] - centers[dies, 0:1])**2 / s2)
+        gx *= (cols >= c_lo[dies, None]) & (cols < c_hi[dies, None])
+        gx *= powers[dies, None]
+        gy = np.exp(-(y[None, r0:r1] - centers[dies, 1:2])**2 / s2)
+        gy *= (rows >= r_lo[dies, None]) & (rows < r_hi[dies, None])
+        T[r0:r1, c0:c1] += gy.T @ gx
+    
+    return T
+
+def generate_thermal_field(nx=100, ny=100, pattern="die_array", layout=None, layouts=None):
     """
     Generate a realistic thermal field for a multi-die panel.
     
+    Passing a list of patterns and/or `layouts` generates a batch of panels
+    on the same grid; a single pattern or layout is repeated to the length
+    of the other list.
+    
     Args:
         nx, ny: Grid resolution
-        pattern: "die_array", "uniform", "hotspot"
+        pattern: "die_array", "uniform", "gradient", "scan", "hotspot",
+                 or a list of them
+        layout: Optional (centers, sizes, powers) for "die_array"
+                (default: DEMO_DIE_LAYOUT, a 3×3 array), as a tuple or list
+        layouts: Optional sequence of layouts, one per panel of a batch
     
     Returns:
-        T: 2D temperature field [K above ambient]
+        T: 2D temperature field [K above ambient], or (N, ny, nx) for a batch
+        X, Y: 2D coordinate grids [m], shared by every panel in a batch
     """
     x = np.linspace(-PANEL_WIDTH/2, PANEL_WIDTH/2, nx)
     y = np.linspace(-PANEL_HEIGHT/2, PANEL_HEIGHT/2, ny)
     X, Y = np.meshgrid(x, y)
     
+    if layout is not None and layouts is not None:
+        raise ValueError("Pass either layout or layouts, not both")
+    for lay in [layout] if layouts is None else layouts:
+        if lay is not None and len(lay) != 3:
+            raise ValueError(f"A layout is (centers, sizes, powers), got {len(lay)} items")
+    
+    batched_pattern = not isinstance(pattern, str)
+    batched_layout = layouts is not None
+    if not (batched_pattern or batched_layout):
+        return thermal_field_at(x, y, pattern, layout), X, Y
+    
+    n = len(pattern) if batched_pattern else len(layouts)
+    patterns = list(pattern) if batched_pattern else [pattern] * n
+    layouts = list(layouts) if batched_layout else [layout] * n
+    if len(layouts) != n:
+        raise ValueError(f"Got {len(patterns)} patterns but {len(layouts)} layouts")
+    
+    T = np.empty((n, ny, nx))
+    for i, (p, lay) in enumerate(zip(patterns, layouts)):
+        T[i] = thermal_field_at(x, y, p, lay)
+    
+    return T, X, Y
+
+def thermal_field_at(x, y, pattern="die_array", layout=None):
+    """
+    Evaluate a thermal pattern on the grid spanned by 1-D coordinates.
+    
+    Args:
+        x, y: 1-D panel coordinates [m], panel centre at the origin
+        pattern: Same choices as generate_thermal_field
+        layout: Optional (centers, sizes, powers) for "die_array"
+    
+    Returns:
+        T: (len(y), len(x)) temperature field [K above ambient]
+    """
+    X, Y = np.broadcast_arrays(x[None, :], y[:, None])
+    
     if pattern == "uniform":
         # Uniform temperature rise
         T = np.ones_like(X) * 50.0  # 50K above ambient
         
+    elif pattern == "gradient":
+        # Linear in-plane gradient across the panel width (25K → 75K)
+        T = 50.0 + 50.0 * X / PANEL_WIDTH
+        
+    elif pattern == "scan":
+        # Exposure scan line: a hot band along y at one third of the width
+        T = 25.0 + 40.0 * np.exp(-((X + PANEL_WIDTH / 6)**2) / (0.02**2))
+        
     elif pattern == "hotspot":
         # Single central hotspot
         T = 30.0 + 40.0 * np.exp(-((X**2 + Y**2) / (0.05**2)))
         
     elif pattern == "die_array":
-        # 3×3 array of dies with thermal gradients
-        T = np.ones_like(X) * 25.0  # Base temperature
-        
-        # Die positions (normalized)
-        die_spacing = 0.08  # 80mm spacing
-        for i in [-1, 0, 1]:
-            for j in [-1, 0, 1]:
-                cx = i * die_spacing
-                cy = j * die_spacing
-                # Each die is a Gaussian hotspot
-                die_power = 50.0 if (i == 0 and j == 0) else 30.0  # Center die hotter
-                T += die_power * np.exp(-((X - cx)**2 + (Y - cy)**2) / (0.015**2))
+        # Array of dies with thermal gradients, each a Gaussian hotspot
+        centers, sizes, powers = DEMO_DIE_LAYOUT if layout is None else layout
+        T = die_layout_field(x, y, centers, sizes, powers, base=25.0)
     else:
         raise ValueError(f"Unknown pattern: {pattern}")
     
-    return T, X, Y
+    return T
 
 # =============================================================================
 # PHYSICS CALCULATIONS
 # =============================================================================
 
-def compute_thermal_moment(T):
+def compute_thermal_moment(T, out=None):
     """
     Compute the Thermal Moment field M_T(x,y).
     
@@ -96,46 +261,213 @@ def compute_thermal_moment(T):
         M_T = (α × E × h²) / (12 × (1-ν)) × T(x,y)
     
     This is the bending moment induced by thermal expansion mismatch.
+    
+    Args:
+        T: Temperature field
+        out: Optional preallocated output array (may be T itself)
     """
     prefactor = (ALPHA_GLASS * E_GLASS * H_GLASS**2) / (12 * (1 - NU_GLASS))
-    M_T = prefactor * T
-    return M_T
+    if out is None:
+        return prefactor * T
+    return np.multiply(T, prefactor, out=out)
+
+# -----------------------------------------------------------------------------
+# Laplacian / biharmonic operator backends
+#
+#   "stencil"   5-point stencil, 2nd order, edge rows copied (Neumann)
+#   "stencil9"  9-point cross stencil, 4th order, mirrored about the edge nodes
+#   "spectral"  DCT-I, spectrally accurate for fields with ∂f/∂n = 0 at the edges
+#
+# Each backend is fn(field, dx, dy, out, work) -> out, where out and work are
+# preallocated arrays shaped like field. The grid is the last two axes, so a
+# (N, ny, nx) stack is processed in one pass. Register new ones in
+# LAPLACIAN_BACKENDS. Only "stencil" is allocation-free: "stencil9" pads a
+# mirrored copy of the field and "spectral" needs transform buffers.
+# -----------------------------------------------------------------------------
+
+def _laplacian_stencil5(field, dx, dy, out, work):
+    """
+    5-point stencil with in-place accumulation.
+    
+    ∇²f ≈ (f_{i,j-1} + f_{i,j+1} - 2f_{i,j}) / Δy² + (f_{i-1,j} + f_{i+1,j} - 2f_{i,j}) / Δx²
+    """
+    lap = out[..., 1:-1, 1:-1]
+    part = work[..., 1:-1, 1:-1]
+    center = field[..., 1:-1, 1:-1]
+    
+    # ∂²f/∂y² (rows)
+    np.add(field[..., 0:-2, 1:-1], field[..., 2:, 1:-1], out=lap)
+    lap -= center
+    lap -= center
+    lap /= dy**2
+    
+    # ∂²f/∂x² (columns)
+    np.add(field[..., 1:-1, 0:-2], field[..., 1:-1, 2:], out=part)
+    part -= center
+    part -= center
+    part /= dx**2
+    lap += part
+    
+    # Boundary conditions: Neumann (zero gradient)
+    out[..., 0, :] = out[..., 1, :]
+    out[..., -1, :] = out[..., -2, :]
+    out[..., :, 0] = out[..., :, 1]
+    out[..., :, -1] = out[..., :, -2]
+    return out
+
+def _laplacian_stencil9(field, dx, dy, out, work):
+    """
+    Fourth-order 9-point cross stencil.
+    
+    ∂²f/∂x² ≈ (-f_{i-2} + 16f_{i-1} - 30f_i + 16f_{i+1} - f_{i+2}) / (12 Δx²)
+    
+    The field is mirrored about the edge nodes (f_{-k} = f_k), which imposes
+    ∂f/∂n = 0 on the panel edge to the same order. The mirrored copy is the
+    only allocation; the ∂²/∂x² terms are scaled in work and added to out
+    one at a time.
+    """
+    f = np.pad(field, [(0, 0)] * (field.ndim - 2) + [(2, 2), (2, 2)], mode="reflect")
+    c = f[..., 2:-2, 2:-2]
+    
+    np.add(f[..., 1:-3, 2:-2], f[..., 3:-1, 2:-2], out=out)
+    out *= 16
+    out -= f[..., 0:-4, 2:-2]
+    out -= f[..., 4:, 2:-2]
+    np.multiply(c, 30, out=work)
+    out -= work
+    out /= 12 * dy**2
+    
+    scale = 1 / (12 * dx**2)
+    np.add(f[..., 2:-2, 1:-3], f[..., 2:-2, 3:-1], out=work)
+    work *= 16 * scale
+    out += work
+    np.add(f[..., 2:-2, 0:-4], f[..., 2:-2, 4:], out=work)
+    work *= scale
+    out -= work
+    np.multiply(c, 30 * scale, out=work)
+    out -= work
+    return out
+
+def _neumann_wavenumbers_squared(nx, ny, dx, dy):
+    """|k|² of the DCT-I modes cos(π m x / Lx) cos(π n y / Ly) on the node grid."""
+    kx = np.pi * np.arange(nx) / ((nx - 1) * dx)
+    ky = np.pi * np.arange(ny) / ((ny - 1) * dy)
+    return ky[:, None]**2 + kx[None, :]**2
 
-def compute_laplacian(field, dx, dy):
+def _laplacian_spectral(field, dx, dy, out, work, power=1):
     """
-    Compute the Laplacian using 5-point finite difference stencil.
+    Spectral Laplacian (power=1) or biharmonic (power=2) via the 2-D DCT-I.
     
-    ∇²f = ∂²f/∂x² + ∂²f/∂y²
+    The DCT-I expands the field in cosines whose slope vanishes on the edge
+    nodes, so the operator is exact for every resolved Neumann mode:
+        ∇²  → -|k|²,    ∇⁴ → |k|⁴
+    """
+    import scipy.fft
+    
+    ny, nx = field.shape[-2:]
+    symbol = _neumann_wavenumbers_squared(nx, ny, dx, dy)
+    symbol = -symbol if power == 1 else symbol**power
+    f_hat = scipy.fft.dctn(field, type=1, axes=(-2, -1))
+    f_hat *= symbol
+    out[...] = scipy.fft.idctn(f_hat, type=1, axes=(-2, -1), overwrite_x=True)
+    return out
+
+LAPLACIAN_BACKENDS = {
+    "stencil": _laplacian_stencil5,
+    "stencil9": _laplacian_stencil9,
+    "spectral": _laplacian_spectral,
+}
+
+def compute_laplacian(field, dx, dy, out=None, work=None, backend="stencil"):
+    """
+    Compute the Laplacian ∇²f = ∂²f/∂x² + ∂²f/∂y².
     
-    Stencil:
+    Default 5-point finite difference stencil:
               f(i,j+1)
                 |
     f(i-1,j) - f(i,j) - f(i+1,j)
                 |
               f(i,j-1)
     
-    ∇²f ≈ (f_{i-1,j} + f_{i+1,j} + f_{i,j-1} + f_{i,j+1} - 4×f_{i,j}) / Δx²
+    ∇²f ≈ (f_{i-1,j} + f_{i+1,j} - 2×f_{i,j}) / Δx² + (f_{i,j-1} + f_{i,j+1} - 2×f_{i,j}) / Δy²
+    
+    Args:
+        field: 2D field, or a (N, ny, nx) stack of fields
+        dx, dy: Grid spacing
+        out: Optional preallocated output array (must not alias field)
+        work: Optional scratch array of the same shape (must not alias field or out)
+        backend: "stencil" (default), "stencil9" or "spectral"; see LAPLACIAN_BACKENDS
+    """
+    if backend not in LAPLACIAN_BACKENDS:
+        raise ValueError(f"Unknown Laplacian backend: {backend}")
+    if out is None:
+        out = np.empty_like(field)
+    if work is None:
+        work = np.empty_like(out)
+    return LAPLACIAN_BACKENDS[backend](field, dx, dy, out, work)
+
+def compute_biharmonic(field, dx, dy, backend="stencil"):
+    """
+    Compute the biharmonic ∇⁴f = ∇²(∇²f) with the chosen backend.
+    
+    The spectral backend applies |k|⁴ in one transform pair; the stencil
+    backends apply their Laplacian twice.
+    """
+    if backend == "spectral":
+        return _laplacian_spectral(field, dx, dy, np.empty_like(field), None, power=2)
+    work = np.empty_like(field)
+    lap = compute_laplacian(field, dx, dy, work=work, backend=backend)
+    return compute_laplacian(lap, dx, dy, work=work, backend=backend)
+
+def compute_cartesian_stiffness_into(T, dx, dy, out=None, M_T=None, lap_M_T=None,
+                                     backend="stencil"):
     """
-    laplacian = np.zeros_like(field)
+    Fused, allocation-free Cartesian stiffness kernel.
     
-    # Interior points (avoiding boundaries)
-    laplacian[1:-1, 1:-1] = (
-        field[0:-2, 1:-1] +   # f(i-1, j)
-        field[2:, 1:-1] +     # f(i+1, j)
-        field[1:-1, 0:-2] +   # f(i, j-1)
-        field[1:-1, 2:] -     # f(i, j+1)
-        4 * field[1:-1, 1:-1] # -4×f(i,j)
-    ) / (dx * dy)
+    Same result as compute_cartesian_stiffness(), but every intermediate is
+    written into caller-supplied buffers with in-place ufuncs, so a tight
+    optimization loop allocates nothing (with the default "stencil"
+    backend; see LAPLACIAN_BACKENDS). The K buffer doubles as the
+    stencil scratch space. The working precision follows the buffers
+    (float32 buffers give a float32 computation).
     
-    # Boundary conditions: Neumann (zero gradient)
-    laplacian[0, :] = laplacian[1, :]
-    laplacian[-1, :] = laplacian[-2, :]
-    laplacian[:, 0] = laplacian[:, 1]
-    laplacian[:, -1] = laplacian[:, -2]
+    A (N, ny, nx) stack of fields is processed in one vectorized pass, each
+    panel normalized by its own max |∇²M_T|.
     
-    return laplacian
+    Args:
+        T: 2D temperature field [K], or a (N, ny, nx) stack
+        dx, dy: Grid spacing [m]
+        out: Buffer for K(x,y) [N/m³]
+        M_T: Buffer for the thermal moment [N]
+        lap_M_T: Buffer for ∇²M_T [N/m²]
+        Missing buffers are allocated with T's float dtype (float64 otherwise).
+        backend: Laplacian backend (see LAPLACIAN_BACKENDS)
+    
+    Returns:
+        (out, M_T, lap_M_T)
+    """
+    dtype = T.dtype if np.issubdtype(T.dtype, np.floating) else np.float64
+    if out is None:
+        out = np.empty(T.shape, dtype=dtype)
+    if M_T is None:
+        M_T = np.empty(T.shape, dtype=out.dtype)
+    if lap_M_T is None:
+        lap_M_T = np.empty(T.shape, dtype=out.dtype)
+    
+    compute_thermal_moment(T, out=M_T)
+    compute_laplacian(M_T, dx, dy, out=lap_M_T, work=out, backend=backend)
+    
+    np.abs(lap_M_T, out=out)
+    lap_max = np.max(out, axis=(-2, -1), keepdims=True)
+    # Panels with no curvature map to K_min: |∇²M_T| / ∞ = 0
+    lap_max[lap_max == 0] = np.inf
+    out /= lap_max
+    out *= (K_MAX - K_MIN)
+    out += K_MIN
+    
+    return out, M_T, lap_M_T
 
-def compute_cartesian_stiffness(T, dx, dy):
+def compute_cartesian_stiffness(T, dx, dy, backend="stencil"):
     """
     Compute the optimal Cartesian stiffness distribution.
     
@@ -146,25 +478,65 @@ def compute_cartesian_stiffness(T, dx, dy):
         - Support stiffness should be highest where thermal moment curvature is greatest
         - This occurs at die edges and thermal hotspot boundaries
         - Unlike azimuthal control, this is defined everywhere on a rectangle
-    """
-    # Step 1: Compute Thermal Moment
-    M_T = compute_thermal_moment(T)
     
-    # Step 2: Compute Laplacian of Thermal Moment
-    lap_M_T = compute_laplacian(M_T, dx, dy)
+    Allocates fresh float64 outputs; use compute_cartesian_stiffness_into()
+    to reuse buffers or work in float32, and compute_cartesian_stiffness_batch()
+    to bound the working set of a large stack.
     
-    # Step 3: Normalize to [0, 1]
-    lap_abs = np.abs(lap_M_T)
-    lap_max = np.max(lap_abs)
-    if lap_max > 0:
-        lap_norm = lap_abs / lap_max
-    else:
-        lap_norm = np.zeros_like(lap_abs)
+    Args:
+        T: 2D temperature field [K], or a (N, ny, nx) stack (normalized per panel)
+        dx, dy: Grid spacing [m]
+        backend: Laplacian backend (see LAPLACIAN_BACKENDS)
+    
+    Returns:
+        (K_optimal, M_T, lap_M_T)
+    """
+    shape = np.shape(T)
+    return compute_cartesian_stiffness_into(
+        T, dx, dy, out=np.empty(shape), M_T=np.empty(shape), lap_M_T=np.empty(shape),
+        backend=backend)
+
+def compute_cartesian_stiffness_batch(T, dx, dy, out=None, M_T=None, lap_M_T=None,
+                                      backend="stencil", memory_budget=BATCH_MEMORY_BUDGET):
+    """
+    Cartesian stiffness maps for a stack of thermal fields, in chunks.
     
-    # Step 4: Map to stiffness range
-    K_optimal = K_MIN + (K_MAX - K_MIN) * lap_norm
+    Panels are processed through compute_cartesian_stiffness_into() in
+    chunks sized so that the per-chunk working set (the float64 copy of T,
+    the Laplacian scratch and the backend temporaries, about four panel-sized
+    arrays per panel) stays within memory_budget. The outputs may be
+    np.lib.format.open_memmap arrays, in which case only one chunk is
+    resident at a time.
     
-    return K_optimal, M_T, lap_M_T
+    Args:
+        T: (N, ny, nx) temperature fields [K] (an mmap'd .npy is fine)
+        dx, dy: Grid spacing [m]
+        out, M_T, lap_M_T: Optional (N, ny, nx) output buffers
+        backend: Laplacian backend (see LAPLACIAN_BACKENDS)
+        memory_budget: Working-set budget [bytes]; None processes the whole
+                       stack in one pass
+    
+    Returns:
+        (K_optimal, M_T, lap_M_T), each (N, ny, nx)
+    """
+    if np.ndim(T) != 3:
+        raise ValueError(f"Expected a (N, ny, nx) stack, got shape {np.shape(T)}")
+    shape = T.shape
+    out = np.empty(shape) if out is None else out
+    M_T = np.empty(shape, dtype=out.dtype) if M_T is None else M_T
+    lap_M_T = np.empty(shape, dtype=out.dtype) if lap_M_T is None else lap_M_T
+    
+    n = shape[0]
+    panel_bytes = 4 * shape[1] * shape[2] * out.dtype.itemsize
+    chunk = n if memory_budget is None else max(1, min(n, memory_budget // panel_bytes))
+    
+    for i in range(0, n, chunk):
+        j = min(i + chunk, n)
+        compute_cartesian_stiffness_into(
+            np.asarray(T[i:j], dtype=out.dtype), dx, dy,
+            out=out[i:j], M_T=M_T[i:j], lap_M_T=lap_M_T[i:j], backend=backend)
+    
+    return out, M_T, lap_M_T
 
 # =============================================================================
 # AZIMUTHAL CONTROL DEMONSTRATION
@@ -174,7 +546,11 @@ def compute_azimuthal_stiffness(X, Y, k_azi=0.5, n=2):
     """
     Compute azimuthal stiffness distribution (the WRONG approach for rectangles).
     
-    K(r, θ) = K_0 × [1 + k_azi × cos(n×θ)]
+    K(r, θ) = max(K_0 × [1 + k_azi × cos(n×θ)], K_MIN)
+    
+    The floor keeps the plate positive-definite for k_azi ≥ 1: at
+    cos(n×θ) = -1 the bare law gives K = K_0 × (1 - k_azi) ≤ 0, and odd
+    grids sample those nodes exactly (the axes through the centre).
     
     Problem: θ = atan2(y, x) is undefined at corners of a rectangle.
     """
@@ -183,40 +559,40 @@ def compute_azimuthal_stiffness(X, Y, k_azi=0.5, n=2):
     
     K_0 = (K_MIN + K_MAX) / 2
     K_azi = K_0 * (1 + k_azi * np.cos(n * Theta))
+    np.maximum(K_azi, K_MIN, out=K_azi)
     
     return K_azi
 
 def demonstrate_azimuthal_failure(nx=100, ny=100):
     """
     Show why azimuthal control fails on rectangles.
-    """
-    # Generate thermal field
-    T, X, Y = generate_thermal_field(nx, ny, pattern="die_array")
     
-    # Compute azimuthal stiffness for different k_azi values
-    k_azi_values = [0.3, 0.5, 0.7, 1.0]
-    results = []
+    Each stiffness map is scored by solving the plate equation
+    D∇⁴w + K(x,y)·w = -∇²M_T (see plate_solver.py) and taking the
+    peak-to-valley of the deflection field.
     
-    for k_azi in k_azi_values:
-        K_azi = compute_azimuthal_stiffness(X, Y, k_azi=k_azi)
-        
-        # Compute "warpage proxy" (simplified: inverse of average stiffness weighted by thermal load)
-        # In real FEM, this would be the solution to the plate equation
-        warpage_proxy = np.sum(T / K_azi) / np.sum(1 / K_azi)
-        
-        results.append({
-            'k_azi': k_azi,
-            'avg_stiffness': np.mean(K_azi),
-            'warpage_proxy': warpage_proxy
-        })
+    Returns:
+        HarmonicSweepResult for k_azi = 0.3, 0.5, 0.7, 1.0 at n = 2 under
+        the die-array load (see harmonic_sweep.py)
+    """
+    from harmonic_sweep import harmonic_sweep
     
-    return results
+    return harmonic_sweep([0.3, 0.5, 0.7, 1.0], [2], loads=["die_array"], nx=nx, ny=ny)
 
 # =============================================================================
 # MAIN VERIFICATION
 # =============================================================================
 
-def main():
+def check_cartesian_stiffness(verbose=False):
+    """
+    Compute the Cartesian stiffness of the die-array panel and score the
+    azimuthal law against it and against the rectangle FEM evidence.
+
+    Returns:
+        CheckResult with metrics K_mean, lap_max, azimuthal W_pv_nm (per
+        k_azi, even and odd grid) and fem_max_variation_pct
+    """
+    print = printer(verbose)
     print()
     print("╔══════════════════════════════════════════════════════════════════════╗")
     print("║  GENESIS PLATFORM — PHYSICS VERIFICATION                            ║")
@@ -269,6 +645,13 @@ def main():
     print(f"    Mean Stiffness: {np.mean(K_optimal):.2e} N/m³")
     print()
     
+    checks = [
+        ("K stays within [K_min, K_max]",
+         bool(np.min(K_optimal) >= K_MIN and np.max(K_optimal) <= K_MAX * (1 + 1e-12))),
+        ("K reaches K_max where |∇²M_T| peaks",
+         bool(np.isclose(K_optimal.flat[np.argmax(np.abs(lap_M_T))], K_MAX))),
+    ]
+    
     # Demonstrate azimuthal failure
     print("Step 3: Demonstrating Azimuthal Control Failure...")
     print()
@@ -276,16 +659,28 @@ def main():
     
     print("  Azimuthal k_azi sweep (on rectangular panel):")
     print("  ─────────────────────────────────────────────────────────────────────")
-    print(f"  {'k_azi':>8} {'Avg Stiffness':>16} {'Warpage Proxy':>16} {'Δ from k=0.3':>14}")
+    print(f"  {'k_azi':>8} {'Avg Stiffness':>16} {'W_pv (nm)':>16} {'Δ from k=0.3':>14}")
     print("  ─────────────────────────────────────────────────────────────────────")
     
-    baseline = azi_results[0]['warpage_proxy']
-    for r in azi_results:
-        delta = (r['warpage_proxy'] - baseline) / baseline * 100
-        print(f"  {r['k_azi']:>8.1f} {r['avg_stiffness']:>16.2e} {r['warpage_proxy']:>16.4f} {delta:>+13.2f}%")
+    W_pv = azi_results.W_pv_nm[:, 0, 0]
+    for k_azi, K_mean, w in zip(azi_results.k_azi, azi_results.K_mean[:, 0], W_pv):
+        delta = (w - W_pv[0]) / W_pv[0] * 100
+        print(f"  {k_azi:>8.1f} {K_mean:>16.2e} {w:>16.4f} {delta:>+13.2f}%")
     
     print("  ─────────────────────────────────────────────────────────────────────")
+    print("  (Winkler plate model: trends only, absolute W_pv is not calibrated to FEM)")
+    
+    # Odd grids put nodes on cos(nθ) = -1, where k_azi = 1 reaches the K_MIN floor
+    odd = demonstrate_azimuthal_failure(nx + 1, ny + 1)
+    odd_ok = bool(np.all(np.isfinite(odd.W_pv_nm)))
+    print(f"  Odd grid ({nx + 1} × {ny + 1}): W_pv(k_azi=1.0) = {odd.W_pv_nm[-1, 0, 0]:.4f} nm "
+          f"{'✅' if odd_ok else '❌'}")
     print()
+    checks.append(("Azimuthal sweep solves on even and odd grids",
+                   bool(np.all(np.isfinite(W_pv))) and odd_ok))
+    checks.append(("Plate model: stronger k_azi never lowers W_pv",
+                   bool(np.all(np.diff(W_pv) >= 0))))
+    rise_pct = (W_pv[-1] - W_pv[0]) / W_pv[0] * 100
     
     # Compare to real FEM data
     print("Step 4: Comparing to Real FEM Data...")
@@ -294,6 +689,7 @@ def main():
     evidence_dir = Path(__file__).parent.parent / "EVIDENCE"
     rect_file = evidence_dir / "rectangular_substrates_FINAL.json"
     
+    max_var_pct = None
     if rect_file.exists():
         with open(rect_file, 'r') as f:
             fem_data = json.load(f)
@@ -314,10 +710,15 @@ def main():
             max_w = max(warpages)
             var_pct = (max_w - min_w) / min_w * 100 if min_w > 0 else 0
             print(f"    {panel:>10} / {load:<12}: W_pv = {min_w:.2f}–{max_w:.2f} nm (variation: {var_pct:.2f}%)")
+            max_var_pct = var_pct if max_var_pct is None else max(max_var_pct, var_pct)
         
         print("  ─────────────────────────────────────────────────────────────────────")
         print()
-        print("  ✅ CONFIRMED: Azimuthal k_azi variation produces <0.01% effect on rectangles")
+        if max_var_pct < 0.01:
+            print("  ✅ CONFIRMED (recorded FEM): k_azi changes W_pv by <0.01% on rectangles")
+        else:
+            print(f"  ❌ Recorded FEM: k_azi changes W_pv by {max_var_pct:.2f}% on rectangles")
+        checks.append(("Rectangle FEM: k_azi changes W_pv by <0.01%", max_var_pct < 0.01))
     else:
         print("  ⚠️  FEM data file not found. Run verify_rectangle_failure.py first.")
     
@@ -335,14 +736,33 @@ def main():
     print("  2. AZIMUTHAL CONTROL fails because:")
     print("     - Hoop stress σ_θθ = 0 on rectangular boundaries")
     print("     - θ = atan2(y,x) is undefined at corners")
-    print("     - k_azi modulation produces <0.01% warpage change")
+    if max_var_pct is not None:
+        print(f"     - Recorded FEM: k_azi changes W_pv by {max_var_pct:.2f}% on rectangles")
+    print(f"     - Plate model: k_azi {azi_results.k_azi[0]:.1f} → {azi_results.k_azi[-1]:.1f} "
+          f"only raises W_pv ({rise_pct:+.0f}%)")
     print()
     print("  3. This is PHYSICS, not curve fitting.")
     print("     The equations are derived from Kirchhoff-Love plate theory.")
     print("     Anyone can verify by running this script.")
     print()
     print("=" * 72)
+    print("VERIFICATION CHECKS:")
+    for name, ok in checks:
+        print(f"  [{'PASS' if ok else 'FAIL'}] {name}")
+    print("=" * 72)
     print()
+    
+    return CheckResult("cartesian_stiffness", tuple(checks), {
+        "K_mean": float(np.mean(K_optimal)),
+        "lap_max": float(np.max(np.abs(lap_M_T))),
+        "W_pv_nm": {f"{k:.1f}": float(w) for k, w in zip(azi_results.k_azi, W_pv)},
+        "W_pv_nm_odd_grid": {f"{k:.1f}": float(w) for k, w in zip(odd.k_azi, odd.W_pv_nm[:, 0, 0])},
+        "plate_rise_pct": float(rise_pct),
+        "fem_max_variation_pct": max_var_pct,
+    })
+
+def main():
+    return 0 if check_cartesian_stiffness(verbose=True).passed else 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
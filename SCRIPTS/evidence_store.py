@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+EVIDENCE STORE: Columnar, Memory-Mapped Access to the FEM Case Files
+
+The EVIDENCE/*.json files are lists of case records. Reading one means
+parsing the whole file and rebuilding per-field lists by hand. This
+module converts each case list once into typed columns:
+
+    <cache>/<table>/
+        CURRENT            name of the build directory readers should use
+        build-<id>/
+            manifest.json  source path, size, mtime, SHA-256, column dtypes
+            <column>.npy   one array per field (float64, int64, bool, U<n>)
+
+and loads them with np.load(..., mmap_mode="r"), so opening a table costs
+a few stat() calls and page-ins of the columns actually touched.
+
+The cache lives outside the source tree, which may be read-only:
+$PACKAGING_OS_CACHE if set, else $XDG_CACHE_HOME (default ~/.cache)
+/packaging_os, in a subdirectory per checkout. If the cache cannot be
+written, load_table() builds the columns in memory instead.
+
+A cache is rebuilt only when its source changes: size and mtime are
+compared first, and only if they differ is the file rehashed (a touched
+but unchanged file just refreshes the manifest).
+
+Every build goes into a fresh build-<id> directory and is published by
+atomically replacing CURRENT, so a reader sees either the old build or
+the new one, and concurrent builders never collide. Superseded builds
+are removed once they are STALE_BUILD_SECONDS old, giving readers that
+picked them up just before the swap time to open their columns.
+
+Column typing:
+    all bool                → bool
+    all int                 → int64
+    int/float mix           → float64
+    str                     → fixed-width unicode
+    missing numeric values  → NaN (ints are promoted to float64)
+    missing strings         → ""
+    nested dicts/lists      → canonical JSON strings
+
+Run: python evidence_store.py
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+EVIDENCE_DIR = os.path.join(os.path.dirname(SCRIPT_DIR), "EVIDENCE")
+
+def cache_path(kind):
+    """
+    Per-checkout directory for one kind of generated file, outside the
+    source tree: $PACKAGING_OS_CACHE (default $XDG_CACHE_HOME/packaging_os
+    or ~/.cache/packaging_os) / <kind>-<checkout id>. Not created here.
+    """
+    root = os.environ.get("PACKAGING_OS_CACHE") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+        "packaging_os")
+    checkout = hashlib.sha256(os.path.realpath(EVIDENCE_DIR).encode()).hexdigest()[:12]
+    return os.path.join(root, f"{kind}-{checkout}")
+
+CACHE_DIR = cache_path("evidence")
+
+# Bump when the on-disk layout or typing rules change
+CACHE_VERSION = 2
+
+# Age [s] after which a superseded build directory is deleted
+STALE_BUILD_SECONDS = 60
+
+# Table name → (evidence file, key of the case list inside it or None)
+EVIDENCE_TABLES = {
+    "kazi_dense": ("kazi_dense_sweep.json", None),
+    "rectangular": ("rectangular_substrates_FINAL.json", None),
+    "material": ("material_sweep_FINAL.json", None),
+    "kazi_boundary_mc": ("kazi_boundary_mc.json", None),
+    "harmonic": ("harmonic_sweep_FINAL.json", None),
+    "multi_die": ("multi_die_comparison.json", "details"),
+    "multi_die_summary": ("multi_die_comparison.json", "summaries"),
+    "competitor": ("competitor_validation.json", "validation_results"),
+}
+
+# =============================================================================
+# COLUMN CONVERSION
+# =============================================================================
+
+def _column(values):
+    """Typed array for one field; None marks a missing value."""
+    present = [v for v in values if v is not None]
+    if present and all(isinstance(v, bool) for v in present) and len(present) == len(values):
+        return np.array(values, dtype=bool)
+    if present and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        if len(present) == len(values) and all(isinstance(v, int) for v in present):
+            return np.array(values, dtype=np.int64)
+        return np.array([np.nan if v is None else float(v) for v in values])
+    strings = ["" if v is None else
+               v if isinstance(v, str) else
+               json.dumps(v, sort_keys=True) for v in values]
+    return np.array(strings, dtype=str)
+
+def records_to_columns(records):
+    """
+    Convert a list of case dicts to a dict of equal-length typed arrays.
+
+    The column set is the union of the record keys, in first-seen order.
+    """
+    names = list(dict.fromkeys(k for r in records for k in r))
+    return {name: _column([r.get(name) for r in records]) for name in names}
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _source_manifest(path, key):
+    st = os.stat(path)
+    return {
+        "version": CACHE_VERSION,
+        "source": os.path.relpath(path, EVIDENCE_DIR),
+        "key": key,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": _sha256(path),
+    }
+
+def _read_manifest(table_dir):
+    try:
+        with open(os.path.join(table_dir, "manifest.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_manifest(table_dir, manifest):
+    tmp = os.path.join(table_dir, f"manifest.json.{os.getpid()}")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(table_dir, "manifest.json"))
+
+def _current_build(table_root):
+    """Build directory named by table_root/CURRENT, or None."""
+    try:
+        with open(os.path.join(table_root, "CURRENT")) as f:
+            build = f.read().strip()
+    except OSError:
+        return None
+    return os.path.join(table_root, build) if build else None
+
+def _publish(table_root, build_dir):
+    """Point CURRENT at build_dir (atomic rename)."""
+    name = os.path.basename(build_dir)
+    tmp = os.path.join(table_root, f"CURRENT.{name}")
+    with open(tmp, "w") as f:
+        f.write(name)
+    os.replace(tmp, os.path.join(table_root, "CURRENT"))
+
+def _remove_stale_builds(table_root, keep):
+    """Delete superseded build directories older than STALE_BUILD_SECONDS."""
+    current = _current_build(table_root)
+    cutoff = time.time() - STALE_BUILD_SECONDS
+    for entry in os.scandir(table_root):
+        if (entry.name.startswith("build-") and entry.path not in (current, keep)
+                and entry.stat().st_mtime < cutoff):
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+def _is_fresh(manifest, path, key):
+    """True if the cache described by manifest still matches its source."""
+    if manifest is None or manifest.get("version") != CACHE_VERSION or manifest.get("key") != key:
+        return False
+    st = os.stat(path)
+    if st.st_size == manifest["size"] and st.st_mtime_ns == manifest["mtime_ns"]:
+        return True
+    return st.st_size == manifest["size"] and _sha256(path) == manifest["sha256"]
+
+def _source(name, path, key):
+    """(evidence file, record-list key) of a table."""
+    if path is None:
+        filename, key = EVIDENCE_TABLES[name]
+        path = os.path.join(EVIDENCE_DIR, filename)
+    return path, key
+
+def _load_columns(path, key):
+    with open(path) as f:
+        data = json.load(f)
+    records = data if key is None else data[key]
+    return records_to_columns(records), len(records)
+
+def build_table(name, path=None, key=None, cache_dir=CACHE_DIR):
+    """
+    Convert one evidence file to a columnar cache directory.
+
+    The table is written to a new build directory and published by
+    replacing the CURRENT pointer, so readers never see a half-written
+    cache.
+
+    Returns:
+        Path of the build directory
+    """
+    path, key = _source(name, path, key)
+    columns, n_rows = _load_columns(path, key)
+
+    table_root = os.path.join(cache_dir, name)
+    os.makedirs(table_root, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix="build-", dir=table_root)
+    for col, arr in columns.items():
+        np.save(os.path.join(build_dir, f"{col}.npy"), arr)
+
+    manifest = _source_manifest(path, key)
+    manifest["n_rows"] = n_rows
+    manifest["columns"] = {col: arr.dtype.str for col, arr in columns.items()}
+    _write_manifest(build_dir, manifest)
+
+    _publish(table_root, build_dir)
+    _remove_stale_builds(table_root, keep=build_dir)
+    return build_dir
+
+def ensure_table(name, path=None, key=None, cache_dir=CACHE_DIR):
+    """
+    Return the current build directory, (re)building it only if the source
+    changed or the build is missing or incomplete.
+    """
+    path, key = _source(name, path, key)
+    table_dir = _current_build(os.path.join(cache_dir, name))
+    manifest = _read_manifest(table_dir) if table_dir else None
+    if not _is_fresh(manifest, path, key):
+        return build_table(name, path, key, cache_dir)
+
+    # Touched but unchanged: record the new mtime so the next check is a stat
+    st = os.stat(path)
+    if st.st_mtime_ns != manifest["mtime_ns"]:
+        manifest["mtime_ns"] = st.st_mtime_ns
+        _write_manifest(table_dir, manifest)
+    return table_dir
+
+def build_all(cache_dir=CACHE_DIR):
+    """
+    Ensure every table in EVIDENCE_TABLES is cached; returns their
+    directories (None where the cache cannot be written).
+    """
+    dirs = {}
+    for name in EVIDENCE_TABLES:
+        try:
+            dirs[name] = ensure_table(name, cache_dir=cache_dir)
+        except OSError:
+            dirs[name] = None
+    return dirs
+
+# =============================================================================
+# LOADING
+# =============================================================================
+
+class EvidenceTable:
+    """
+    Read-only columns of one evidence table.
+
+    Columns are memory-mapped on first access and indexed by name:
+        table["k_azi"] → float64 array of length len(table)
+    """
+
+    def __init__(self, table_dir, manifest=None):
+        self.table_dir = table_dir
+        self.manifest = manifest or _read_manifest(table_dir)
+        if self.manifest is None:
+            raise FileNotFoundError(f"No evidence table manifest in {table_dir}")
+        self.columns = tuple(self.manifest["columns"])
+        self._arrays = {}
+
+    @classmethod
+    def in_memory(cls, name, path=None, key=None):
+        """Table built straight from the JSON, without a cache directory."""
+        path, key = _source(name, path, key)
+        columns, n_rows = _load_columns(path, key)
+        table = cls(None, {"source": os.path.relpath(path, EVIDENCE_DIR), "key": key,
+                           "n_rows": n_rows,
+                           "columns": {col: arr.dtype.str for col, arr in columns.items()}})
+        table._arrays = columns
+        return table
+
+    def __len__(self):
+        return self.manifest["n_rows"]
+
+    def __contains__(self, column):
+        return column in self.manifest["columns"]
+
+    def __getitem__(self, column):
+        if column not in self._arrays:
+            if column not in self:
+                raise KeyError(f"No column {column!r} (have {', '.join(self.columns)})")
+            self._arrays[column] = np.load(os.path.join(self.table_dir, f"{column}.npy"),
+                                           mmap_mode="r")
+        return self._arrays[column]
+
+    def __repr__(self):
+        return f"EvidenceTable({self.manifest['source']!r}, {len(self)} rows, {len(self.columns)} columns)"
+
+def load_table(name, path=None, key=None, cache_dir=CACHE_DIR):
+    """
+    Open an evidence table, building or refreshing its cache if needed.
+
+    Args:
+        name: Key of EVIDENCE_TABLES, or any name when path is given
+        path: Optional JSON file (list of records, or a dict holding one)
+        key: Key of the record list inside the file (None for a bare list)
+        cache_dir: Cache root (default CACHE_DIR, see module docstring)
+
+    Returns:
+        EvidenceTable (in memory if the cache cannot be written)
+    """
+    source, key = _source(name, path, key)
+    try:
+        # A build superseded and removed between ensure and open is rebuilt once
+        for _ in range(2):
+            table_dir = ensure_table(name, source, key, cache_dir)
+            manifest = _read_manifest(table_dir)
+            if manifest is not None:
+                return EvidenceTable(table_dir, manifest)
+    except OSError:
+        if not os.path.exists(source):
+            raise
+    return EvidenceTable.in_memory(name, source, key)
+
+# =============================================================================
+# MAIN DEMONSTRATION
+# =============================================================================
+
+def main():
+    import time
+
+    print("=" * 72)
+    print("EVIDENCE STORE: Columnar Cache of the FEM Case Files")
+    print("=" * 72)
+
+    t0 = time.perf_counter()
+    build_all()
+    t_ensure = time.perf_counter() - t0
+    print(f"\nCache: {CACHE_DIR}")
+    print(f"{'Table':<20} {'Rows':>6} {'Cols':>6}  Source")
+    for name in EVIDENCE_TABLES:
+        table = load_table(name)
+        print(f"{name:<20} {len(table):>6} {len(table.columns):>6}  {table.manifest['source']}")
+
+    print(f"\nbuild_all() (fresh check or rebuild): {t_ensure*1e3:.1f} ms")
+
+    # A database-sized table: 200,000 synthetic sweep cases
+    import tempfile
+    rng = np.random.default_rng(0)
+    n = 200_000
+    records = [{"case_id": f"case_{i:06d}", "k_azi": float(k), "k_edge": float(e),
+                "load": load, "node_count": 49604, "W_pv_nm": float(w)}
+               for i, (k, e, load, w) in enumerate(zip(
+                   rng.uniform(0, 1.5, n), rng.uniform(0, 1, n),
+                   rng.choice(["scan", "gradient_z", "die_array"], n),
+                   rng.lognormal(7, 0.3, n)))]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic_sweep.json")
+        with open(path, "w") as f:
+            json.dump(records, f)
+        del records
+        t0 = time.perf_counter()
+        load_table("synthetic", path, cache_dir=tmp)
+        t_build = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        with open(path) as f:
+            cases = json.load(f)
+        w_json = np.array([c["W_pv_nm"] for c in cases])
+        t_json = time.perf_counter() - t0
+        del cases
+
+        t0 = time.perf_counter()
+        w_mmap = load_table("synthetic", path, cache_dir=tmp)["W_pv_nm"]
+        t_mmap = time.perf_counter() - t0
+
+        print(f"\n{n:,}-case table ({os.path.getsize(path) / 1e6:.0f} MB JSON):")
+        print(f"  one-time build:           {t_build*1e3:8.1f} ms")
+        print(f"  json.load + W_pv column:  {t_json*1e3:8.1f} ms")
+        print(f"  cached mmap W_pv column:  {t_mmap*1e3:8.1f} ms  ({t_json / t_mmap:.0f}× faster)")
+        print(f"  columns identical: {np.array_equal(w_json, w_mmap)}")
+    print("=" * 72)
+
+if __name__ == "__main__":
+    main()
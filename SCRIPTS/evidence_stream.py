@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+EVIDENCE STREAM: Constant-Memory Statistics over Huge Case Files
+
+Monte Carlo campaigns write far more cases than fit in memory as Python
+dicts. This module reads case files one record at a time and feeds
+one-pass, mergeable accumulators:
+
+    iter_records()     JSON array (incremental raw_decode over fixed-size
+                       chunks) or JSON Lines, detected from the first byte
+    RunningStats       count, mean, M2 (Welford / Chan et al. batch merge),
+                       min, max → mean, std, CV
+    QuantileSketch     DDSketch-style log-bucket histogram: any quantile to
+                       a fixed *relative* accuracy, buckets merge by addition
+    GroupedSummary     one RunningStats + QuantileSketch per group key
+
+Memory is bounded by the read chunk, the record batch and the number of
+sketch buckets (log-spaced, so a few hundred cover many decades).
+Every accumulator has merge(), so JSON Lines files are split into byte
+ranges, summarized by parallel workers and combined.
+
+Run: python evidence_stream.py
+"""
+
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Characters read per chunk when streaming a JSON array
+STREAM_CHUNK = 1 << 20
+
+# Bytes read per block while looking for a file's first non-whitespace byte
+SNIFF_BLOCK = 4096
+
+# Records buffered per group before a vectorized accumulator update
+STREAM_BATCH = 1 << 14
+
+# Relative accuracy of QuantileSketch quantiles
+SKETCH_ACCURACY = 0.01
+
+# =============================================================================
+# READERS
+# =============================================================================
+
+def _is_json_lines(path):
+    """
+    True unless the first non-whitespace byte is "[".
+
+    Reads fixed-size blocks rather than lines: a json.dump() array is one
+    line, and iterating lines would load all of it.
+    """
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(SNIFF_BLOCK)
+            if not block:
+                return True
+            stripped = block.lstrip()
+            if stripped:
+                return not stripped.startswith(b"[")
+
+def iter_json_array(path, chunk_size=STREAM_CHUNK):
+    """
+    Yield the elements of a top-level JSON array without loading the file.
+
+    Elements are decoded with JSONDecoder.raw_decode from a rolling buffer.
+    An element is only accepted once at least one character follows it,
+    so a number cut by a chunk boundary is never decoded short.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buf = f.read(chunk_size).lstrip()
+        if not buf.startswith("["):
+            raise ValueError(f"{path} does not hold a JSON array")
+        pos, eof = 1, False
+        while True:
+            # Skip whitespace and the separator between elements
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n,":
+                    pos += 1
+                if pos < len(buf) or eof:
+                    break
+                buf, pos = f.read(chunk_size), 0
+                eof = not buf
+            if pos >= len(buf) or buf[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+                if end < len(buf) or eof:
+                    yield item
+                    pos = end
+                    continue
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            more = f.read(chunk_size)
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+
+def iter_json_lines(path, start=0, end=None):
+    """
+    Yield one record per non-empty line of a JSON Lines file.
+
+    With a byte range [start, end), yields the lines that *begin* inside
+    it: a range not starting at 0 first skips to the next newline, and the
+    line straddling `end` belongs to this range. Adjacent ranges therefore
+    cover every line exactly once.
+    """
+    with open(path, "rb") as f:
+        if start > 0:
+            f.seek(start - 1)
+            f.readline()
+        while end is None or f.tell() < end:
+            line = f.readline()
+            if not line:
+                return
+            if line.strip():
+                yield json.loads(line)
+
+def iter_records(path, chunk_size=STREAM_CHUNK):
+    """Stream the records of a JSON array or JSON Lines file."""
+    if _is_json_lines(path):
+        return iter_json_lines(path)
+    return iter_json_array(path, chunk_size)
+
+# =============================================================================
+# ACCUMULATORS
+# =============================================================================
+
+class RunningStats:
+    """
+    One-pass count/mean/variance/min/max with exact merging.
+
+    Batches are reduced with NumPy and folded in with the pairwise update
+    of Chan, Golub & LeVeque:
+        δ = mean_b - mean_a
+        M2 = M2_a + M2_b + δ² n_a n_b / (n_a + n_b)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.M2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _combine(self, n, mean, M2, lo, hi):
+        if n == 0:
+            return
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.M2 += M2 + delta**2 * self.count * n / total
+        self.count = total
+        self.min = min(self.min, lo)
+        self.max = max(self.max, hi)
+
+    def update(self, values):
+        """Fold in an array of values; NaN (a missing value) is skipped."""
+        v = np.asarray(values, dtype=float).ravel()
+        v = v[~np.isnan(v)]
+        if len(v):
+            mean = v.mean()
+            self._combine(len(v), mean, float(np.sum((v - mean)**2)), v.min(), v.max())
+        return self
+
+    def merge(self, other):
+        """Fold in another RunningStats (e.g. from a parallel reader)."""
+        self._combine(other.count, other.mean, other.M2, other.min, other.max)
+        return self
+
+    @property
+    def var(self):
+        """Population variance (ddof=0, as np.var)."""
+        return self.M2 / self.count if self.count else math.nan
+
+    @property
+    def std(self):
+        return math.sqrt(self.var)
+
+    @property
+    def cv_percent(self):
+        """std / mean in percent; NaN when empty or when the mean is zero."""
+        return self.std / self.mean * 100 if self.count and self.mean != 0 else math.nan
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative-error guarantees (DDSketch).
+
+    A positive value x falls in bucket i = ⌈log_γ x⌉ with
+    γ = (1 + α)/(1 - α); every value in bucket i is within a relative
+    error α of its representative 2γ^i/(γ + 1). Negative values use a
+    mirrored store and zeros a counter, so any real data is accepted.
+
+    Args:
+        accuracy: Relative accuracy α of returned quantiles
+    """
+
+    def __init__(self, accuracy=SKETCH_ACCURACY):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zeros = 0
+        self.count = 0
+
+    def _add(self, store, values):
+        keys, counts = np.unique(np.ceil(np.log(values) / self._log_gamma).astype(np.int64),
+                                 return_counts=True)
+        for k, c in zip(keys.tolist(), counts.tolist()):
+            store[k] = store.get(k, 0) + c
+
+    def update(self, values):
+        """Fold in an array of values; NaN (a missing value) is skipped."""
+        v = np.asarray(values, dtype=float).ravel()
+        v = v[~np.isnan(v)]
+        self._add(self.positive, v[v > 0])
+        self._add(self.negative, -v[v < 0])
+        self.zeros += int(np.count_nonzero(v == 0))
+        self.count += len(v)
+        return self
+
+    def merge(self, other):
+        """Fold in another sketch with the same accuracy."""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for mine, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for k, c in theirs.items():
+                mine[k] = mine.get(k, 0) + c
+        self.zeros += other.zeros
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        """Value at quantile q ∈ [0, 1] (lower-rank convention)."""
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        for k in sorted(self.negative, reverse=True):
+            seen += self.negative[k]
+            if seen > rank:
+                return -2 * self.gamma**k / (self.gamma + 1)
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        for k in sorted(self.positive):
+            seen += self.positive[k]
+            if seen > rank:
+                return 2 * self.gamma**k / (self.gamma + 1)
+        return 2 * self.gamma**max(self.positive) / (self.gamma + 1)
+
+class GroupedSummary:
+    """
+    RunningStats and QuantileSketch of one value field per group key.
+
+    Args:
+        value: Record field to summarize
+        by: Grouping field, tuple of fields, or None for a single group
+        accuracy: QuantileSketch relative accuracy
+    """
+
+    def __init__(self, value, by=None, accuracy=SKETCH_ACCURACY):
+        self.value = value
+        self.by = by
+        self.accuracy = accuracy
+        self.stats = {}
+        self.sketches = {}
+        self._pending = {}
+
+    def _key(self, record):
+        if self.by is None:
+            return None
+        if isinstance(self.by, str):
+            return record.get(self.by)
+        return tuple(record.get(b) for b in self.by)
+
+    def add(self, record):
+        """Buffer one record; groups are flushed every STREAM_BATCH values."""
+        v = record.get(self.value)
+        if v is None:
+            return
+        key = self._key(record)
+        pending = self._pending.setdefault(key, [])
+        pending.append(v)
+        if len(pending) >= STREAM_BATCH:
+            self._flush(key)
+
+    def _flush(self, key):
+        values = np.array(self._pending.pop(key, ()), dtype=float)
+        if key not in self.stats:
+            self.stats[key] = RunningStats()
+            self.sketches[key] = QuantileSketch(self.accuracy)
+        self.stats[key].update(values)
+        self.sketches[key].update(values)
+
+    def flush(self):
+        for key in list(self._pending):
+            self._flush(key)
+        return self
+
+    def merge(self, other):
+        """Fold in another GroupedSummary over the same value and key."""
+        self.flush()
+        other.flush()
+        for key, stats in other.stats.items():
+            if key not in self.stats:
+                self.stats[key] = RunningStats()
+                self.sketches[key] = QuantileSketch(self.accuracy)
+            self.stats[key].merge(stats)
+            self.sketches[key].merge(other.sketches[key])
+        return self
+
+    def table(self, quantiles=(0.5, 0.95, 0.99)):
+        """{group: {count, mean, std, cv_percent, min, max, p50, ...}}."""
+        self.flush()
+        out = {}
+        for key in sorted(self.stats, key=repr):
+            s = self.stats[key]
+            row = {"count": s.count, "mean": s.mean, "std": s.std,
+                   "cv_percent": s.cv_percent, "min": s.min, "max": s.max}
+            for q in quantiles:
+                row[f"p{q * 100:g}"] = self.sketches[key].quantile(q)
+            out[key] = row
+        return out
+
+# =============================================================================
+# DRIVERS
+# =============================================================================
+
+def summarize_file(path, value, by=None, accuracy=SKETCH_ACCURACY, start=0, end=None):
+    """
+    One pass over a case file (or a byte range of a JSON Lines file).
+
+    Returns:
+        GroupedSummary (flushed)
+    """
+    summary = GroupedSummary(value, by, accuracy)
+    records = iter_records(path) if (start, end) == (0, None) else iter_json_lines(path, start, end)
+    for record in records:
+        summary.add(record)
+    return summary.flush()
+
+def summarize_parallel(path, value, by=None, workers=None, accuracy=SKETCH_ACCURACY):
+    """
+    Summarize a JSON Lines file with one worker per byte range, then merge.
+
+    JSON arrays cannot be split without parsing, so they are read by a
+    single worker.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or not _is_json_lines(path):
+        return summarize_file(path, value, by, accuracy)
+    size = os.path.getsize(path)
+    bounds = [size * i // workers for i in range(workers + 1)]
+    with ProcessPoolExecutor(workers) as pool:
+        parts = list(pool.map(summarize_file, [path] * workers, [value] * workers,
+                              [by] * workers, [accuracy] * workers, bounds[:-1], bounds[1:]))
+    total = parts[0]
+    for part in parts[1:]:
+        total.merge(part)
+    return total
+
+# =============================================================================
+# MAIN DEMONSTRATION
+# =============================================================================
+
+def main():
+    import tempfile
+    import time
+    import tracemalloc
+
+    from evidence_store import EVIDENCE_DIR
+
+    print("=" * 72)
+    print("EVIDENCE STREAM: Constant-Memory Statistics")
+    print("=" * 72)
+
+    # The real boundary Monte Carlo file
+    path = os.path.join(EVIDENCE_DIR, "kazi_boundary_mc.json")
+    summary = summarize_file(path, "W_pv_nm", by="k_azi")
+    print(f"\nkazi_boundary_mc.json, W_pv by k_azi:")
+    for key, row in summary.table().items():
+        print(f"  k_azi={key:<5} n={row['count']:>3}  mean={row['mean']:.4g} nm  "
+              f"CV={row['cv_percent']:.1f}%  p50={row['p50']:.4g} nm")
+
+    # A synthetic campaign: 500k cases as a JSON array and as JSON Lines
+    n = 500_000
+    rng = np.random.default_rng(0)
+    k_azi = rng.choice([0.0, 0.5, 0.8, 1.0], n)
+    w = rng.lognormal(7 + k_azi, 0.2 + 0.3 * (k_azi == 0.8))
+    with tempfile.TemporaryDirectory() as tmp:
+        array_path = os.path.join(tmp, "mc.json")
+        lines_path = os.path.join(tmp, "mc.jsonl")
+        # The array is written as json.dump() would: one single line
+        with open(array_path, "w") as fa, open(lines_path, "w") as fl:
+            fa.write("[")
+            for i in range(n):
+                rec = json.dumps({"case_id": f"mc_{i}", "k_azi": k_azi[i], "W_pv_nm": w[i]})
+                fa.write(rec + (", " if i < n - 1 else ""))
+                fl.write(rec + "\n")
+            fa.write("]")
+        mb = os.path.getsize(array_path) / 1e6
+
+        t0 = time.perf_counter()
+        streamed = summarize_file(array_path, "W_pv_nm", by="k_azi")
+        t_stream = time.perf_counter() - t0
+
+        # Tracing slows the interpreter several-fold, so it gets its own pass
+        tracemalloc.start()
+        summarize_file(array_path, "W_pv_nm", by="k_azi")
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        t0 = time.perf_counter()
+        merged = summarize_parallel(lines_path, "W_pv_nm", by="k_azi", workers=4)
+        t_parallel = time.perf_counter() - t0
+
+        print(f"\n{n:,} synthetic cases ({mb:.0f} MB single-line JSON array):")
+        print(f"  streamed in {t_stream:.1f} s, peak traced memory {peak / 1e6:.1f} MB "
+              f"(bounded, under a quarter of the file: {peak < os.path.getsize(array_path) / 4})")
+        print(f"  JSON Lines, 4 byte-range workers merged: {t_parallel:.1f} s")
+        print(f"\n  {'k_azi':>6} {'n':>8} {'CV exact':>9} {'CV stream':>10} {'CV merged':>10} "
+              f"{'p95 exact':>10} {'p95 sketch':>11}")
+        a, b = streamed.table(), merged.table()
+        for key in a:
+            v = w[k_azi == key]
+            print(f"  {key:>6} {len(v):>8} {np.std(v) / np.mean(v) * 100:>8.3f}% "
+                  f"{a[key]['cv_percent']:>9.3f}% {b[key]['cv_percent']:>9.3f}% "
+                  f"{np.quantile(v, 0.95, method='lower'):>10.1f} {a[key]['p95']:>11.1f}")
+    print("=" * 72)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+FEM CACHE: Content-Addressed Solver Results with LRU Eviction
+
+Sweeps keep re-submitting cases that have already been solved. This
+module keys every run by the SHA-256 of its canonical inputs and stores
+the result once:
+
+    <root>/<key[:2]>/<key>.npz     compressed displacement fields plus
+                                   __metrics__ and __inputs__ (JSON)
+
+Canonical inputs:
+    dicts              sorted by key
+    numbers            float (so 50 and 50.0 hash alike), -0.0 → 0.0
+    NumPy arrays       dtype, shape and SHA-256 of the bytes
+    tuples / lists     lists
+
+get() marks an entry as used by touching its mtime; put() evicts the
+least recently used entries once the store exceeds its byte budget.
+Entries are written to a temporary name and renamed into place, so
+concurrent workers sharing one root never see a partial file.
+
+calculix_runner.run_jobs(cache=FEMCache()) short-circuits any job whose
+key is already stored.
+
+Run: python fem_cache.py
+"""
+
+import hashlib
+import json
+import math
+import os
+import zipfile
+from typing import NamedTuple
+
+import numpy as np
+
+from evidence_store import cache_path
+
+FEM_CACHE_DIR = cache_path("fem")
+
+# Default size budget of the store [bytes]
+FEM_CACHE_BUDGET = 2 * 2**30
+
+# Record fields that define an evidence case (everything else is output
+# or bookkeeping: W_*, task_id, case_id, status, config, case_dir)
+SOLVER_INPUT_FIELDS = ("k_azi", "k_edge", "load", "n_radial", "n_harmonic", "material",
+                       "panel", "width_mm", "height_mm", "node_count", "bow", "stiffness")
+
+# =============================================================================
+# KEYS
+# =============================================================================
+
+def canonical(value):
+    """JSON-ready canonical form of solver inputs (see module docstring)."""
+    if isinstance(value, dict):
+        return {str(k): canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [canonical(v) for v in value]
+    if isinstance(value, np.ndarray):
+        data = np.ascontiguousarray(value)
+        return {"dtype": data.dtype.str, "shape": list(data.shape),
+                "sha256": hashlib.sha256(data.tobytes()).hexdigest()}
+    if value is None or isinstance(value, (bool, np.bool_, str)):
+        return value if not isinstance(value, np.bool_) else bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        f = float(value)
+        if not math.isfinite(f):
+            return repr(f)
+        return f + 0.0
+    raise TypeError(f"Cannot hash solver input of type {type(value).__name__}")
+
+def input_key(inputs):
+    """SHA-256 hex digest of the canonical JSON of inputs."""
+    text = json.dumps(canonical(inputs), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def case_inputs(record):
+    """Solver inputs of one evidence record (SOLVER_INPUT_FIELDS that are present)."""
+    return {k: record[k] for k in SOLVER_INPUT_FIELDS if k in record}
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+class CachedResult(NamedTuple):
+    """Fields (name → array) and scalar metrics of one cached run."""
+    key: str
+    fields: dict
+    metrics: dict
+
+class FEMCache:
+    """
+    Content-addressed store of solver results.
+
+        cache = FEMCache()
+        result = cache.get_or_compute(inputs, lambda: (fields, metrics))
+
+    Args:
+        root: Store directory (default: FEM_CACHE_DIR, outside the source tree)
+        budget: Size budget [bytes]; LRU entries are evicted beyond it
+    """
+
+    def __init__(self, root=FEM_CACHE_DIR, budget=FEM_CACHE_BUDGET):
+        self.root = root
+        self.budget = budget
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], f"{key}.npz")
+
+    def _entries(self):
+        """(mtime_ns, size, path) of every stored entry."""
+        entries = []
+        for sub in os.scandir(self.root):
+            if sub.is_dir():
+                for entry in os.scandir(sub.path):
+                    if entry.name.endswith(".npz"):
+                        st = entry.stat()
+                        entries.append((st.st_mtime_ns, st.st_size, entry.path))
+        return entries
+
+    def size_bytes(self):
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        return self._size
+
+    def __len__(self):
+        return len(self._entries())
+
+    def __contains__(self, inputs):
+        return os.path.exists(self._path(input_key(inputs)))
+
+    def get(self, inputs):
+        """
+        Cached result for inputs, or None.
+
+        A hit refreshes the entry's position in the LRU order. An
+        unreadable entry is deleted and reported as a miss.
+        """
+        key = input_key(inputs)
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as z:
+                fields = {name: z[name] for name in z.files if not name.startswith("__")}
+                metrics = json.loads(str(z["__metrics__"]))
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            self._remove(path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CachedResult(key, fields, metrics)
+
+    def put(self, inputs, fields, metrics=None):
+        """
+        Store one result and evict LRU entries beyond the budget.
+
+        Args:
+            inputs: Solver inputs (anything canonical() accepts)
+            fields: Dict of name → array (names may not start with "__")
+            metrics: JSON-serializable dict of scalars
+
+        Returns:
+            The entry's key
+        """
+        if any(name.startswith("__") for name in fields):
+            raise ValueError("Field names starting with '__' are reserved")
+        key = input_key(inputs)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **fields,
+                                __metrics__=np.array(json.dumps(metrics or {})),
+                                __inputs__=np.array(json.dumps(canonical(inputs), sort_keys=True)))
+        old = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(tmp, path)
+        if self._size is not None:
+            self._size += os.path.getsize(path) - old
+        if self.size_bytes() > self.budget:
+            self.evict()
+        return key
+
+    def get_or_compute(self, inputs, compute):
+        """
+        Return the cached result, or run compute() and store what it returns.
+
+        Args:
+            inputs: Solver inputs
+            compute: Callable returning (fields, metrics)
+
+        Returns:
+            CachedResult
+        """
+        cached = self.get(inputs)
+        if cached is not None:
+            return cached
+        fields, metrics = compute()
+        return CachedResult(self.put(inputs, fields, metrics), fields, metrics or {})
+
+    def evict(self, budget=None):
+        """Delete least recently used entries until the store fits budget; returns the count."""
+        budget = self.budget if budget is None else budget
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= budget:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        self._size = total
+        return removed
+
+    def clear(self):
+        return self.evict(budget=0)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        self._size = None
+
+# =============================================================================
+# MAIN DEMONSTRATION
+# =============================================================================
+
+def main():
+    import tempfile
+    import time
+
+    from compute_cartesian_stiffness import PANEL_WIDTH, PANEL_HEIGHT, generate_thermal_field
+    from evidence_store import EVIDENCE_DIR
+    from harmonic_sweep import AzimuthalBasis
+    from plate_solver import PlateFactorization, thermal_load
+
+    print("=" * 72)
+    print("FEM CACHE: Content-Addressed Solver Results")
+    print("=" * 72)
+
+    # Distinct solver inputs across the sweep evidence
+    print(f"\n{'Evidence file':<36} {'Cases':>6} {'Distinct inputs':>16}")
+    seen = set()
+    total = 0
+    for filename in ("kazi_dense_sweep.json", "harmonic_sweep_FINAL.json", "kazi_boundary_mc.json",
+                     "material_sweep_FINAL.json", "rectangular_substrates_FINAL.json"):
+        with open(os.path.join(EVIDENCE_DIR, filename)) as f:
+            keys = [input_key(case_inputs(r)) for r in json.load(f)]
+        seen.update(keys)
+        total += len(keys)
+        print(f"{filename:<36} {len(keys):>6} {len(set(keys)):>16}")
+    print(f"{'all':<36} {total:>6} {len(seen):>16}")
+
+    # A local plate sweep that revisits its cases: 3 passes over 24 inputs
+    nx = ny = 80
+    dx, dy = PANEL_WIDTH / (nx - 1), PANEL_HEIGHT / (ny - 1)
+    loads = ["scan", "gradient", "die_array"]
+    T_stack, X, Y = generate_thermal_field(nx, ny, pattern=loads)
+    Q = dict(zip(loads, thermal_load(T_stack, dx, dy)))
+    basis = AzimuthalBasis(X, Y)
+    cases = [{"k_azi": k, "n_harmonic": 2, "load": load, "nx": nx, "ny": ny, "material": "glass"}
+             for k in (0.0, 0.3, 0.5, 0.7, 0.8, 0.9, 0.95, 1.0) for load in loads]
+
+    def solve(case):
+        K = basis.stiffness([case["k_azi"]], [case["n_harmonic"]])[0, 0]
+        w = PlateFactorization(K, dx, dy).solve(Q[case["load"]])
+        return {"w": w.astype(np.float32)}, {"W_pv_nm": float(np.ptp(w) * 1e9)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FEMCache(tmp)
+        print(f"\nPlate sweep, {len(cases)} cases at {nx} × {ny}:")
+        for sweep in range(3):
+            t0 = time.perf_counter()
+            results = [cache.get_or_compute(case, lambda c=case: solve(c)) for case in cases]
+            t = time.perf_counter() - t0
+            print(f"  pass {sweep + 1}: {t*1e3:7.1f} ms   hits {cache.hits:>3}  misses {cache.misses:>3}")
+        print(f"  store: {len(cache)} entries, {cache.size_bytes() / 1024:.0f} KiB")
+        w_pv = [r.metrics["W_pv_nm"] for r in results]
+        print(f"  W_pv range over the sweep: {min(w_pv):.0f} – {max(w_pv):.0f} nm")
+
+        # LRU: shrink the budget to half the store, the oldest entries go
+        for case in cases[-4:]:
+            cache.get(case)
+        removed = cache.evict(budget=cache.size_bytes() // 2)
+        kept = [case in cache for case in cases]
+        print(f"\nEvicted {removed} entries to fit half the store; "
+              f"the 4 most recently read survive: {all(kept[-4:])}")
+    print("=" * 72)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+HARMONIC SWEEP: Azimuthal Stiffness over (k_azi × n × load) as One Tensor
+
+The azimuthal family tested in harmonic_sweep_FINAL.json is
+
+    K(x, y) = K_0 × [1 + k_azi × cos(n Θ)],    Θ = atan2(y, x)
+
+Looping compute_azimuthal_stiffness() recomputes atan2 and cos over the
+grid for every case. Here Θ is computed once per grid, cos(nΘ) once per
+harmonic, and the whole k_azi × n block of stiffness maps is formed by
+broadcasting:
+
+    K[k, n, :, :] = K_0 × (1 + k_azi[k] × cos(n Θ)[n])
+
+Each map is factorized once and every thermal load is solved against
+that one factorization. Maps are generated in chunks bounded by a
+memory budget, so a sweep of thousands of combinations never holds
+more than the chunk in memory.
+
+Results come back as a HarmonicSweepResult: arrays indexed by
+(k_azi, n_harmonic, load) with the axis labels attached.
+
+Run: python harmonic_sweep.py
+"""
+
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+from compute_cartesian_stiffness import (
+    PANEL_WIDTH, PANEL_HEIGHT, K_MIN, K_MAX, generate_thermal_field,
+)
+from plate_solver import PlateFactorization, thermal_load
+
+# Default budget [bytes] for the block of stiffness maps held at once
+SWEEP_MEMORY_BUDGET = 64 * 2**20
+
+# =============================================================================
+# BASIS
+# =============================================================================
+
+class AzimuthalBasis:
+    """
+    Θ and cos(nΘ) on one grid, each computed once.
+
+    Args:
+        X, Y: 2D coordinate grids [m] (panel centre at the origin)
+    """
+
+    def __init__(self, X, Y):
+        self.shape = X.shape
+        self.theta = np.arctan2(Y, X)
+        self._cos = {}
+
+    def cos(self, n):
+        """cos(nΘ), cached per harmonic."""
+        if n not in self._cos:
+            self._cos[n] = np.cos(n * self.theta)
+        return self._cos[n]
+
+    def stiffness(self, k_azi, n_harmonic, K_0=(K_MIN + K_MAX) / 2):
+        """
+        Stiffness maps for every (k_azi, n) pair, floored at K_MIN as in
+        compute_azimuthal_stiffness().
+
+        Args:
+            k_azi: (n_k,) modulation depths
+            n_harmonic: (n_n,) harmonic orders
+
+        Returns:
+            K: (n_k, n_n, ny, nx) [N/m³]
+        """
+        k_azi = np.asarray(k_azi, dtype=float)
+        cos_n = np.stack([self.cos(int(n)) for n in n_harmonic])
+        K = k_azi[:, None, None, None] * cos_n[None]
+        K += 1.0
+        K *= K_0
+        np.maximum(K, K_MIN, out=K)
+        return K
+
+# =============================================================================
+# SWEEP
+# =============================================================================
+
+class HarmonicSweepResult(NamedTuple):
+    """Sweep outputs indexed [k_azi, n_harmonic, load]."""
+    k_azi: np.ndarray             # (n_k,)
+    n_harmonic: np.ndarray        # (n_n,)
+    loads: Tuple[str, ...]        # (n_loads,)
+    W_pv_nm: np.ndarray           # (n_k, n_n, n_loads) peak-to-valley warpage [nm]
+    W_rms_nm: np.ndarray          # (n_k, n_n, n_loads) RMS warpage [nm]
+    K_mean: np.ndarray            # (n_k, n_n) mean support stiffness [N/m³]
+
+    def records(self):
+        """Flatten to evidence-style dicts (case_id as in harmonic_sweep_FINAL.json)."""
+        out = []
+        for i, k in enumerate(self.k_azi):
+            for j, n in enumerate(self.n_harmonic):
+                for m, load in enumerate(self.loads):
+                    out.append({
+                        "case_id": f"harm_n{n}_k{k:g}_{load}",
+                        "n_harmonic": int(n),
+                        "k_azi": float(k),
+                        "load": load,
+                        "W_pv_nm": float(self.W_pv_nm[i, j, m]),
+                        "W_rms_nm": float(self.W_rms_nm[i, j, m]),
+                    })
+        return out
+
+def harmonic_sweep(k_azi, n_harmonic, loads=("scan", "gradient", "die_array"),
+                   nx=100, ny=100, memory_budget=SWEEP_MEMORY_BUDGET):
+    """
+    Plate warpage over the full k_azi × n_harmonic × load grid.
+
+    Args:
+        k_azi: Modulation depths (K is floored at K_MIN, see AzimuthalBasis.stiffness)
+        n_harmonic: Harmonic orders
+        loads: Thermal patterns (see generate_thermal_field)
+        nx, ny: Grid resolution
+        memory_budget: Bytes of stiffness maps generated per chunk
+
+    Returns:
+        HarmonicSweepResult
+    """
+    k_azi = np.atleast_1d(np.asarray(k_azi, dtype=float))
+    n_harmonic = np.atleast_1d(np.asarray(n_harmonic, dtype=int))
+    loads = tuple(loads)
+
+    dx = PANEL_WIDTH / (nx - 1)
+    dy = PANEL_HEIGHT / (ny - 1)
+    T_stack, X, Y = generate_thermal_field(nx, ny, pattern=list(loads))
+    Q = thermal_load(T_stack, dx, dy)
+    basis = AzimuthalBasis(X, Y)
+
+    n_k, n_n = len(k_azi), len(n_harmonic)
+    W_pv = np.empty((n_k, n_n, len(loads)))
+    W_rms = np.empty_like(W_pv)
+    K_mean = np.empty((n_k, n_n))
+
+    # Chunk over k_azi: each chunk is a (chunk, n_n, ny, nx) block of maps
+    per_k = n_n * nx * ny * 8
+    chunk = max(1, min(n_k, memory_budget // per_k))
+    for i0 in range(0, n_k, chunk):
+        i1 = min(i0 + chunk, n_k)
+        K_block = basis.stiffness(k_azi[i0:i1], n_harmonic)
+        K_mean[i0:i1] = K_block.mean(axis=(-2, -1))
+        for i in range(i1 - i0):
+            for j in range(n_n):
+                W = PlateFactorization(K_block[i, j], dx, dy).solve(Q)
+                W_pv[i0 + i, j] = np.ptp(W, axis=(-2, -1)) * 1e9
+                W_rms[i0 + i, j] = np.std(W, axis=(-2, -1)) * 1e9
+
+    return HarmonicSweepResult(k_azi, n_harmonic, loads, W_pv, W_rms, K_mean)
+
+# =============================================================================
+# MAIN DEMONSTRATION
+# =============================================================================
+
+def main():
+    import time
+
+    print("=" * 72)
+    print("HARMONIC SWEEP: k_azi × n × load")
+    print("=" * 72)
+
+    k_azi = np.round(np.arange(0.0, 0.95, 0.05), 2)
+    n_harmonic = [2, 4, 6, 8]
+    loads = ("scan", "gradient", "hotspot", "die_array")
+    t0 = time.perf_counter()
+    res = harmonic_sweep(k_azi, n_harmonic, loads, nx=80, ny=80)
+    elapsed = time.perf_counter() - t0
+    n_cases = res.W_pv_nm.size
+    print(f"\n{n_cases} cases ({len(k_azi)} k_azi × {len(n_harmonic)} n × {len(loads)} loads) "
+          f"on 80 × 80 in {elapsed:.1f} s")
+
+    # Sensitivity: spread of W_pv across the whole k_azi range, per (n, load)
+    spread = (res.W_pv_nm.max(axis=0) - res.W_pv_nm.min(axis=0)) / res.W_pv_nm.mean(axis=0) * 100
+    print(f"\nW_pv spread over k_azi = {k_azi[0]:g}..{k_azi[-1]:g} [% of mean]:")
+    print(f"  {'n':>4} " + " ".join(f"{load:>12}" for load in loads))
+    for j, n in enumerate(res.n_harmonic):
+        print(f"  {n:>4} " + " ".join(f"{s:>11.2f}%" for s in spread[j]))
+
+    records = res.records()
+    print(f"\nrecords(): {len(records)} evidence-style cases, e.g. {records[0]['case_id']} "
+          f"W_pv = {records[0]['W_pv_nm']:.1f} nm")
+    print("=" * 72)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+INCREMENTAL STIFFNESS: O(footprint) Floorplan Edits
+
+T → M_T → ∇²M_T is linear and local: a die's Gaussian hotspot is
+truncated at its cutoff box (DIE_KERNEL_CUTOFF), and the Laplacian
+stencil reaches at most HALO nodes further. Moving, re-powering, adding
+or removing one die therefore changes these fields only inside
+
+    footprint(die) grown by HALO nodes
+
+IncrementalStiffnessMap keeps T, M_T and ∇²M_T resident and, per edit,
+re-evaluates that rectangle only:
+
+    T      re-summed from every die whose cutoff box overlaps it
+           (no add/subtract drift, however many edits are applied)
+    M_T    rescaled in place
+    ∇²M_T  recomputed on a halo window exactly as tiled_pipeline does,
+           so it is bit-identical to a full-grid Laplacian of the same M_T
+
+The global max |∇²M_T| that normalizes K is kept as a per-tile max;
+edited tiles are marked dirty and only those are rescanned when the
+max is next needed.
+
+Run: python incremental_stiffness.py
+"""
+
+import numpy as np
+
+from compute_cartesian_stiffness import (
+    PANEL_WIDTH, PANEL_HEIGHT, K_MIN, K_MAX, DIE_KERNEL_CUTOFF, DIE_BIN_TILE,
+    die_layout_field, compute_thermal_moment, compute_laplacian,
+)
+from tiled_pipeline import TILEABLE_BACKENDS, halo_window, laplacian_tile
+
+# =============================================================================
+# INCREMENTAL ENGINE
+# =============================================================================
+
+class IncrementalStiffnessMap:
+    """
+    Resident T, M_T and ∇²M_T for a die layout, patched per edit.
+
+    Dies are addressed by the integer id returned from add_die() (the
+    initial layout gets ids 0..n-1). Removed ids are not reused.
+
+    Args:
+        nx, ny: Grid resolution
+        layout: Optional initial (centers, sizes, powers)
+        base: Background temperature [K above ambient]
+        backend: Local Laplacian backend (TILEABLE_BACKENDS)
+        tile: Edge [nodes] of the tiles holding the running max |∇²M_T|
+    """
+
+    def __init__(self, nx, ny, layout=None, base=25.0, backend="stencil", tile=DIE_BIN_TILE):
+        if nx < 3 or ny < 3:
+            raise ValueError("Grid must be at least 3 × 3")
+        if backend not in TILEABLE_BACKENDS:
+            raise ValueError(f"Backend {backend!r} is not local and cannot be patched")
+        self.nx, self.ny = nx, ny
+        self.dx = PANEL_WIDTH / (nx - 1)
+        self.dy = PANEL_HEIGHT / (ny - 1)
+        self.x = np.linspace(-PANEL_WIDTH/2, PANEL_WIDTH/2, nx)
+        self.y = np.linspace(-PANEL_HEIGHT/2, PANEL_HEIGHT/2, ny)
+        self.base = float(base)
+        self.backend = backend
+        self.tile = tile
+
+        centers, sizes, powers = (np.empty((0, 2)), (), ()) if layout is None else layout
+        self._centers = np.asarray(centers, dtype=float).reshape(-1, 2).copy()
+        n = len(self._centers)
+        self._sizes = np.array(np.broadcast_to(np.asarray(sizes, dtype=float), n))
+        self._powers = np.array(np.broadcast_to(np.asarray(powers, dtype=float), n))
+        self._alive = np.ones(n, dtype=bool)
+        self._boxes = self._cutoff_boxes(self._centers, self._sizes)
+
+        self.T = die_layout_field(self.x, self.y, *self.layout, base=self.base)
+        self.M_T = compute_thermal_moment(self.T)
+        self.lap_M_T = compute_laplacian(self.M_T, self.dx, self.dy, backend=backend)
+
+        n_tr, n_tc = -(-ny // tile), -(-nx // tile)
+        self._tile_max = np.zeros((n_tr, n_tc))
+        self._dirty = np.ones((n_tr, n_tc), dtype=bool)
+
+    # -------------------------------------------------------------------------
+    # Layout
+    # -------------------------------------------------------------------------
+
+    @property
+    def layout(self):
+        """Current (centers, sizes, powers) of the live dies."""
+        live = self._alive
+        return self._centers[live], self._sizes[live], self._powers[live]
+
+    def _cutoff_boxes(self, centers, sizes):
+        """(n, 4) [r_lo, r_hi, c_lo, c_hi) index boxes, as in die_layout_field."""
+        r_cut = sizes * np.sqrt(np.log(1.0 / DIE_KERNEL_CUTOFF))
+        return np.column_stack([
+            np.searchsorted(self.y, centers[:, 1] - r_cut, side="left"),
+            np.searchsorted(self.y, centers[:, 1] + r_cut, side="right"),
+            np.searchsorted(self.x, centers[:, 0] - r_cut, side="left"),
+            np.searchsorted(self.x, centers[:, 0] + r_cut, side="right"),
+        ]).astype(np.intp).reshape(-1, 4)
+
+    def add_die(self, center, size, power):
+        """Add a die; returns its id."""
+        self._centers = np.vstack([self._centers, np.asarray(center, dtype=float)])
+        self._sizes = np.append(self._sizes, float(size))
+        self._powers = np.append(self._powers, float(power))
+        self._alive = np.append(self._alive, True)
+        box = self._cutoff_boxes(self._centers[-1:], self._sizes[-1:])
+        self._boxes = np.vstack([self._boxes, box])
+        self._patch(box[0])
+        return len(self._alive) - 1
+
+    def remove_die(self, die):
+        """Remove a die."""
+        self._check(die)
+        self._alive[die] = False
+        self._patch(self._boxes[die])
+
+    def move_die(self, die, center):
+        """Move a die to a new centre [m]."""
+        self._check(die)
+        old = self._boxes[die].copy()
+        self._centers[die] = center
+        self._boxes[die] = self._cutoff_boxes(self._centers[die:die+1], self._sizes[die:die+1])[0]
+        self._patch(old)
+        self._patch(self._boxes[die])
+
+    def set_power(self, die, power):
+        """Change a die's peak temperature rise [K]."""
+        self._check(die)
+        self._powers[die] = float(power)
+        self._patch(self._boxes[die])
+
+    def _check(self, die):
+        if not (0 <= die < len(self._alive) and self._alive[die]):
+            raise KeyError(f"No live die with id {die}")
+
+    # -------------------------------------------------------------------------
+    # Patching
+    # -------------------------------------------------------------------------
+
+    def _patch(self, box):
+        """Re-evaluate T, M_T and ∇²M_T over a cutoff box and its stencil halo."""
+        r0, r1, c0, c1 = (int(b) for b in box)
+        if r1 <= r0 or c1 <= c0:
+            return
+
+        # T and M_T on the box itself: re-sum every die that reaches into it
+        b = self._boxes
+        hit = self._alive & (b[:, 0] < r1) & (b[:, 1] > r0) & (b[:, 2] < c1) & (b[:, 3] > c0)
+        T_box = die_layout_field(self.x[c0:c1], self.y[r0:r1], self._centers[hit],
+                                 self._sizes[hit], self._powers[hit], base=self.base)
+        self.T[r0:r1, c0:c1] = T_box
+        compute_thermal_moment(T_box, out=self.M_T[r0:r1, c0:c1])
+
+        # ∇²M_T on everything the stencil (and the Neumann edge copy) can see
+        region = halo_window(r0, r1, c0, c1, self.ny, self.nx)
+        window = halo_window(*region, self.ny, self.nx)
+        wr0, wr1, wc0, wc1 = window
+        rr0, rr1, rc0, rc1 = region
+        self.lap_M_T[rr0:rr1, rc0:rc1] = laplacian_tile(
+            self.M_T[wr0:wr1, wc0:wc1], window, region, self.dx, self.dy, self.backend)
+
+        t = self.tile
+        self._dirty[rr0 // t:(rr1 - 1) // t + 1, rc0 // t:(rc1 - 1) // t + 1] = True
+
+    # -------------------------------------------------------------------------
+    # Stiffness
+    # -------------------------------------------------------------------------
+
+    @property
+    def lap_max(self):
+        """Global max |∇²M_T|, rescanning only tiles edited since the last call."""
+        t = self.tile
+        for i, j in zip(*np.nonzero(self._dirty)):
+            block = self.lap_M_T[i*t:(i+1)*t, j*t:(j+1)*t]
+            self._tile_max[i, j] = max(-np.min(block), np.max(block))
+        self._dirty[...] = False
+        return float(np.max(self._tile_max))
+
+    def stiffness(self, window=None, out=None):
+        """
+        K = K_min + (K_max - K_min) × |∇²M_T| / max(|∇²M_T|)
+
+        Args:
+            window: Optional (r0, r1, c0, c1) to map only part of the grid
+            out: Optional output array of the window's shape
+
+        Returns:
+            K over the window (default: the whole grid) [N/m³]
+        """
+        r0, r1, c0, c1 = (0, self.ny, 0, self.nx) if window is None else window
+        lap_max = self.lap_max
+        out = np.abs(self.lap_M_T[r0:r1, c0:c1], out=out)
+        if lap_max > 0:
+            out /= lap_max
+        else:
+            out[...] = 0
+        out *= (K_MAX - K_MIN)
+        out += K_MIN
+        return out
+
+# =============================================================================
+# MAIN DEMONSTRATION
+# =============================================================================
+
+def main():
+    import time
+    from compute_cartesian_stiffness import regular_die_layout, compute_cartesian_stiffness
+
+    print("=" * 72)
+    print("INCREMENTAL STIFFNESS: O(footprint) Floorplan Edits")
+    print("=" * 72)
+
+    nx, ny = 2000, 2000
+    layout = regular_die_layout(8, 8, 0.055, 0.055, size=0.006, power=30.0)
+    t0 = time.perf_counter()
+    engine = IncrementalStiffnessMap(nx, ny, layout)
+    K = engine.stiffness()
+    t_full = time.perf_counter() - t0
+    print(f"\n{nx} × {ny} grid, {len(layout[0])} dies")
+    print(f"  Full build:            {t_full*1e3:8.1f} ms")
+
+    rng = np.random.default_rng(0)
+    centers = layout[0].copy()
+    edits = 200
+    t0 = time.perf_counter()
+    for _ in range(edits):
+        die = int(rng.integers(len(layout[0])))
+        if rng.random() < 0.5:
+            engine.set_power(die, rng.uniform(10.0, 60.0))
+        else:
+            centers[die] += rng.normal(0.0, 0.004, 2)
+            engine.move_die(die, centers[die])
+        lap_max = engine.lap_max
+    t_edit = (time.perf_counter() - t0) / edits
+    print(f"  Per edit (+ max):      {t_edit*1e3:8.1f} ms  ({t_full / t_edit:.0f}× faster)")
+
+    new = engine.add_die((0.0, 0.0), 0.008, 80.0)
+    engine.remove_die(0)
+
+    # Against a from-scratch rebuild of the edited layout
+    T = die_layout_field(engine.x, engine.y, *engine.layout)
+    K_ref, _, lap_ref = compute_cartesian_stiffness(T, engine.dx, engine.dy)
+    K = engine.stiffness()
+    err_T = np.max(np.abs(engine.T - T)) / np.max(np.abs(T))
+    err_K = np.max(np.abs(K - K_ref)) / (K_MAX - K_MIN)
+    print(f"\nAfter {edits} edits, die {new} added and die 0 removed, vs full rebuild:")
+    print(f"  max |ΔT| / max T         = {err_T:.1e}")
+    print(f"  max |ΔK| / (K_max-K_min) = {err_K:.1e}")
+    print(f"  max |∇²M_T|: {engine.lap_max:.6e} (rebuild {np.max(np.abs(lap_ref)):.6e})")
+    print(f"  {'CONSISTENT' if err_K < 1e-9 else 'MISMATCH'}")
+
+    print("=" * 72)
+
+if __name__ == "__main__":
+    main()
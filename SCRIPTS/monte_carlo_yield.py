@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+MONTE CARLO YIELD: Yield and Cpk under Manufacturing Tolerances
+
+EVIDENCE/S_TIER_CERT/certification_summary.json quotes yield at the
+30 µm, 10 µm and 1 µm warpage specs, and kazi_boundary_mc.json holds 21
+seeded cases with randomized bow and support stiffness. This module is
+the engine behind numbers of that kind:
+
+    tolerances   name → Tolerance (normal or uniform), sampled in blocks
+    model        any picklable callable: dict of sample arrays → W_pv [nm]
+                 (PlateResponse, SurrogateResponse, or your own)
+    specs        any number of upper spec limits, evaluated in one pass
+
+Sampling runs in fixed-size chunks. Chunk i draws from child i of
+np.random.SeedSequence(seed).spawn(n_chunks), whichever worker runs it,
+and chunk statistics are merged in chunk order, so results are
+bit-identical for any worker count. Each chunk returns only its count,
+mean, centred sum of squares (merged with Chan's formula) and the pass
+count at every spec (one sort plus searchsorted), so memory does not
+grow with the sample count.
+
+Statistics per spec limit USL:
+    yield          fraction of samples with W_pv ≤ USL, Wilson score CI
+    Cpk            (USL - μ) / 3σ (upper limit only), Bissell CI
+                   ± z √(1/(9n) + Cpk²/(2(n - 1)))
+    Cpk from yield Φ⁻¹(yield) / 3, the Cpk a normal process with this
+                   yield would have (W_pv is far from normal, so the two
+                   disagree)
+
+Run: python monte_carlo_yield.py
+"""
+
+import functools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import NamedTuple
+
+import numpy as np
+
+# Samples per chunk; fixed so the stream of chunk i never depends on the pool
+MC_CHUNK = 2**17
+
+# Two-sided confidence level of the reported intervals
+CONFIDENCE = 0.95
+
+# Certification spec limits [nm]: 30 µm (CoWoS), 10 µm, 1 µm
+CERTIFICATION_SPECS_NM = (30_000.0, 10_000.0, 1_000.0)
+
+# =============================================================================
+# TOLERANCES
+# =============================================================================
+
+class Tolerance(NamedTuple):
+    """
+    One randomized input.
+
+    distribution "normal": a = mean, b = standard deviation
+    distribution "uniform": a = low, b = high
+    """
+    distribution: str
+    a: float
+    b: float
+
+    def sample(self, rng, n):
+        if self.distribution == "normal":
+            return rng.normal(self.a, self.b, n)
+        if self.distribution == "uniform":
+            return rng.uniform(self.a, self.b, n)
+        raise ValueError(f"Unknown distribution {self.distribution!r}")
+
+# Ranges of kazi_boundary_mc.json: bow [µm] and support stiffness [N/m³]
+BOUNDARY_MC_TOLERANCES = {
+    "k_azi": Tolerance("normal", 0.8, 0.0),
+    "bow": Tolerance("uniform", -28.0, 28.0),
+    "stiffness": Tolerance("uniform", 0.95e6, 1.05e6),
+}
+
+# =============================================================================
+# WARPAGE MODELS
+# =============================================================================
+
+class PlateResponse:
+    """
+    Plate-solver warpage, tabulated over k_azi × support-stiffness scale.
+
+    W_pv is linear in the thermal load, so a "load_scale" sample (power
+    or ΔT variation, default 1) multiplies the tabulated value. Between
+    grid points the table is interpolated bilinearly; samples outside it
+    are clamped to the edge.
+
+    Args:
+        k_azi: Increasing k_azi grid (K is floored at K_MIN, see
+            AzimuthalBasis.stiffness)
+        stiffness_scale: Increasing grid of multipliers on K_0
+        W_pv_nm: (len(k_azi), len(stiffness_scale)) table
+    """
+
+    def __init__(self, k_azi, stiffness_scale, W_pv_nm):
+        self.k_azi = np.asarray(k_azi, dtype=float)
+        self.stiffness_scale = np.asarray(stiffness_scale, dtype=float)
+        self.W_pv_nm = np.asarray(W_pv_nm, dtype=float)
+
+    @classmethod
+    def build(cls, k_azi=np.linspace(0.0, 1.0, 21), stiffness_scale=np.linspace(0.8, 1.2, 5),
+              load="scan", n_harmonic=2, nx=50, ny=50):
+        """Tabulate W_pv with one plate factorization per grid point."""
+        from compute_cartesian_stiffness import PANEL_WIDTH, PANEL_HEIGHT, generate_thermal_field
+        from harmonic_sweep import AzimuthalBasis
+        from plate_solver import PlateFactorization, thermal_load
+
+        dx, dy = PANEL_WIDTH / (nx - 1), PANEL_HEIGHT / (ny - 1)
+        T, X, Y = generate_thermal_field(nx, ny, pattern=load)
+        q = thermal_load(T, dx, dy)
+        K = AzimuthalBasis(X, Y).stiffness(k_azi, [n_harmonic])[:, 0]
+        W = np.array([[np.ptp(PlateFactorization(s * Ki, dx, dy).solve(q)) * 1e9
+                       for s in stiffness_scale] for Ki in K])
+        return cls(k_azi, stiffness_scale, W)
+
+    def __call__(self, samples):
+        n = len(next(iter(samples.values())))
+        k = samples.get("k_azi", np.zeros(n))
+        s = samples.get("stiffness_scale", np.ones(n))
+        i, fi = _cell(self.k_azi, k)
+        j, fj = _cell(self.stiffness_scale, s)
+        W = self.W_pv_nm
+        W_pv = ((1 - fi) * ((1 - fj) * W[i, j] + fj * W[i, j + 1])
+                + fi * ((1 - fj) * W[i + 1, j] + fj * W[i + 1, j + 1]))
+        return W_pv * samples["load_scale"] if "load_scale" in samples else W_pv
+
+def _cell(grid, x):
+    """Lower cell index and fractional position of x on grid, clamped."""
+    i = np.clip(np.searchsorted(grid, x, side="right") - 1, 0, len(grid) - 2)
+    f = np.clip((x - grid[i]) / (grid[i + 1] - grid[i]), 0.0, 1.0)
+    return i, f
+
+# Models reach pool workers pickled with every chunk, so anything they
+# should build only once per process is memoized at module level
+# (lru_cache) rather than on the instance.
+@functools.lru_cache(maxsize=None)
+def _load_surrogate(path, mtime_ns):
+    from warpage_surrogate import WarpageSurrogate
+
+    return WarpageSurrogate.load(path)
+
+class SurrogateResponse:
+    """
+    Mean W_pv of a saved warpage_surrogate model.
+
+    Samples are passed to WarpageSurrogate.predict as columns (k_azi,
+    bow, stiffness, ...); `fixed` adds constant columns such as the
+    source table. The model file is loaded once per process.
+    """
+
+    def __init__(self, path, **fixed):
+        self.path = path
+        self.fixed = fixed
+
+    def __call__(self, samples):
+        path = os.path.realpath(self.path)
+        model = _load_surrogate(path, os.stat(path).st_mtime_ns)
+        return model.predict(dict(samples, **self.fixed), return_std=False).W_pv_nm
+
+# =============================================================================
+# ENGINE
+# =============================================================================
+
+class _ChunkStats(NamedTuple):
+    n: int              # samples with a finite W_pv
+    mean: float
+    m2: float           # Σ (W - mean)²
+    passes: np.ndarray  # samples with W_pv ≤ each spec (non-finite W_pv fails)
+    total: int          # samples drawn
+
+def _run_chunk(model, tolerances, specs, n, seed):
+    rng = np.random.default_rng(seed)
+    samples = {name: tol.sample(rng, n) for name, tol in tolerances.items()}
+    W = np.sort(np.asarray(model(samples), dtype=float))
+    passes = np.searchsorted(W, specs, side="right")
+    finite = W[np.isfinite(W)]
+    mean = finite.mean() if len(finite) else 0.0
+    return _ChunkStats(len(finite), mean, float(np.sum((finite - mean)**2)), passes, n)
+
+def _merge(a, b):
+    """Chan et al. pairwise merge of chunk moments."""
+    n = a.n + b.n
+    if n == 0:
+        return a._replace(passes=a.passes + b.passes, total=a.total + b.total)
+    delta = b.mean - a.mean
+    return _ChunkStats(n, a.mean + delta * b.n / n, a.m2 + b.m2 + delta**2 * a.n * b.n / n,
+                       a.passes + b.passes, a.total + b.total)
+
+class YieldResult(NamedTuple):
+    """Yield and Cpk per spec limit (arrays aligned with spec_nm)."""
+    spec_nm: np.ndarray
+    yield_fraction: np.ndarray
+    yield_low: np.ndarray
+    yield_high: np.ndarray
+    cpk: np.ndarray
+    cpk_low: np.ndarray
+    cpk_high: np.ndarray
+    cpk_from_yield: np.ndarray
+    mean_nm: float
+    std_nm: float
+    n_samples: int
+
+    def records(self):
+        """One dict per spec limit."""
+        per_spec = [f for f in self._fields if isinstance(getattr(self, f), np.ndarray)]
+        return [dict({f: float(getattr(self, f)[i]) for f in per_spec},
+                     mean_nm=self.mean_nm, std_nm=self.std_nm, n_samples=self.n_samples)
+                for i in range(len(self.spec_nm))]
+
+def wilson_interval(passes, n, confidence=CONFIDENCE):
+    """Wilson score interval of a binomial proportion; returns (low, high)."""
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = np.asarray(passes, dtype=float) / n
+    centre = (p + z**2 / (2 * n)) / (1 + z**2 / n)
+    half = z * np.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / (1 + z**2 / n)
+    return centre - half, centre + half
+
+def monte_carlo_yield(model, tolerances, specs_nm=CERTIFICATION_SPECS_NM, n_samples=1_000_000,
+                      seed=0, workers=None, chunk=MC_CHUNK, confidence=CONFIDENCE):
+    """
+    Yield and Cpk of W_pv at many upper spec limits.
+
+    Args:
+        model: Picklable callable, dict name → (n,) samples → (n,) W_pv [nm]
+        tolerances: Dict name → Tolerance
+        specs_nm: Upper spec limits [nm]
+        n_samples: Total samples (rounded up to whole chunks)
+        seed: Root of the SeedSequence; equal seeds give equal results for
+            any worker count
+        workers: Processes (default: one per core; 1 runs in-process)
+        chunk: Samples per chunk (changing it changes the streams)
+        confidence: Two-sided level of the yield and Cpk intervals
+
+    Returns:
+        YieldResult
+    """
+    specs = np.asarray(specs_nm, dtype=float)
+    n_chunks = max(1, math.ceil(n_samples / chunk))
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    workers = workers or os.cpu_count() or 1
+
+    args = [(model, tolerances, specs, chunk, s) for s in seeds]
+    if workers == 1:
+        stats = [_run_chunk(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            stats = list(pool.map(_run_chunk, *zip(*args)))
+
+    total = stats[0]
+    for s in stats[1:]:
+        total = _merge(total, s)
+
+    n = total.total
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    yield_fraction = total.passes / n
+    yield_low, yield_high = wilson_interval(total.passes, n, confidence)
+    std = math.sqrt(total.m2 / (total.n - 1)) if total.n > 1 else float("nan")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cpk = (specs - total.mean) / (3 * std)
+        half = z * np.sqrt(1 / (9 * total.n) + cpk**2 / (2 * (total.n - 1)))
+    cpk_from_yield = np.array([NormalDist().inv_cdf(y) / 3 if 0 < y < 1 else math.copysign(math.inf, y - 0.5)
+                               for y in yield_fraction])
+    return YieldResult(specs, yield_fraction, yield_low, yield_high, cpk, cpk - half, cpk + half,
+                       cpk_from_yield, total.mean, std, n)
+
+# =============================================================================
+# MAIN DEMONSTRATION
+# =============================================================================
+
+def _print_result(result):
+    print(f"  {'Spec':>10} {'Yield':>8} {'95% CI':>19} {'Cpk':>7} {'95% CI':>17} {'Cpk(yield)':>11}")
+    for r in result.records():
+        print(f"  {r['spec_nm'] / 1e3:>7,.0f} µm {r['yield_fraction'] * 100:>7.2f}% "
+              f"[{r['yield_low'] * 100:>6.2f}, {r['yield_high'] * 100:>6.2f}]% "
+              f"{r['cpk']:>7.2f} [{r['cpk_low']:>6.2f}, {r['cpk_high']:>6.2f}] {r['cpk_from_yield']:>11.2f}")
+
+def main():
+    import tempfile
+    import time
+
+    print("=" * 72)
+    print("MONTE CARLO YIELD: Yield and Cpk under Manufacturing Tolerances")
+    print("=" * 72)
+
+    # Plate solver response under the scan load, tabulated once
+    t0 = time.perf_counter()
+    plate = PlateResponse.build()
+    print(f"\nPlate response table {plate.W_pv_nm.shape[0]} k_azi × "
+          f"{plate.W_pv_nm.shape[1]} stiffness scales: {time.perf_counter() - t0:.2f} s")
+
+    specs = (20_000.0, 10_000.0, 5_000.0, 4_000.0, 3_000.0)
+    n = 4_000_000
+    for k_nominal in (0.1, 0.8):
+        tolerances = {
+            "k_azi": Tolerance("normal", k_nominal, 0.05),
+            "stiffness_scale": Tolerance("uniform", 0.9, 1.1),
+            "load_scale": Tolerance("normal", 1.0, 0.1),
+        }
+        t0 = time.perf_counter()
+        result = monte_carlo_yield(plate, tolerances, specs, n, seed=2026, workers=1)
+        t = time.perf_counter() - t0
+        print(f"\nk_azi {k_nominal} ± 0.05, K_0 ±10%, load ±10% (1σ): {n:,} samples in {t:.2f} s "
+              f"({n / t / 1e6:.1f} M/s), W_pv {result.mean_nm:.0f} ± {result.std_nm:.0f} nm")
+        _print_result(result)
+
+    # Same seed on a 2-process pool: identical numbers
+    again = monte_carlo_yield(plate, tolerances, specs, n, seed=2026, workers=2)
+    print(f"\nworkers=2 reproduces workers=1 exactly: "
+          f"{all(np.array_equal(a, b) for a, b in zip(result, again))}")
+
+    # The boundary MC tolerances through the warpage surrogate, against the
+    # 21 recorded cases of kazi_boundary_mc.json
+    from evidence_query import CaseTable
+    from warpage_surrogate import WarpageSurrogate, training_columns
+
+    recorded = CaseTable.from_evidence("kazi_boundary_mc").column("W_pv_nm")
+    specs = (1e6, 3e6, 1e7, 3e7)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "surrogate.npz")
+        WarpageSurrogate.fit(training_columns()).save(path)
+        model = SurrogateResponse(path, source="kazi_boundary_mc", load="scan")
+        result = monte_carlo_yield(model, BOUNDARY_MC_TOLERANCES, specs, 200_000, seed=2026)
+    low, high = wilson_interval([np.sum(recorded <= s) for s in specs], len(recorded))
+    print(f"\nkazi_boundary_mc tolerances (bow ±28 µm, stiffness ±5%) through the surrogate, "
+          f"{result.n_samples:,} samples:")
+    _print_result(result)
+    print(f"  recorded cases ({len(recorded)}):")
+    for s, lo, hi in zip(specs, low, high):
+        print(f"  {s / 1e3:>7,.0f} µm {np.mean(recorded <= s) * 100:>7.2f}% "
+              f"[{lo * 100:>6.2f}, {hi * 100:>6.2f}]%")
+    print("=" * 72)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+PACKAGING-OS: One Command-Line Entry Point for Every Verification
+
+    python packaging_os.py fatigue            # one check, full report
+    python packaging_os.py kazi-sweep --json  # structured result on stdout
+    python packaging_os.py all --workers 4    # whole suite (run_verifications.py)
+    python packaging_os.py startup            # measure cold start against budget
+
+Each check subcommand imports its verify_* module only when selected and
+calls the module's check function, which returns a CheckResult
+(verification.py). The exit status is 0 when every check passed.
+
+Cold start: this module and verification.py import only the standard
+library, and the JSON-field checks (design-desert, multi-die, fatigue)
+never import NumPy. `startup` times fresh interpreters running those
+checks and fails if any costs more than COLD_START_BUDGET_S above a bare
+`python -c pass`.
+
+Run: python packaging_os.py --help
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# subcommand → (module, check function, help)
+COMMANDS = {
+    "rectangle": ("verify_rectangle_failure", "check_rectangle_failure",
+                  "k_azi has zero effect on rectangular substrates (30 Cloud FEM)"),
+    "kazi-sweep": ("verify_kazi_sweep", "check_kazi_sweep",
+                   "k_azi sweep chaos cliff on circular glass (41 Cloud FEM)"),
+    "design-desert": ("verify_design_desert", "check_design_desert",
+                      "design-around impossibility (237 Cloud FEM)"),
+    "multi-die": ("verify_multi_die_scaling", "check_multi_die_scaling",
+                  "multi-die warpage scaling (20 local CalculiX FEM)"),
+    "fatigue": ("verify_fatigue_life", "check_fatigue_life",
+                "Coffin-Manson fatigue life (analytical)"),
+    "material": ("verify_material_invariance", "check_material_invariance",
+                 "chaos cliff is material-invariant (15 Cloud FEM)"),
+    "cartesian-stiffness": ("compute_cartesian_stiffness", "check_cartesian_stiffness",
+                            "Cartesian stiffness law from first principles"),
+    "stiffness-kernel": ("verify_stiffness_kernel", "check_stiffness_kernel",
+                         "fused Cartesian stiffness kernel and Laplacian backends"),
+}
+
+# Checks that read JSON fields only; these must start without NumPy
+JSON_ONLY_COMMANDS = ("design-desert", "multi-die", "fatigue")
+
+# Allowed wall time of a JSON-only check above bare interpreter start-up
+COLD_START_BUDGET_S = 0.05
+
+# =============================================================================
+# CHECKS
+# =============================================================================
+
+def run_check(command, verbose=False):
+    """
+    Import one verify_* module and run its check function.
+
+    Args:
+        command: Key of COMMANDS
+        verbose: Print the script's full report while checking
+
+    Returns:
+        CheckResult
+    """
+    module, function, _ = COMMANDS[command]
+    return getattr(importlib.import_module(module), function)(verbose=verbose)
+
+def _check_main(args):
+    result = run_check(args.command, verbose=not args.json)
+    if args.json:
+        print(json.dumps(result.as_dict(), indent=2))
+    return 0 if result.passed else 1
+
+def _all_main(args):
+    import run_verifications
+    return run_verifications.main(args.runner_args)
+
+# =============================================================================
+# COLD START
+# =============================================================================
+
+def _wall_time(argv, repeats):
+    """Best-of-repeats wall time of a fresh interpreter running argv."""
+    import subprocess
+    import time
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        subprocess.run(argv, cwd=SCRIPT_DIR, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=False)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def measure_cold_start(commands=JSON_ONLY_COMMANDS, repeats=5):
+    """
+    Time fresh interpreters running each command against a bare start-up.
+
+    Args:
+        commands: Subcommands to time (each is run with --json)
+        repeats: Runs per command; the fastest is kept
+
+    Returns:
+        dict with baseline_s, per-command wall_s and overhead_s, and
+        numpy_imported (True if importing the JSON-only check modules
+        pulls in NumPy)
+    """
+    import subprocess
+
+    baseline = _wall_time([sys.executable, "-c", "pass"], repeats)
+    timings = {"--help": _wall_time([sys.executable, __file__, "--help"], repeats)}
+    for command in commands:
+        timings[command] = _wall_time([sys.executable, __file__, command, "--json"], repeats)
+
+    modules = ", ".join(COMMANDS[c][0] for c in JSON_ONLY_COMMANDS)
+    probe = subprocess.run(
+        [sys.executable, "-c", f"import sys, packaging_os, {modules}; print('numpy' in sys.modules)"],
+        cwd=SCRIPT_DIR, capture_output=True, text=True, check=True)
+    return {
+        "baseline_s": baseline,
+        "commands": {c: {"wall_s": t, "overhead_s": t - baseline} for c, t in timings.items()},
+        "numpy_imported": probe.stdout.strip() == "True",
+    }
+
+def _startup_main(args):
+    print("=" * 72)
+    print("PACKAGING-OS COLD START")
+    print("=" * 72)
+    report = measure_cold_start(repeats=args.repeats)
+    print(f"\nBare interpreter (python -c pass): {report['baseline_s']*1e3:.0f} ms")
+    print(f"\n{'Command':<18} {'Wall (ms)':>10} {'Overhead (ms)':>14}")
+    for command, t in report["commands"].items():
+        print(f"{command:<18} {t['wall_s']*1e3:>10.0f} {t['overhead_s']*1e3:>14.0f}")
+
+    worst = max(t["overhead_s"] for t in report["commands"].values())
+    checks = [
+        ("JSON-only check modules import without NumPy", not report["numpy_imported"]),
+        (f"Worst overhead {worst*1e3:.0f} ms ≤ budget {COLD_START_BUDGET_S*1e3:.0f} ms",
+         worst <= COLD_START_BUDGET_S),
+    ]
+    print()
+    for desc, ok in checks:
+        print(f"  [{'PASS' if ok else 'FAIL'}] {desc}")
+    print("=" * 72)
+    return 0 if all(ok for _, ok in checks) else 1
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="packaging-os", description="Genesis Packaging OS verification checks.")
+    sub = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    for command, (module, _, help_text) in COMMANDS.items():
+        p = sub.add_parser(command, help=help_text, description=f"{help_text} ({module}.py)")
+        p.add_argument("--json", action="store_true",
+                       help="print the structured result as JSON instead of the report")
+        p.set_defaults(handler=_check_main)
+
+    p = sub.add_parser("all", help="run the whole suite in parallel (run_verifications.py)",
+                       description="Other options (--workers, --json, --junit, --quiet) "
+                                   "are passed to run_verifications.py.")
+    p.set_defaults(handler=_all_main)
+
+    p = sub.add_parser("startup", help="measure cold-start time against the budget")
+    p.add_argument("--repeats", type=int, default=5, help="runs per command (fastest kept)")
+    p.set_defaults(handler=_startup_main)
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command != "all" and extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    args.runner_args = extra
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,7 @@
 # ==============================================================
 # GENESIS PACKAGING OS — PUBLIC VERIFICATION SUITE
 # ==============================================================
-# Runs all 7 verification scripts and reports results.
+# Runs all 8 verification scripts and reports results.
 #
 # HONEST DISCLOSURE:
 #   - verify_rectangle_failure.py: Validates 30 Cloud FEM cases (task IDs)
@@ -12,59 +12,19 @@
 #   - verify_fatigue_life.py: Validates ANALYTICAL Coffin-Manson (NOT FEM)
 #   - verify_material_invariance.py: Validates 15 Cloud FEM cases (task IDs)
 #   - compute_cartesian_stiffness.py: Computes physics from first principles
+#   - verify_stiffness_kernel.py: Fused stiffness kernel vs reference (computation)
 #
 # Total real Cloud FEM cases verified: ~350+
 # Total local CalculiX FEM: 20
 # Analytical: fatigue (4 materials), Cartesian stiffness
+#
+# The suite itself lives in run_verifications.py, which runs the scripts
+# in a parallel process pool and writes a JSON (and optional JUnit)
+# report. Arguments are passed through, e.g.:
+#   bash run_all_verifications.sh --workers 4 --junit junit.xml
 # ==============================================================
 
 set -e
 cd "$(dirname "$0")"
 
-echo "============================================================"
-echo "GENESIS PACKAGING OS — VERIFICATION SUITE"
-echo "============================================================"
-echo ""
-
-PASS=0
-FAIL=0
-
-run_test() {
-    local name=$1
-    local script=$2
-    echo "--- Running: $name ---"
-    if python3 "$script" 2>&1; then
-        PASS=$((PASS + 1))
-        echo ""
-    else
-        FAIL=$((FAIL + 1))
-        echo "*** FAILED: $name ***"
-        echo ""
-    fi
-}
-
-run_test "Rectangle Failure (30 Cloud FEM)" verify_rectangle_failure.py
-run_test "k_azi Sweep Chaos Cliff (41 Cloud FEM)" verify_kazi_sweep.py
-run_test "Design Desert (237 Cloud FEM)" verify_design_desert.py
-run_test "Multi-Die Scaling (20 Local CalculiX FEM)" verify_multi_die_scaling.py
-run_test "Fatigue Life (Analytical Coffin-Manson)" verify_fatigue_life.py
-run_test "Material Invariance (15 Cloud FEM)" verify_material_invariance.py
-run_test "Cartesian Stiffness (First Principles)" compute_cartesian_stiffness.py
-
-echo "============================================================"
-if [ $FAIL -eq 0 ]; then
-    echo "ALL $PASS VERIFICATIONS PASSED"
-else
-    echo "$FAIL FAILED, $PASS PASSED"
-fi
-echo "============================================================"
-echo ""
-echo "Evidence verified:"
-echo "  - 30 rectangular substrate cases (Cloud FEM, task IDs)"
-echo "  - 41 k_azi sweep cases (Cloud FEM, task IDs)"
-echo "  - 237 design-around cases (Cloud FEM)"
-echo "  - 15 material sweep cases (Cloud FEM, task IDs)"
-echo "  - 20 multi-die cases (LOCAL CalculiX FEM)"
-echo "  - 4 fatigue interfaces (ANALYTICAL Coffin-Manson, NOT FEM)"
-echo "  Real Cloud FEM: ~350+ | Local FEM: 20 | Analytical: ~10"
-echo ""
+exec python3 run_verifications.py "$@"
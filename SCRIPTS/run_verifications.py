@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+VERIFICATION RUNNER: All Verification Scripts in One Parallel Process Pool
+
+run_all_verifications.sh used to start one interpreter per script, one
+after another, each re-importing NumPy and re-reading its evidence. This
+runner instead:
+
+    1. imports NumPy/SciPy and the shared modules once in the parent and
+       brings every evidence_store cache up to date
+    2. forks a process pool, so workers inherit the warm imports and
+       memory-map the same cache files
+    3. runs each script as __main__ in a worker (runpy), capturing its
+       output, exit status and wall time
+    4. parses every "[PASS] …" / "[FAIL] …" line into a per-check result
+
+Scripts are submitted longest-first using the durations in the previous
+JSON report (if any), so the suite's wall time approaches that of the
+slowest script once there are enough cores.
+
+Reports:
+    --json PATH     machine-readable summary, per-script and per-check
+                    (default: verification_report.json in the out-of-tree
+                    cache, see evidence_store.cache_path)
+    --junit PATH    JUnit XML for CI (one testcase per check)
+
+Run: python run_verifications.py [--workers N] [--json report.json] [--junit junit.xml]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import runpy
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from xml.etree import ElementTree as ET
+
+from evidence_store import cache_path
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (display name, script) in report order
+VERIFICATIONS = [
+    ("Rectangle Failure (30 Cloud FEM)", "verify_rectangle_failure.py"),
+    ("k_azi Sweep Chaos Cliff (41 Cloud FEM)", "verify_kazi_sweep.py"),
+    ("Design Desert (237 Cloud FEM)", "verify_design_desert.py"),
+    ("Multi-Die Scaling (20 Local CalculiX FEM)", "verify_multi_die_scaling.py"),
+    ("Fatigue Life (Analytical Coffin-Manson)", "verify_fatigue_life.py"),
+    ("Material Invariance (15 Cloud FEM)", "verify_material_invariance.py"),
+    ("Cartesian Stiffness (First Principles)", "compute_cartesian_stiffness.py"),
+    ("Fused Stiffness Kernel (Computation)", "verify_stiffness_kernel.py"),
+]
+
+EVIDENCE_SUMMARY = """Evidence verified:
+  - 30 rectangular substrate cases (Cloud FEM, task IDs)
+  - 41 k_azi sweep cases (Cloud FEM, task IDs)
+  - 237 design-around cases (Cloud FEM)
+  - 15 material sweep cases (Cloud FEM, task IDs)
+  - 20 multi-die cases (LOCAL CalculiX FEM)
+  - 4 fatigue interfaces (ANALYTICAL Coffin-Manson, NOT FEM)
+  Real Cloud FEM: ~350+ | Local FEM: 20 | Analytical: ~10"""
+
+DEFAULT_REPORT = os.path.join(cache_path("reports"), "verification_report.json")
+
+CHECK_LINE = re.compile(r"^\s*\[(PASS|FAIL)\]\s+(.*\S)\s*$")
+
+# =============================================================================
+# WORKER
+# =============================================================================
+
+def warm_up():
+    """Import the shared stack and refresh the evidence caches (parent only)."""
+    import numpy  # noqa: F401
+    import scipy.sparse.linalg  # noqa: F401
+    import compute_cartesian_stiffness  # noqa: F401
+    import plate_solver  # noqa: F401
+    import evidence_query  # noqa: F401
+    from evidence_store import build_all
+    build_all()
+
+def run_script(name, script):
+    """
+    Run one script as __main__ and collect its outcome.
+
+    Returns:
+        dict with name, script, passed, exit_code, wall_time_s, checks, output
+    """
+    out = io.StringIO()
+    exit_code = 0
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(out):
+        try:
+            runpy.run_path(os.path.join(SCRIPT_DIR, script), run_name="__main__")
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except BaseException:
+            traceback.print_exc()
+            exit_code = 1
+    wall = time.perf_counter() - t0
+
+    output = out.getvalue()
+    checks = [{"name": m.group(2), "passed": m.group(1) == "PASS"}
+              for m in map(CHECK_LINE.match, output.splitlines()) if m]
+    return {
+        "name": name,
+        "script": script,
+        "passed": exit_code == 0 and all(c["passed"] for c in checks),
+        "exit_code": exit_code,
+        "wall_time_s": wall,
+        "checks": checks,
+        "output": output,
+    }
+
+# =============================================================================
+# SUITE
+# =============================================================================
+
+def _previous_durations(path):
+    try:
+        with open(path) as f:
+            return {r["script"]: r["wall_time_s"] for r in json.load(f)["results"]}
+    except (OSError, ValueError, KeyError):
+        return {}
+
+def run_suite(verifications=VERIFICATIONS, workers=None, history=DEFAULT_REPORT):
+    """
+    Run every verification in a forked process pool.
+
+    Args:
+        verifications: (name, script) pairs
+        workers: Pool size (default: one per core, at most one per script)
+        history: Previous JSON report used to schedule longest-first
+
+    Returns:
+        Report dict: results in declaration order plus suite totals
+    """
+    warm_up()
+    workers = max(1, min(workers or os.cpu_count() or 1, len(verifications)))
+    previous = _previous_durations(history)
+    order = sorted(verifications, key=lambda v: -previous.get(v[1], 0.0))
+
+    t0 = time.perf_counter()
+    results = {}
+    if workers == 1:
+        for name, script in order:
+            results[script] = run_script(name, script)
+    else:
+        ctx = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods()
+                                          else None)
+        with ProcessPoolExecutor(workers, mp_context=ctx) as pool:
+            futures = [pool.submit(run_script, name, script) for name, script in order]
+            for future in as_completed(futures):
+                r = future.result()
+                results[r["script"]] = r
+    wall = time.perf_counter() - t0
+
+    ordered = [results[script] for _, script in verifications]
+    return {
+        "passed": all(r["passed"] for r in ordered),
+        "n_passed": sum(r["passed"] for r in ordered),
+        "n_failed": sum(not r["passed"] for r in ordered),
+        "n_checks": sum(len(r["checks"]) for r in ordered),
+        "workers": workers,
+        "wall_time_s": wall,
+        "cpu_time_s": sum(r["wall_time_s"] for r in ordered),
+        "results": ordered,
+    }
+
+def write_json(report, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+def write_junit(report, path):
+    """One <testsuite>; each parsed check is a <testcase> (a script with none is one case)."""
+    suite = ET.Element("testsuite", name="packaging_os_verification",
+                       tests=str(sum(max(len(r["checks"]), 1) for r in report["results"])),
+                       failures="0", time=f"{report['wall_time_s']:.3f}")
+    failures = 0
+    for r in report["results"]:
+        checks = r["checks"] or [{"name": r["name"], "passed": r["passed"]}]
+        for check in checks:
+            case = ET.SubElement(suite, "testcase", classname=r["script"][:-3], name=check["name"],
+                                 time=f"{r['wall_time_s'] / len(checks):.3f}")
+            if not check["passed"]:
+                failures += 1
+                ET.SubElement(case, "failure", message=check["name"])
+        if r["exit_code"] != 0 and all(c["passed"] for c in checks):
+            failures += 1
+            case = ET.SubElement(suite, "testcase", classname=r["script"][:-3], name="exit status")
+            ET.SubElement(case, "failure", message=f"exit code {r['exit_code']}")
+        ET.SubElement(suite, "system-out").text = r["output"]
+    suite.set("failures", str(failures))
+    ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the verification suite in parallel.")
+    parser.add_argument("--workers", type=int, default=None, help="pool size (default: cores)")
+    parser.add_argument("--json", default=DEFAULT_REPORT, help="JSON report path")
+    parser.add_argument("--junit", default=None, help="JUnit XML report path")
+    parser.add_argument("--quiet", action="store_true", help="suppress per-script output")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("GENESIS PACKAGING OS — VERIFICATION SUITE")
+    print("=" * 60)
+    print()
+
+    report = run_suite(workers=args.workers, history=args.json)
+
+    for r in report["results"]:
+        print(f"--- {r['name']} ({r['script']}, {r['wall_time_s']:.2f} s) ---")
+        if not args.quiet:
+            print(r["output"])
+        if not r["passed"]:
+            print(f"*** FAILED: {r['name']} ***")
+            print()
+
+    print("=" * 60)
+    if report["passed"]:
+        print(f"ALL {report['n_passed']} VERIFICATIONS PASSED")
+    else:
+        print(f"{report['n_failed']} FAILED, {report['n_passed']} PASSED")
+    print(f"{report['n_checks']} checks, {report['workers']} worker(s): "
+          f"wall {report['wall_time_s']:.2f} s, summed script time {report['cpu_time_s']:.2f} s")
+    print("=" * 60)
+    print()
+    print(EVIDENCE_SUMMARY)
+    print()
+
+    try:
+        write_json(report, args.json)
+    except OSError as e:
+        print(f"Could not write the JSON report ({e}); set --json or $PACKAGING_OS_CACHE")
+    if args.junit:
+        write_junit(report, args.junit)
+    return 0 if report["passed"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+SOBOL SENSITIVITY: Global Variance-Based Sensitivity of Panel Warpage
+
+design_around_impossibility.json states "k_edge sensitivity <1%" as a
+string. This module computes such numbers: first-order (S1) and total
+(ST) Sobol indices of W_pv over k_azi, k_edge, substrate material,
+thermal load and mesh density, with bootstrap confidence intervals.
+
+Sampling (Saltelli 2010):
+    A, B        N × d halves of one scrambled Sobol' sequence of
+                dimension 2d (scipy.stats.qmc.Sobol, N a power of two)
+    A_B^(i)     A with column i taken from B
+    model runs  N × (d + 2): f(A), f(B) and f(A_B^(i)) for every i
+
+Estimators, with V the variance of f(A) ∪ f(B):
+    S1_i = mean(f(B) · (f(A_B^(i)) - f(A))) / V          (Saltelli 2010)
+    ST_i = mean((f(A) - f(A_B^(i)))²) / (2V)              (Jansen 1999)
+
+Bootstrap: the N base rows are resampled with replacement (the same
+rows across A, B and every A_B^(i)) and the indices recomputed for all
+replicates at once; the CI is the percentile interval.
+
+Model rows are laid out sample by sample (A_j, B_j, A_B^(1)_j, ...)
+and evaluated in batches of whole samples, in-process or on a process
+pool. Factors are unit-interval columns decoded to values: continuous
+ones uniformly on [low, high], categorical ones to one of their levels.
+The model is any picklable callable taking a dict of decoded columns,
+as in monte_carlo_yield.
+
+Run: python sobol_sensitivity.py
+"""
+
+import functools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+# Base samples per evaluation batch
+SOBOL_BATCH = 32
+
+# Bootstrap replicates and two-sided confidence level
+BOOTSTRAP_SAMPLES = 1000
+CONFIDENCE = 0.95
+
+# Substrates: Young's modulus [Pa], Poisson's ratio, CTE [1/K] (handbook values)
+SUBSTRATES = {
+    "glass": (75e9, 0.23, 3.2e-6),
+    "Si": (130e9, 0.28, 2.6e-6),
+    "GaN": (295e9, 0.25, 5.6e-6),
+    "AlN": (330e9, 0.24, 4.5e-6),
+    "InP": (61e9, 0.36, 4.6e-6),
+}
+
+# Mesh densities of the design-around study [nodes per side]
+MESH_DENSITIES = (30, 40, 50, 70, 100)
+
+# Width of the edge band whose support k_edge stiffens [m]
+EDGE_BAND = 0.02
+
+# =============================================================================
+# FACTORS
+# =============================================================================
+
+class Factor(NamedTuple):
+    """One model input: uniform on [low, high], or one of `levels`."""
+    name: str
+    low: float = 0.0
+    high: float = 1.0
+    levels: Tuple = None
+
+    def decode(self, u):
+        if self.levels is not None:
+            index = np.minimum((u * len(self.levels)).astype(int), len(self.levels) - 1)
+            return np.asarray(self.levels)[index]
+        return self.low + u * (self.high - self.low)
+
+# Design-around parameter space (the azimuthal map is floored at K_MIN as in
+# AzimuthalBasis.stiffness, so the k_azi range is not bounded by K > 0)
+DESIGN_FACTORS = (
+    Factor("k_azi", 0.0, 0.95),
+    Factor("k_edge", 0.0, 6.0),
+    Factor("material", levels=tuple(SUBSTRATES)),
+    Factor("load", levels=("scan", "gradient", "die_array")),
+    Factor("mesh", levels=MESH_DENSITIES),
+)
+
+# =============================================================================
+# PLATE MODEL
+# =============================================================================
+
+# Memoized per process for the same reason as monte_carlo_yield._load_surrogate
+@functools.lru_cache(maxsize=None)
+def _plate_grid(n_harmonic, loads, n):
+    """Loads, cos(nΘ) and edge band of one n × n mesh."""
+    from compute_cartesian_stiffness import PANEL_WIDTH, PANEL_HEIGHT, generate_thermal_field
+    from plate_solver import thermal_load
+
+    dx, dy = PANEL_WIDTH / (n - 1), PANEL_HEIGHT / (n - 1)
+    T, X, Y = generate_thermal_field(n, n, pattern=list(loads))
+    edge = np.minimum(PANEL_WIDTH / 2 - np.abs(X), PANEL_HEIGHT / 2 - np.abs(Y)) < EDGE_BAND
+    return dx, dy, thermal_load(T, dx, dy), np.cos(n_harmonic * np.arctan2(Y, X)), edge
+
+class PlateSensitivityModel:
+    """
+    Plate warpage W_pv [nm] on max(K_0 [1 + k_azi cos(nΘ)], K_MIN) × (1 + k_edge · edge band).
+
+    The material sets D = E h³ / (12 (1 - ν²)) and scales the glass
+    thermal load by αE / (1 - ν). Rows that differ only in the load
+    share one factorization, which solves every load at once.
+    """
+
+    def __init__(self, n_harmonic=2, loads=("scan", "gradient", "die_array")):
+        self.n_harmonic = n_harmonic
+        self.loads = tuple(loads)
+
+    def __call__(self, samples):
+        from compute_cartesian_stiffness import ALPHA_GLASS, E_GLASS, NU_GLASS, H_GLASS, K_MIN, K_MAX
+        from plate_solver import PlateFactorization, flexural_rigidity
+
+        K_0 = (K_MIN + K_MAX) / 2
+        glass = ALPHA_GLASS * E_GLASS / (1 - NU_GLASS)
+        load_index = {load: i for i, load in enumerate(self.loads)}
+        structure = zip(samples["k_azi"], samples["k_edge"], samples["material"], samples["mesh"])
+        solved = {}
+        W = np.empty(len(samples["k_azi"]))
+        for row, key in enumerate(structure):
+            if key not in solved:
+                k_azi, k_edge, material, n = key
+                E, nu, alpha = SUBSTRATES[material]
+                dx, dy, Q, cos_n, edge = _plate_grid(self.n_harmonic, self.loads, int(n))
+                K = np.maximum(K_0 * (1 + k_azi * cos_n), K_MIN) * (1 + k_edge * edge)
+                w = PlateFactorization(K, dx, dy, D=flexural_rigidity(E, H_GLASS, nu)).solve(Q)
+                solved[key] = np.ptp(w, axis=(-2, -1)) * 1e9 * (alpha * E / (1 - nu)) / glass
+            W[row] = solved[key][load_index[samples["load"][row]]]
+        return W
+
+# =============================================================================
+# SAMPLING AND EVALUATION
+# =============================================================================
+
+def saltelli_rows(d, n_base, seed=0):
+    """
+    Unit-interval model rows in sample order.
+
+    Args:
+        d: Number of factors
+        n_base: Base samples N (rounded up to a power of two)
+        seed: Scrambling seed
+
+    Returns:
+        (N, d + 2, d) array: [:, 0] = A, [:, 1] = B, [:, 2 + i] = A_B^(i)
+    """
+    from scipy.stats import qmc
+
+    m = max(1, math.ceil(math.log2(n_base)))
+    AB = qmc.Sobol(2 * d, scramble=True, seed=seed).random_base2(m)
+    A, B = AB[:, :d], AB[:, d:]
+    rows = np.repeat(A[:, None, :], d + 2, axis=1)
+    rows[:, 1] = B
+    for i in range(d):
+        rows[:, 2 + i, i] = B[:, i]
+    return rows
+
+def _evaluate_batch(model, factors, unit_rows):
+    samples = {f.name: f.decode(unit_rows[:, i]) for i, f in enumerate(factors)}
+    return np.asarray(model(samples), dtype=float)
+
+def evaluate_rows(model, factors, rows, workers=None, batch=SOBOL_BATCH):
+    """
+    Model outputs for saltelli_rows(), shape (N, d + 2).
+
+    Batches hold whole base samples, so a batch sees A_j next to its
+    A_B^(i)_j (models can share work between them).
+    """
+    n, per, d = rows.shape
+    batches = [rows[j:j + batch].reshape(-1, d) for j in range(0, n, batch)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        out = [_evaluate_batch(model, factors, b) for b in batches]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            out = list(pool.map(_evaluate_batch, [model] * len(batches),
+                                [factors] * len(batches), batches))
+    return np.concatenate(out).reshape(n, per)
+
+# =============================================================================
+# INDICES
+# =============================================================================
+
+class SobolIndices(NamedTuple):
+    """First-order and total indices per factor, with bootstrap intervals."""
+    names: Tuple[str, ...]
+    S1: np.ndarray
+    S1_low: np.ndarray
+    S1_high: np.ndarray
+    ST: np.ndarray
+    ST_low: np.ndarray
+    ST_high: np.ndarray
+    variance: float
+    n_base: int
+    evaluations: int
+
+    def records(self):
+        """One dict per factor."""
+        per_factor = [f for f in self._fields if isinstance(getattr(self, f), np.ndarray)]
+        return [dict({"factor": name}, **{f: float(getattr(self, f)[i]) for f in per_factor})
+                for i, name in enumerate(self.names)]
+
+def _indices(Y):
+    """S1 and ST from Y[..., N, d + 2] (leading axes: bootstrap replicates)."""
+    fA, fB, fAB = Y[..., 0], Y[..., 1], Y[..., 2:]
+    V = np.var(np.concatenate([fA, fB], axis=-1), axis=-1)[..., None]
+    S1 = np.mean(fB[..., None] * (fAB - fA[..., None]), axis=-2) / V
+    ST = 0.5 * np.mean((fA[..., None] - fAB)**2, axis=-2) / V
+    return S1, ST
+
+def sobol_indices(Y, names, n_boot=BOOTSTRAP_SAMPLES, confidence=CONFIDENCE, seed=0):
+    """
+    Sobol indices from model outputs.
+
+    Args:
+        Y: (N, d + 2) outputs of evaluate_rows()
+        names: d factor names
+        n_boot: Bootstrap replicates (0: no intervals)
+        confidence: Two-sided level of the percentile intervals
+        seed: Bootstrap seed
+
+    Returns:
+        SobolIndices
+    """
+    n, d = Y.shape[0], Y.shape[1] - 2
+    S1, ST = _indices(Y)
+    lo_q, hi_q = 50 * (1 - confidence), 50 * (1 + confidence)
+    if n_boot:
+        rng = np.random.default_rng(seed)
+        S1_b, ST_b = np.empty((n_boot, d)), np.empty((n_boot, d))
+        # Replicates in blocks so the gathered copies of Y stay small
+        block = max(1, 2**22 // Y.size)
+        for b0 in range(0, n_boot, block):
+            b1 = min(b0 + block, n_boot)
+            S1_b[b0:b1], ST_b[b0:b1] = _indices(Y[rng.integers(0, n, (b1 - b0, n))])
+        S1_ci = np.percentile(S1_b, [lo_q, hi_q], axis=0)
+        ST_ci = np.percentile(ST_b, [lo_q, hi_q], axis=0)
+    else:
+        S1_ci = ST_ci = np.full((2, d), np.nan)
+    variance = float(np.var(Y[:, :2]))
+    return SobolIndices(tuple(names), S1, *S1_ci, ST, *ST_ci, variance, n, Y.size)
+
+def sobol_sensitivity(model, factors, n_base=256, seed=0, workers=None, n_boot=BOOTSTRAP_SAMPLES,
+                      confidence=CONFIDENCE):
+    """
+    Saltelli sampling, batched evaluation and Sobol indices in one call.
+
+    Args:
+        model: Picklable callable, dict name → (n,) decoded column → (n,) output
+        factors: Sequence of Factor
+        n_base: Base samples N (a power of two; N × (d + 2) model runs)
+        seed: Seed of the Sobol' scrambling and the bootstrap
+        workers: Processes (default: one per core; 1 runs in-process)
+        n_boot, confidence: As for sobol_indices
+
+    Returns:
+        SobolIndices
+    """
+    rows = saltelli_rows(len(factors), n_base, seed)
+    Y = evaluate_rows(model, factors, rows, workers)
+    return sobol_indices(Y, [f.name for f in factors], n_boot, confidence, seed)
+
+# =============================================================================
+# MAIN DEMONSTRATION
+# =============================================================================
+
+def ishigami(samples, a=7.0, b=0.1):
+    """Ishigami test function on x1, x2, x3 ∈ [-π, π] (analytic Sobol indices)."""
+    x1, x2, x3 = samples["x1"], samples["x2"], samples["x3"]
+    return np.sin(x1) + a * np.sin(x2)**2 + b * x3**4 * np.sin(x1)
+
+def _print_indices(result, exact=None):
+    print(f"  {'Factor':<10} {'S1':>7} {'95% CI':>17} {'ST':>7} {'95% CI':>17}"
+          + ("  exact S1 / ST" if exact else ""))
+    for i, r in enumerate(result.records()):
+        line = (f"  {r['factor']:<10} {r['S1']:>7.3f} [{r['S1_low']:>6.3f}, {r['S1_high']:>6.3f}] "
+                f"{r['ST']:>7.3f} [{r['ST_low']:>6.3f}, {r['ST_high']:>6.3f}]")
+        if exact:
+            line += f"  {exact[0][i]:.3f} / {exact[1][i]:.3f}"
+        print(line)
+
+def main():
+    import time
+
+    print("=" * 72)
+    print("SOBOL SENSITIVITY: First-Order and Total Indices of W_pv")
+    print("=" * 72)
+
+    # Estimator check on the Ishigami function (a = 7, b = 0.1)
+    factors = [Factor(f"x{i}", -np.pi, np.pi) for i in (1, 2, 3)]
+    t0 = time.perf_counter()
+    result = sobol_sensitivity(ishigami, factors, n_base=2**14, workers=1)
+    t = time.perf_counter() - t0
+    exact = ((0.3139, 0.4424, 0.0), (0.5576, 0.4424, 0.2437))
+    print(f"\nIshigami, N = {result.n_base}: {result.evaluations:,} runs + "
+          f"{BOOTSTRAP_SAMPLES} bootstrap replicates in {t:.2f} s")
+    _print_indices(result, exact)
+
+    # The design-around parameter space on the plate solver
+    n_base = 128
+    t0 = time.perf_counter()
+    result = sobol_sensitivity(PlateSensitivityModel(), DESIGN_FACTORS, n_base=n_base)
+    t = time.perf_counter() - t0
+    print(f"\nPlate solver over k_azi [0, 0.95], k_edge [0, 6], {len(SUBSTRATES)} substrates, "
+          f"3 loads, meshes {MESH_DENSITIES}:")
+    print(f"N = {result.n_base}: {result.evaluations:,} runs in {t:.1f} s, "
+          f"W_pv σ = {np.sqrt(result.variance):.0f} nm")
+    _print_indices(result)
+
+    k_edge = result.names.index("k_edge")
+    print(f"\nk_edge total index: {result.ST[k_edge] * 100:.2f}% of the W_pv variance "
+          f"(95% CI {result.ST_low[k_edge] * 100:.2f} – {result.ST_high[k_edge] * 100:.2f}%); "
+          f"claimed: <1%")
+    print("=" * 72)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+THERMAL SOLVER: Steady-State Conduction in the Glass Panel
+
+Replaces the synthetic Gaussian hotspots of generate_thermal_field with the
+temperature rise produced by an actual die power-density map:
+
+    k h ∇²T(x,y) - H T(x,y) + q(x,y) = 0
+
+with
+    k = in-plane thermal conductivity of the glass   [W/(m·K)]
+    h = panel thickness                              [m]
+    H = convective loss, both faces (2 × h_conv)     [W/(m²·K)]
+    q = dissipated power per unit panel area         [W/m²]
+    T = temperature rise above ambient               [K]
+
+Panel edges are insulated (∂T/∂n = 0). The solution is the convolution of
+q with the Green's function of (H - k h ∇²) under those edges, which the
+2-D DCT-II diagonalizes. The kernel is precomputed once per grid and
+material, so every new power map costs one forward and one inverse
+transform.
+
+The transient mode steps the same balance with thermal mass through a
+reflow/cool-down profile of the ambient temperature T_amb(t):
+
+    ρ c h ∂T/∂t = k h ∇²T - 2 h_conv(x,y) (T - T_amb(t)) + q
+
+using Peaceman-Rachford ADI: each step is two half steps, each implicit
+along one axis, i.e. a batch of tridiagonal solves along rows and then
+columns. The scheme is unconditionally stable and costs O(nx × ny) per
+step. Thermal-moment snapshots M_T(t) stream to a .npy memmap.
+
+Run: python thermal_solver.py
+"""
+
+import os
+from functools import lru_cache
+
+import numpy as np
+import scipy.fft
+
+from compute_cartesian_stiffness import (
+    H_GLASS, PANEL_WIDTH, PANEL_HEIGHT,
+    compute_cartesian_stiffness, compute_thermal_moment,
+)
+from plate_solver import neumann_laplacian_eigenvalues
+
+# =============================================================================
+# THERMAL CONSTANTS
+# =============================================================================
+
+# AGC EN-A1 Glass
+K_THERMAL_GLASS = 1.1     # Thermal conductivity [W/(m·K)]
+RHO_GLASS = 2500.0        # Density [kg/m³]
+CP_GLASS = 800.0          # Specific heat [J/(kg·K)]
+
+# Natural convection per face
+H_CONVECTION = 10.0       # [W/(m²·K)]
+
+# Forced convection per face in a reflow oven
+H_REFLOW = 60.0           # [W/(m²·K)]
+
+# Reflow profile (multi_die_comparison.json: T_ref = 260°C, T_room = 25°C)
+T_REF_C = 260.0           # Peak reflow / stress-free temperature [°C]
+T_ROOM_C = 25.0           # Room temperature [°C]
+REFLOW_PROFILE = (        # (time [s], oven temperature [°C]), linear in between
+    (0.0, T_ROOM_C),
+    (90.0, 150.0),        # ramp to soak
+    (180.0, 180.0),       # soak
+    (240.0, T_REF_C),     # ramp to peak
+    (270.0, T_REF_C),     # time above liquidus
+    (450.0, T_ROOM_C),    # cool-down
+    (600.0, T_ROOM_C),    # settle
+)
+
+# =============================================================================
+# POWER MAPS
+# =============================================================================
+
+def _cell_overlap(edges_lo, edges_hi, lo, hi):
+    """Length of overlap between grid cells [edges_lo, edges_hi] and dies [lo, hi]."""
+    return np.clip(np.minimum(edges_hi[None, :], hi[:, None])
+                   - np.maximum(edges_lo[None, :], lo[:, None]), 0.0, None)
+
+def floorplan_power_map(nx, ny, centers, widths, heights, powers):
+    """
+    Rasterize rectangular dies into a power-density map.
+
+    Each die's power is spread uniformly over its footprint, and each node
+    receives the power falling inside its dx × dy cell (the same cells the
+    conduction operator uses), so Σ q dx dy equals the floorplan power.
+
+    Args:
+        nx, ny: Grid resolution (same grid as generate_thermal_field)
+        centers: (n, 2) die centres [m]
+        widths, heights: (n,) die dimensions [m]
+        powers: (n,) dissipated power per die [W]
+
+    Returns:
+        q: (ny, nx) power density [W/m²]
+    """
+    centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+    n = len(centers)
+    widths = np.broadcast_to(np.asarray(widths, dtype=float), n)
+    heights = np.broadcast_to(np.asarray(heights, dtype=float), n)
+    powers = np.broadcast_to(np.asarray(powers, dtype=float), n)
+
+    dx = PANEL_WIDTH / (nx - 1)
+    dy = PANEL_HEIGHT / (ny - 1)
+    x = np.linspace(-PANEL_WIDTH/2, PANEL_WIDTH/2, nx)
+    y = np.linspace(-PANEL_HEIGHT/2, PANEL_HEIGHT/2, ny)
+
+    ox = _cell_overlap(x - dx/2, x + dx/2, centers[:, 0] - widths/2, centers[:, 0] + widths/2)
+    oy = _cell_overlap(y - dy/2, y + dy/2, centers[:, 1] - heights/2, centers[:, 1] + heights/2)
+    ox *= (powers / (widths * heights))[:, None]
+
+    # Power per cell divided by cell area gives density
+    return (oy.T @ ox) / (dx * dy)
+
+# =============================================================================
+# GREEN'S FUNCTION SOLVER
+# =============================================================================
+
+@lru_cache(maxsize=16)
+def green_kernel(nx, ny, dx, dy, k=K_THERMAL_GLASS, h=H_GLASS, h_conv=H_CONVECTION):
+    """
+    Green's function of (2 h_conv - k h ∇²) in the 2-D DCT-II basis.
+
+        Ĝ[j, i] = 1 / (2 h_conv - k h λ[j, i])
+
+    Cached per grid and material; the returned array is read-only.
+    """
+    G = 1.0 / (2 * h_conv - k * h * neumann_laplacian_eigenvalues(nx, ny, dx, dy))
+    G.flags.writeable = False
+    return G
+
+def solve_steady_temperature(q, dx, dy, k=K_THERMAL_GLASS, h=H_GLASS,
+                             h_conv=H_CONVECTION, workers=None):
+    """
+    Steady-state temperature rise for a power-density map.
+
+    Args:
+        q: Power density [W/m²], shape (ny, nx) or a stack (n, ny, nx)
+        dx, dy: Grid spacing [m]
+        k: In-plane thermal conductivity [W/(m·K)]
+        h: Panel thickness [m]
+        h_conv: Convective coefficient per face [W/(m²·K)]
+        workers: Threads for scipy.fft
+
+    Returns:
+        T: Temperature rise above ambient [K], same shape as q
+    """
+    ny, nx = q.shape[-2:]
+    G = green_kernel(nx, ny, float(dx), float(dy), float(k), float(h), float(h_conv))
+    q_hat = scipy.fft.dctn(q, axes=(-2, -1), norm="ortho", workers=workers)
+    q_hat *= G
+    return scipy.fft.idctn(q_hat, axes=(-2, -1), norm="ortho", overwrite_x=True,
+                           workers=workers)
+
+# =============================================================================
+# TRANSIENT ADI SOLVER
+# =============================================================================
+
+class _TridiagonalLines:
+    """
+    Batched tridiagonal factorization along axis 0 of an (n, m) array.
+
+    Solves m independent systems with constant off-diagonals `off` and
+    per-node diagonal `diag` (n, m). The Thomas-algorithm factors are
+    computed once; each solve is one forward and one backward sweep,
+    vectorized across the m lines.
+    """
+
+    def __init__(self, off, diag):
+        n = diag.shape[0]
+        self.off = off
+        self.inv = np.empty_like(diag)
+        self.cp = np.empty_like(diag)
+        self.inv[0] = 1.0 / diag[0]
+        self.cp[0] = off * self.inv[0]
+        for i in range(1, n):
+            self.inv[i] = 1.0 / (diag[i] - off * self.cp[i - 1])
+            self.cp[i] = off * self.inv[i]
+
+    def solve(self, d):
+        """Overwrite d (n, m) with the solution."""
+        n = d.shape[0]
+        d[0] *= self.inv[0]
+        for i in range(1, n):
+            d[i] -= self.off * d[i - 1]
+            d[i] *= self.inv[i]
+        for i in range(n - 2, -1, -1):
+            d[i] -= self.cp[i] * d[i + 1]
+        return d
+
+def _second_difference_along(T, axis, r, out):
+    """out += r × (mirrored 1-D second difference of T along axis)."""
+    T = np.moveaxis(T, axis, 0)
+    o = np.moveaxis(out, axis, 0)
+    g = np.diff(T, axis=0)
+    g *= r
+    o[:-1] += g
+    o[1:] -= g
+    return out
+
+def iter_reflow(nx, ny, dt=0.5, profile=REFLOW_PROFILE, h_conv=H_REFLOW, q=None,
+                T0=None, k=K_THERMAL_GLASS, h=H_GLASS, rho=RHO_GLASS, cp=CP_GLASS):
+    """
+    Step the panel temperature through an oven profile with ADI.
+
+    Args:
+        nx, ny: Grid resolution (same grid as generate_thermal_field)
+        dt: Time step [s]; ADI is stable for any dt, accuracy is O(dt²)
+        profile: Sequence of (time [s], ambient [°C]) breakpoints
+        h_conv: Convective coefficient per face [W/(m²·K)], scalar or (ny, nx)
+        q: Optional power density [W/m²], (ny, nx)
+        T0: Initial temperature [°C] (default: the profile's first ambient)
+        k, h, rho, cp: Glass conductivity, thickness, density, specific heat
+
+    Yields:
+        (t, T): Time [s] and the temperature field [°C] at every step,
+                starting with t = 0. T is updated in place; copy it to keep it.
+    """
+    times, ambient = np.asarray(profile, dtype=float).T
+    dx = PANEL_WIDTH / (nx - 1)
+    dy = PANEL_HEIGHT / (ny - 1)
+
+    kappa = k / (rho * cp)                                          # [m²/s]
+    beta = np.broadcast_to(2.0 * np.asarray(h_conv, dtype=float) / (rho * cp * h), (ny, nx))
+    source = np.zeros((ny, nx)) if q is None else q / (rho * cp * h)
+    rx = kappa * dt / (2 * dx**2)
+    ry = kappa * dt / (2 * dy**2)
+
+    # Implicit half-step operators: I - (dt/2)(κ ∂²/∂a² - β/2) along each axis
+    def diag(r, n, axis):
+        d = np.full(n, 1.0 + 2.0 * r)
+        d[0] = d[-1] = 1.0 + r
+        d = d[:, None] if axis == 0 else d[None, :]
+        return d + dt * beta / 4
+    solve_y = _TridiagonalLines(-ry, diag(ry, ny, 0))
+    solve_x = _TridiagonalLines(-rx, diag(rx, nx, 1).T.copy())
+
+    T = np.full((ny, nx), ambient[0]) if T0 is None else np.array(T0, dtype=float)
+    rhs = np.empty_like(T)
+    n_steps = int(round(times[-1] / dt))
+
+    yield 0.0, T
+    for step in range(n_steps):
+        t_mid = (step + 0.5) * dt
+        forcing = (dt / 2) * (beta * np.interp(t_mid, times, ambient) + source)
+
+        # Half step 1: implicit in x, explicit in y
+        np.multiply(T, 1.0 - dt * beta / 4, out=rhs)
+        _second_difference_along(T, 0, ry, rhs)
+        rhs += forcing
+        T[...] = solve_x.solve(rhs.T.copy()).T
+
+        # Half step 2: implicit in y, explicit in x
+        np.multiply(T, 1.0 - dt * beta / 4, out=rhs)
+        _second_difference_along(T, 1, rx, rhs)
+        rhs += forcing
+        T[...] = solve_y.solve(rhs)
+
+        yield (step + 1) * dt, T
+
+def simulate_reflow(out_path, nx, ny, dt=0.5, snapshot_every=10, **kwargs):
+    """
+    Run iter_reflow and stream thermal-moment snapshots to disk.
+
+    M_T(t) is taken relative to the stress-free temperature T_REF_C, so it
+    is zero while the panel sits at peak reflow and grows as it cools.
+
+    Args:
+        out_path: .npy file for the (n_snapshots, ny, nx) M_T stack [N];
+                  snapshot times go to <out_path stem>_times.npy
+        nx, ny, dt: Grid and time step (see iter_reflow)
+        snapshot_every: Steps between snapshots
+        **kwargs: Passed to iter_reflow
+
+    Returns:
+        (out_path, times_path)
+    """
+    profile = kwargs.get("profile", REFLOW_PROFILE)
+    n_steps = int(round(profile[-1][0] / dt))
+    n_snap = n_steps // snapshot_every + 1
+
+    M_T = np.lib.format.open_memmap(out_path, mode="w+", dtype=float, shape=(n_snap, ny, nx))
+    snap_times = np.empty(n_snap)
+    for step, (t, T) in enumerate(iter_reflow(nx, ny, dt=dt, **kwargs)):
+        if step % snapshot_every == 0:
+            i = step // snapshot_every
+            np.subtract(T, T_REF_C, out=M_T[i])
+            compute_thermal_moment(M_T[i], out=M_T[i])
+            snap_times[i] = t
+    M_T.flush()
+    del M_T
+
+    times_path = os.path.splitext(out_path)[0] + "_times.npy"
+    np.save(times_path, snap_times)
+    return out_path, times_path
+
+# =============================================================================
+# MAIN DEMONSTRATION
+# =============================================================================
+
+def main():
+    import time
+
+    print("=" * 72)
+    print("THERMAL SOLVER: k h ∇²T - 2 h_conv T + q = 0")
+    print("=" * 72)
+
+    nx, ny = 512, 512
+    dx = PANEL_WIDTH / (nx - 1)
+    dy = PANEL_HEIGHT / (ny - 1)
+
+    # One logic die (5 W) flanked by 8 HBM stacks (0.5 W each), powered
+    # on the bare panel with only natural convection
+    centers = [(0.0, 0.0)] + [(sx * 0.025, sy * 0.012)
+                              for sx in (-1, 1) for sy in (-1.5, -0.5, 0.5, 1.5)]
+    widths = [0.030] + [0.011] * 8
+    heights = [0.030] + [0.010] * 8
+    powers = [5.0] + [0.5] * 8
+
+    q = floorplan_power_map(nx, ny, centers, widths, heights, powers)
+    print(f"\nGrid {nx} × {ny}, {len(centers)} dies, "
+          f"total power {np.sum(q) * dx * dy:.1f} W (floorplan {sum(powers):.1f} W)")
+
+    t0 = time.perf_counter()
+    T = solve_steady_temperature(q, dx, dy)
+    first = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    n_maps = 20
+    for _ in range(n_maps):
+        solve_steady_temperature(q, dx, dy)
+    per_map = (time.perf_counter() - t0) / n_maps
+
+    print(f"  Temperature rise: {T.min():.2f} K to {T.max():.2f} K")
+    print(f"  Energy balance: convected {2 * H_CONVECTION * np.sum(T) * dx * dy:.1f} W")
+    print(f"  First solve (kernel build): {first*1e3:.1f} ms, cached: {per_map*1e3:.1f} ms per map")
+
+    K, _, lap = compute_cartesian_stiffness(T, dx, dy)
+    print(f"  Cartesian stiffness: {K.min():.2e} to {K.max():.2e} N/m³, "
+          f"mean {K.mean():.2e} N/m³")
+
+    # Transient reflow: panel edges see stronger convection than the centre
+    import tempfile
+
+    nx, ny = 128, 128
+    x = np.linspace(-PANEL_WIDTH/2, PANEL_WIDTH/2, nx)
+    y = np.linspace(-PANEL_HEIGHT/2, PANEL_HEIGHT/2, ny)
+    edge_dist = np.minimum(PANEL_WIDTH/2 - np.abs(x)[None, :], PANEL_HEIGHT/2 - np.abs(y)[:, None])
+    h_conv = H_REFLOW * (1.0 + np.exp(-edge_dist / 0.02))
+
+    print(f"\nReflow transient on {nx} × {ny}: "
+          f"{T_ROOM_C:.0f}°C → {T_REF_C:.0f}°C → {T_ROOM_C:.0f}°C over {REFLOW_PROFILE[-1][0]:.0f} s")
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        path, times_path = simulate_reflow(os.path.join(tmp, "M_T.npy"), nx, ny, dt=1.0,
+                                           snapshot_every=30, h_conv=h_conv)
+        elapsed = time.perf_counter() - t0
+        M_T = np.load(path, mmap_mode="r")
+        times = np.load(times_path)
+        print(f"  {len(times)} snapshots streamed to disk in {elapsed:.2f} s")
+        print(f"  {'t (s)':>8} {'mean M_T (N)':>14} {'M_T spread (N)':>16}")
+        for t, m in zip(times[::3], M_T[::3]):
+            print(f"  {t:>8.0f} {m.mean():>14.4f} {m.max() - m.min():>16.5f}")
+    print("=" * 72)
+
+if __name__ == "__main__":
+    main()
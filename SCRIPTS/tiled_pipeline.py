@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+TILED PIPELINE: Out-of-Core Cartesian Stiffness for Panel-Scale Grids
+
+compute_cartesian_stiffness() holds the whole panel in memory several
+times over (X, Y, T, M_T, ∇²M_T, |∇²M_T|, K). At manufacturing resolution
+(510 × 515 mm at 50 µm ≈ 10⁸ nodes) that is tens of gigabytes.
+
+This module streams the same computation through halo-padded tiles:
+
+    Pass 1 (reduction):  T → M_T → ∇²M_T per tile, written to .npy memmaps,
+                         while accumulating the global max |∇²M_T|
+    Pass 2 (mapping):    K = K_min + (K_max - K_min) × |∇²M_T| / max
+
+Each tile is evaluated on a window padded by HALO nodes, so the stencil
+sees the same neighbours as the in-memory version and the outputs are
+bit-identical to compute_cartesian_stiffness(). Peak memory scales with
+the tile size, not the panel size.
+
+Run: python tiled_pipeline.py
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from compute_cartesian_stiffness import (
+    PANEL_WIDTH, PANEL_HEIGHT, K_MIN, K_MAX,
+    thermal_field_at, compute_thermal_moment, compute_laplacian,
+    generate_thermal_field, compute_cartesian_stiffness,
+)
+
+# Halo width: one node for the 5-point stencil plus one for the
+# edge-row copy of the Neumann boundary (the 9-point stencil needs two)
+HALO = 2
+
+# Backends that only read a local neighbourhood and can therefore be tiled
+TILEABLE_BACKENDS = ("stencil", "stencil9")
+
+# =============================================================================
+# TILING
+# =============================================================================
+
+def iter_tiles(ny, nx, tile):
+    """Yield (r0, r1, c0, c1) bounds covering an ny × nx grid in tile × tile blocks."""
+    for r0 in range(0, ny, tile):
+        for c0 in range(0, nx, tile):
+            yield r0, min(r0 + tile, ny), c0, min(c0 + tile, nx)
+
+def halo_window(r0, r1, c0, c1, ny, nx, halo=HALO):
+    """Tile bounds grown by `halo` nodes on every side, clamped to the grid."""
+    return max(r0 - halo, 0), min(r1 + halo, ny), max(c0 - halo, 0), min(c1 + halo, nx)
+
+def thermal_tile(window, x, y, pattern, T=None, layout=None):
+    """
+    Temperature on a window (r0, r1, c0, c1).
+
+    Args:
+        window: Row/column bounds
+        x, y: 1-D panel coordinates [m]
+        pattern: Pattern name for thermal_field_at (ignored if T is given)
+        T: Optional precomputed field (e.g. a memmapped .npy) to slice instead
+        layout: Optional (centers, sizes, powers) for "die_array"
+    """
+    r0, r1, c0, c1 = window
+    if T is not None:
+        return np.asarray(T[r0:r1, c0:c1], dtype=float)
+    return thermal_field_at(x[c0:c1], y[r0:r1], pattern, layout)
+
+def laplacian_tile(M_T_window, window, tile, dx, dy, backend="stencil"):
+    """
+    ∇²M_T on a tile, computed on its halo window and cropped.
+
+    Args:
+        M_T_window: Thermal moment on the halo window
+        window: (r0, r1, c0, c1) of the halo window
+        tile: (r0, r1, c0, c1) of the tile inside it
+        backend: One of TILEABLE_BACKENDS
+    """
+    lap = compute_laplacian(M_T_window, dx, dy, backend=backend)
+    wr0, _, wc0, _ = window
+    r0, r1, c0, c1 = tile
+    return lap[r0 - wr0:r1 - wr0, c0 - wc0:c1 - wc0]
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+def tiled_cartesian_stiffness(out_dir, nx, ny, pattern="die_array", T=None,
+                              tile=1024, keep=("T", "M_T", "lap_M_T"), layout=None,
+                              backend="stencil"):
+    """
+    Compute the Cartesian stiffness map tile by tile into .npy files.
+
+    Args:
+        out_dir: Directory for the output .npy files
+        nx, ny: Grid resolution
+        pattern: Thermal pattern (see generate_thermal_field)
+        T: Optional (ny, nx) temperature array to use instead of a pattern;
+           np.load(..., mmap_mode="r") keeps it on disk
+        tile: Tile edge length in nodes
+        keep: Intermediate fields to write besides K ("T", "M_T", "lap_M_T");
+              ∇²M_T is always written since pass 2 reads it back
+        layout: Optional (centers, sizes, powers) die layout for "die_array"
+        backend: Laplacian backend; must be local (TILEABLE_BACKENDS)
+
+    Returns:
+        paths: Dict of field name → .npy path
+        lap_max: Global max |∇²M_T| used for normalization
+    """
+    if nx < 3 or ny < 3:
+        raise ValueError("Grid must be at least 3 × 3")
+    if backend not in TILEABLE_BACKENDS:
+        raise ValueError(f"Backend {backend!r} is not local and cannot be tiled")
+    if T is not None and T.shape != (ny, nx):
+        raise ValueError(f"T has shape {T.shape}, expected {(ny, nx)}")
+
+    os.makedirs(out_dir, exist_ok=True)
+    dx = PANEL_WIDTH / (nx - 1)
+    dy = PANEL_HEIGHT / (ny - 1)
+    x = np.linspace(-PANEL_WIDTH/2, PANEL_WIDTH/2, nx)
+    y = np.linspace(-PANEL_HEIGHT/2, PANEL_HEIGHT/2, ny)
+
+    names = [n for n in ("T", "M_T") if n in keep] + ["lap_M_T", "K"]
+    paths = {n: os.path.join(out_dir, f"{n}.npy") for n in names}
+    out = {n: np.lib.format.open_memmap(paths[n], mode="w+", dtype=float, shape=(ny, nx))
+           for n in names}
+
+    # Pass 1: fields and the global reduction
+    lap_max = 0.0
+    for bounds in iter_tiles(ny, nx, tile):
+        r0, r1, c0, c1 = bounds
+        window = halo_window(*bounds, ny, nx)
+        T_win = thermal_tile(window, x, y, pattern, T, layout)
+        M_T_win = compute_thermal_moment(T_win)
+        lap = laplacian_tile(M_T_win, window, bounds, dx, dy, backend)
+
+        wr0, _, wc0, _ = window
+        inner = (slice(r0 - wr0, r1 - wr0), slice(c0 - wc0, c1 - wc0))
+        if "T" in out:
+            out["T"][r0:r1, c0:c1] = T_win[inner]
+        if "M_T" in out:
+            out["M_T"][r0:r1, c0:c1] = M_T_win[inner]
+        out["lap_M_T"][r0:r1, c0:c1] = lap
+        lap_max = max(lap_max, float(np.max(np.abs(lap))))
+
+    # Pass 2: normalize and map to the stiffness range
+    for r0, r1, c0, c1 in iter_tiles(ny, nx, tile):
+        lap_abs = np.abs(out["lap_M_T"][r0:r1, c0:c1])
+        if lap_max > 0:
+            lap_norm = lap_abs / lap_max
+        else:
+            lap_norm = np.zeros_like(lap_abs)
+        out["K"][r0:r1, c0:c1] = K_MIN + (K_MAX - K_MIN) * lap_norm
+
+    for arr in out.values():
+        arr.flush()
+    if "lap_M_T" not in keep:
+        del out["lap_M_T"]
+        os.remove(paths.pop("lap_M_T"))
+
+    return paths, lap_max
+
+# =============================================================================
+# MAIN DEMONSTRATION
+# =============================================================================
+
+def main():
+    import time
+
+    print("=" * 72)
+    print("TILED PIPELINE: Out-of-Core Cartesian Stiffness")
+    print("=" * 72)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Equivalence with the in-memory pipeline
+        nx, ny = 300, 257
+        T, _, _ = generate_thermal_field(nx, ny, pattern="die_array")
+        K_ref, _, lap_ref = compute_cartesian_stiffness(T, PANEL_WIDTH / (nx - 1), PANEL_HEIGHT / (ny - 1))
+        paths, _ = tiled_cartesian_stiffness(os.path.join(tmp, "check"), nx, ny, tile=64)
+        K = np.load(paths["K"], mmap_mode="r")
+        lap = np.load(paths["lap_M_T"], mmap_mode="r")
+        same = np.array_equal(K, K_ref) and np.array_equal(lap, lap_ref)
+        print(f"\n{nx} × {ny} grid, 64-node tiles vs in-memory: "
+              f"{'IDENTICAL' if same else 'MISMATCH'}")
+
+        # Panel-scale run
+        nx, ny = 4000, 4000
+        t0 = time.perf_counter()
+        paths, lap_max = tiled_cartesian_stiffness(os.path.join(tmp, "panel"), nx, ny,
+                                                   tile=512, keep=())
+        elapsed = time.perf_counter() - t0
+        K = np.load(paths["K"], mmap_mode="r")
+        print(f"{nx} × {ny} = {nx*ny:,} nodes in {elapsed:.1f} s, 512-node tiles")
+        print(f"  max |∇²M_T| = {lap_max:.3e} N/m²")
+        print(f"  K range: {K.min():.2e} to {K.max():.2e} N/m³")
+        print(f"  Output: {paths['K']} ({os.path.getsize(paths['K']) / 1e6:.0f} MB on disk)")
+
+    print("=" * 72)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+VERIFICATION RESULTS: Structured Outcome of One verify_* Check
+
+Every verify_*.py script exposes a check function, e.g.
+
+    from verify_fatigue_life import check_fatigue_life
+    result = check_fatigue_life()
+    result.passed                 → True
+    result.checks                 → (("Copper TSV passes fatigue", True), ...)
+    result.metrics["min_margin"]  → 1.2e9
+
+The function runs silently by default; with verbose=True it prints the
+same report the script prints when run directly. This module only holds
+the result type and must stay free of heavy imports (even typing): it
+is loaded on the packaging_os.py cold-start path.
+"""
+
+from collections import namedtuple
+
+class CheckResult(namedtuple("CheckResult", "name checks metrics")):
+    """
+    Outcome of one verification.
+
+    Fields:
+        name: Short identifier, e.g. "fatigue_life"
+        checks: Tuple of (description, passed) pairs, in report order
+        metrics: Dict of the key numbers behind the checks
+    """
+    __slots__ = ()
+
+    @property
+    def passed(self):
+        return all(ok for _, ok in self.checks)
+
+    def as_dict(self):
+        """JSON-ready form (NumPy scalars in metrics are converted to Python numbers)."""
+        return {
+            "name": self.name,
+            "passed": self.passed,
+            "checks": [{"name": desc, "passed": bool(ok)} for desc, ok in self.checks],
+            "metrics": {k: v.item() if hasattr(v, "item") else v for k, v in self.metrics.items()},
+        }
+
+def printer(verbose):
+    """print when verbose, otherwise a no-op with the same signature."""
+    return print if verbose else _silent
+
+def _silent(*args, **kwargs):
+    pass
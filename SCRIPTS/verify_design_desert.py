@@ -12,13 +12,25 @@ import json
 import os
 import sys
 
-def main():
+from verification import CheckResult, printer
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "EVIDENCE",
+                         "design_around_impossibility.json")
+
+def check_design_desert(verbose=False):
+    """
+    Check the 237-case design-around analysis (JSON fields only, no NumPy).
+
+    Returns:
+        CheckResult with metrics total_fea_cases, paths_blocked,
+        chaos_cliff_cv_percent, sweet_spot_A_cv_percent
+    """
+    print = printer(verbose)
     print("="*60)
     print("VERIFICATION: Design-Around Impossibility Analysis")
     print("="*60)
     
-    data_path = os.path.join(os.path.dirname(__file__), "..", "EVIDENCE", "design_around_impossibility.json")
-    with open(data_path) as f:
+    with open(DATA_FILE) as f:
         data = json.load(f)
     
     print(f"\nTitle: {data['title']}")
@@ -85,16 +97,25 @@ def main():
             all_pass = False
         print(f"  [{status}] {name}")
     
+    result = CheckResult("design_desert", tuple(checks), {
+        "total_fea_cases": data['total_fea_cases'],
+        "paths_blocked": len(data['design_around_paths_blocked']),
+        "chaos_cliff_cv_percent": chaos.get('cv_percent'),
+        "sweet_spot_A_cv_percent": sweet_a.get('cv_percent'),
+    })
     if all_pass:
         print(f"\nRESULT: ALL CHECKS PASS")
         print(f"  Design-around impossibility is verified by {data['total_fea_cases']} FEA cases.")
         print(f"  All {len(data['design_around_paths_blocked'])} alternative paths are blocked.")
     else:
         print(f"\nRESULT: SOME CHECKS FAILED")
-        sys.exit(1)
+        return result
     
     print(f"{'='*60}")
-    return 0
+    return result
+
+def main():
+    return 0 if check_design_desert(verbose=True).passed else 1
 
 if __name__ == "__main__":
     sys.exit(main())
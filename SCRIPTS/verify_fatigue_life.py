@@ -17,103 +17,129 @@ import json
 import os
 import sys
 
+from verification import CheckResult, printer
+
 # ─────────────────────────────────────────────────────────────────────────────
-# Load fatigue data
+# Evidence file
 # ─────────────────────────────────────────────────────────────────────────────
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 EVIDENCE_DIR = os.path.join(os.path.dirname(SCRIPT_DIR), "EVIDENCE")
 DATA_FILE = os.path.join(EVIDENCE_DIR, "fatigue_results.json")
 
-print("=" * 70)
-print("FATIGUE LIFE VERIFICATION")
-print("=" * 70)
-
-with open(DATA_FILE) as f:
-    raw = json.load(f)
-    data = raw.get("results", raw)  # Handle nested or flat format
-
-print(f"\nLoaded {DATA_FILE}")
-print(f"Interfaces tested: {len(data)}")
-
-# ─────────────────────────────────────────────────────────────────────────────
-# Display results
-# ─────────────────────────────────────────────────────────────────────────────
-
 # Standard qualification requirement: 10,000 thermal cycles (AEC-Q100)
 QUALIFICATION_CYCLES = 10_000
 
-print("\n" + "-" * 90)
-print(f"{'Interface':<25} {'Δε_p':>15} {'Cycles to Fail':>18} {'Margin':>15} {'Status':>8}")
-print("-" * 90)
-
-checks = []
-for key, entry in data.items():
-    name = entry['name']
-    delta_eps = entry['delta_epsilon_p']
-    cycles = entry['cycles_to_failure']
-    margin = entry['margin']
-    status = entry['status']
+def check_fatigue_life(verbose=False):
+    """
+    Check the Coffin-Manson results for every interface (JSON fields only, no NumPy).
+
+    Returns:
+        CheckResult with metrics n_interfaces, min_margin, cu_tsv_cycles,
+        sac305_cycles, glass_cycles
+    """
+    print = printer(verbose)
+    print("=" * 70)
+    print("FATIGUE LIFE VERIFICATION")
+    print("=" * 70)
+
+    with open(DATA_FILE) as f:
+        raw = json.load(f)
+        data = raw.get("results", raw)  # Handle nested or flat format
+
+    print(f"\nLoaded {DATA_FILE}")
+    print(f"Interfaces tested: {len(data)}")
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Display results
+    # ─────────────────────────────────────────────────────────────────────────
+
+    print("\n" + "-" * 90)
+    print(f"{'Interface':<25} {'Δε_p':>15} {'Cycles to Fail':>18} {'Margin':>15} {'Status':>8}")
+    print("-" * 90)
+
+    checks = []
+    for key, entry in data.items():
+        name = entry['name']
+        delta_eps = entry['delta_epsilon_p']
+        cycles = entry['cycles_to_failure']
+        margin = entry['margin']
+        status = entry['status']
     
-    print(f"{name:<25} {delta_eps:>15.2e} {cycles:>18,.0f} {margin:>15,.1f}× {status:>8}")
+        print(f"{name:<25} {delta_eps:>15.2e} {cycles:>18,.0f} {margin:>15,.1f}× {status:>8}")
     
-    # Verify each interface passes
-    checks.append((f"{name} passes fatigue", status == "PASS"))
-    checks.append((f"{name} margin > 1,000,000×", margin > 1_000_000))
-
-print("-" * 90)
-
-# ─────────────────────────────────────────────────────────────────────────────
-# Specific assertions
-# ─────────────────────────────────────────────────────────────────────────────
-
-print("\n" + "=" * 70)
-print("VERIFICATION ASSERTIONS")
-print("=" * 70)
-
-# Cu TSV specific check
-cu_cycles = data['copper_tsv']['cycles_to_failure']
-checks.append((f"Cu TSV cycles ≥ 10 billion (actual: {cu_cycles/1e9:.1f}B)", cu_cycles >= 10e9))
-
-# SAC305 specific check
-sac_cycles = data['sac305_solder']['cycles_to_failure']
-checks.append((f"SAC305 cycles ≥ 8 trillion (actual: {sac_cycles/1e12:.1f}T)", sac_cycles >= 8e12))
-
-# Glass interface check (should be highest)
-glass_cycles = data['glass_interface']['cycles_to_failure']
-checks.append((f"Glass interface has highest cycle life ({glass_cycles/1e15:.2f} quadrillion)", 
-               glass_cycles > sac_cycles))
-
-# All pass
-all_pass_status = all(entry['status'] == 'PASS' for entry in data.values())
-checks.append(("All interfaces have PASS status", all_pass_status))
-
-all_pass = True
-for desc, result in checks:
-    status = "PASS" if result else "FAIL"
-    if not result:
-        all_pass = False
-    print(f"  [{status}] {desc}")
-
-# ─────────────────────────────────────────────────────────────────────────────
-# Conclusion
-# ─────────────────────────────────────────────────────────────────────────────
-
-print("\n" + "=" * 70)
-if all_pass:
-    print("ALL VERIFICATIONS PASSED")
-    print()
-    print("CONCLUSION: The optimized density pattern provides extraordinary")
-    print("fatigue life at ALL material interfaces.")
-    print()
-    print(f"  Minimum margin: {min(e['margin'] for e in data.values()):,.0f}× above AEC-Q100 qualification")
-    print(f"  Weakest interface: Copper TSV ({cu_cycles/1e9:.1f} billion cycles)")
-    print(f"  Strongest interface: Glass-Metal ({glass_cycles/1e12:,.0f} trillion cycles)")
-    print()
-    print("This eliminates the 'will it last?' objection from any buyer.")
-    print("The design is inherently more reliable than the packaging materials themselves.")
-else:
-    print("SOME VERIFICATIONS FAILED")
-    sys.exit(1)
-
-print("=" * 70)
+        # Verify each interface passes
+        checks.append((f"{name} passes fatigue", status == "PASS"))
+        checks.append((f"{name} margin > 1,000,000×", margin > 1_000_000))
+
+    print("-" * 90)
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Specific assertions
+    # ─────────────────────────────────────────────────────────────────────────
+
+    print("\n" + "=" * 70)
+    print("VERIFICATION ASSERTIONS")
+    print("=" * 70)
+
+    # Cu TSV specific check
+    cu_cycles = data['copper_tsv']['cycles_to_failure']
+    checks.append((f"Cu TSV cycles ≥ 10 billion (actual: {cu_cycles/1e9:.1f}B)", cu_cycles >= 10e9))
+
+    # SAC305 specific check
+    sac_cycles = data['sac305_solder']['cycles_to_failure']
+    checks.append((f"SAC305 cycles ≥ 8 trillion (actual: {sac_cycles/1e12:.1f}T)", sac_cycles >= 8e12))
+
+    # Glass interface check (should be highest)
+    glass_cycles = data['glass_interface']['cycles_to_failure']
+    checks.append((f"Glass interface has highest cycle life ({glass_cycles/1e15:.2f} quadrillion)", 
+                   glass_cycles > sac_cycles))
+
+    # All pass
+    all_pass_status = all(entry['status'] == 'PASS' for entry in data.values())
+    checks.append(("All interfaces have PASS status", all_pass_status))
+
+    all_pass = True
+    for desc, ok in checks:
+        status = "PASS" if ok else "FAIL"
+        if not ok:
+            all_pass = False
+        print(f"  [{status}] {desc}")
+
+    result = CheckResult("fatigue_life", tuple(checks), {
+        "n_interfaces": len(data),
+        "min_margin": min(e['margin'] for e in data.values()),
+        "cu_tsv_cycles": cu_cycles,
+        "sac305_cycles": sac_cycles,
+        "glass_cycles": glass_cycles,
+    })
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Conclusion
+    # ─────────────────────────────────────────────────────────────────────────
+
+    print("\n" + "=" * 70)
+    if all_pass:
+        print("ALL VERIFICATIONS PASSED")
+        print()
+        print("CONCLUSION: The optimized density pattern provides extraordinary")
+        print("fatigue life at ALL material interfaces.")
+        print()
+        print(f"  Minimum margin: {min(e['margin'] for e in data.values()):,.0f}× above AEC-Q100 qualification")
+        print(f"  Weakest interface: Copper TSV ({cu_cycles/1e9:.1f} billion cycles)")
+        print(f"  Strongest interface: Glass-Metal ({glass_cycles/1e12:,.0f} trillion cycles)")
+        print()
+        print("This eliminates the 'will it last?' objection from any buyer.")
+        print("The design is inherently more reliable than the packaging materials themselves.")
+    else:
+        print("SOME VERIFICATIONS FAILED")
+        return result
+
+    print("=" * 70)
+    return result
+
+def main():
+    return 0 if check_fatigue_life(verbose=True).passed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
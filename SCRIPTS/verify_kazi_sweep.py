@@ -8,56 +8,61 @@ and verifies that warpage rises with k_azi, with a chaos cliff at 0.7-1.15.
 Data source: kazi_dense_sweep.json (Inductiva Cloud HPC, CalculiX)
 """
 
-import json
-import os
 import sys
-import numpy as np
 
-def main():
+from verification import CheckResult, printer
+
+def check_kazi_sweep(verbose=False):
+    """
+    Check the rising trend and chaos-cliff variance of the dense k_azi sweep.
+
+    Returns:
+        CheckResult with metrics n_cases, slope_nm_per_kazi, baseline_nm,
+        peak_nm, peak_kazi, sweet_spot_cv_percent, cliff_cv_percent
+    """
+    import numpy as np
+    from evidence_query import CaseTable
+
+    print = printer(verbose)
     print("="*60)
     print("VERIFICATION: k_azi Sweep Shows Chaos Cliff on Circular Glass")
     print("="*60)
     
-    data_path = os.path.join(os.path.dirname(__file__), "..", "EVIDENCE", "kazi_dense_sweep.json")
-    with open(data_path) as f:
-        cases = json.load(f)
+    # Indexed columns of kazi_dense_sweep.json
+    cases = CaseTable.from_evidence("kazi_dense")
     
     print(f"\nLoaded {len(cases)} FEA cases (circular glass substrate)")
-    print(f"All cases have Inductiva task_id: {all('task_id' in c for c in cases)}")
+    print(f"All cases have Inductiva task_id: {bool(np.all(cases.column('task_id') != ''))}")
     
-    k_azi = np.array([c['k_azi'] for c in cases])
-    warpage = np.array([c['W_pv_nm'] for c in cases])
+    k_azi = cases.column('k_azi')
+    warpage = cases.column('W_pv_nm')
     
     print(f"\nk_azi range: {k_azi.min():.2f} - {k_azi.max():.2f}")
     print(f"Warpage range: {warpage.min():.1f} - {warpage.max():.1f} nm")
     
     # Check 1: Warpage at k_azi=0 (baseline)
-    baseline = warpage[k_azi == 0.0]
+    baseline = warpage[cases.select(k_azi=0.0)]
     print(f"\nBaseline (k_azi=0): {baseline[0]:.1f} nm")
     
     # Check 2: Warpage generally rises with k_azi (trend)
     # Use linear regression to check overall trend
-    from numpy.polynomial import polynomial as P
     coeffs = np.polyfit(k_azi, warpage, 1)
     slope = coeffs[0]
     print(f"Overall trend slope: {slope:.1f} nm per unit k_azi {'(RISING)' if slope > 0 else '(FALLING)'}")
     
     # Check 3: Chaos cliff region (k_azi 0.7-1.15)
-    cliff_mask = (k_azi >= 0.7) & (k_azi <= 1.15)
-    sweet_A_mask = k_azi <= 0.5
+    cliff = cases.aggregate('W_pv_nm', rows=cases.select(k_azi=(0.7, 1.15)))
+    sweet_A = cases.aggregate('W_pv_nm', rows=cases.select(k_azi=(None, 0.5)))
     
-    cliff_warpages = warpage[cliff_mask]
-    sweet_A_warpages = warpage[sweet_A_mask]
-    
-    cliff_cv = np.std(cliff_warpages) / np.mean(cliff_warpages) * 100
-    sweet_cv = np.std(sweet_A_warpages) / np.mean(sweet_A_warpages) * 100
+    cliff_cv = cliff.cv_percent[0]
+    sweet_cv = sweet_A.cv_percent[0]
     
     print(f"\nSweet Spot A (k_azi 0-0.5):")
-    print(f"  Mean warpage: {np.mean(sweet_A_warpages):.1f} nm")
+    print(f"  Mean warpage: {sweet_A.mean[0]:.1f} nm")
     print(f"  CV: {sweet_cv:.1f}%")
     
     print(f"\nChaos Cliff (k_azi 0.7-1.15):")
-    print(f"  Mean warpage: {np.mean(cliff_warpages):.1f} nm")
+    print(f"  Mean warpage: {cliff.mean[0]:.1f} nm")
     print(f"  CV: {cliff_cv:.1f}%")
     
     # Check 4: Peak warpage location
@@ -85,16 +90,28 @@ def main():
             all_pass = False
         print(f"  [{status}] {name}")
     
+    result = CheckResult("kazi_sweep", tuple(checks), {
+        "n_cases": len(cases),
+        "slope_nm_per_kazi": slope,
+        "baseline_nm": baseline[0],
+        "peak_nm": warpage[peak_idx],
+        "peak_kazi": k_azi[peak_idx],
+        "sweet_spot_cv_percent": sweet_cv,
+        "cliff_cv_percent": cliff_cv,
+    })
     if all_pass:
         print(f"\nRESULT: ALL CHECKS PASS")
         print(f"  The k_azi chaos cliff is real and verified by {len(cases)} FEA cases.")
         print(f"  Competitors operating at k_azi 0.7-1.15 will see {cliff_cv:.0f}% variance.")
     else:
         print(f"\nRESULT: SOME CHECKS FAILED")
-        sys.exit(1)
+        return result
     
     print(f"{'='*60}")
-    return 0
+    return result
+
+def main():
+    return 0 if check_kazi_sweep(verbose=True).passed else 1
 
 if __name__ == "__main__":
     sys.exit(main())
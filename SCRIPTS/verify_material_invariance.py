@@ -16,116 +16,135 @@ Conclusion: Competitors CANNOT avoid the cliff by switching materials.
 Evidence file: EVIDENCE/material_sweep_FINAL.json
 """
 
-import json
 import os
 import sys
 
+from verification import CheckResult, printer
+
 # ─────────────────────────────────────────────────────────────────────────────
-# Load data
+# Evidence file
 # ─────────────────────────────────────────────────────────────────────────────
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 EVIDENCE_DIR = os.path.join(os.path.dirname(SCRIPT_DIR), "EVIDENCE")
 DATA_FILE = os.path.join(EVIDENCE_DIR, "material_sweep_FINAL.json")
 
-print("=" * 70)
-print("MATERIAL INVARIANCE VERIFICATION")
-print("=" * 70)
+def check_material_invariance(verbose=False):
+    """
+    Check that the k_azi = 0.8 cliff amplifies warpage for every substrate material.
 
-with open(DATA_FILE) as f:
-    data = json.load(f)
+    Returns:
+        CheckResult with metrics n_cases, materials and amplification
+        (cliff / baseline W_pv per material)
+    """
+    import numpy as np
+    from evidence_query import CaseTable
 
-print(f"\nLoaded {DATA_FILE}")
-print(f"Total FEM cases: {len(data)}")
+    print = printer(verbose)
+    print("=" * 70)
+    print("MATERIAL INVARIANCE VERIFICATION")
+    print("=" * 70)
 
-# ─────────────────────────────────────────────────────────────────────────────
-# Group by material and analyze
-# ─────────────────────────────────────────────────────────────────────────────
+    data = CaseTable.from_evidence("material")
+
+    print(f"\nLoaded {DATA_FILE}")
+    print(f"Total FEM cases: {len(data)}")
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Group by material and analyze
+    # ─────────────────────────────────────────────────────────────────────────
 
-materials = {}
-for case in data:
-    mat = case['material']
-    if mat not in materials:
-        materials[mat] = []
-    materials[mat].append(case)
+    index = data.hash_index('material')
+    first_seen = index.order[index.offsets[:-1]]
+    materials = index.levels[np.argsort(first_seen)].tolist()
 
-print(f"Materials tested: {', '.join(materials.keys())}")
+    print(f"Materials tested: {', '.join(materials)}")
 
-print("\n" + "-" * 85)
-print(f"{'Material':<10} {'k_azi':>6} {'W_pv (nm)':>12} {'W_exp (nm)':>12} {'Task ID':>30}")
-print("-" * 85)
+    print("\n" + "-" * 85)
+    print(f"{'Material':<10} {'k_azi':>6} {'W_pv (nm)':>12} {'W_exp (nm)':>12} {'Task ID':>30}")
+    print("-" * 85)
 
-checks = []
+    checks = []
+    amplification_by_material = {}
 
-for mat in sorted(materials.keys()):
-    cases = sorted(materials[mat], key=lambda x: x['k_azi'])
+    for mat in sorted(materials):
+        rows = data.select(material=mat)
+        rows = rows[np.argsort(data.column('k_azi', rows), kind='stable')]
     
-    # Get warpage at k_azi=0.0 (baseline) and k_azi=0.8 (cliff)
-    baseline = None
-    cliff = None
+        for kazi, wpv, wexp, tid in zip(data.column('k_azi', rows), data.column('W_pv_nm', rows),
+                                        data.column('W_exposure_max_nm', rows),
+                                        data.column('task_id', rows)):
+            print(f"{mat:<10} {kazi:>6.1f} {wpv:>12.1f} {wexp:>12.1f} {tid or 'N/A':>30}")
     
-    for case in cases:
-        kazi = case['k_azi']
-        wpv = case['W_pv_nm']
-        wexp = case['W_exposure_max_nm']
-        tid = case.get('task_id', 'N/A')
-        
-        print(f"{mat:<10} {kazi:>6.1f} {wpv:>12.1f} {wexp:>12.1f} {tid:>30}")
-        
-        if kazi == 0.0:
-            baseline = wpv
-        if kazi == 0.8:
-            cliff = wpv
+        # Get warpage at k_azi=0.0 (baseline) and k_azi=0.8 (cliff)
+        baseline_rows = data.select(material=mat, k_azi=0.0)
+        cliff_rows = data.select(material=mat, k_azi=0.8)
+        baseline = data.column('W_pv_nm', baseline_rows)[-1] if len(baseline_rows) else None
+        cliff = data.column('W_pv_nm', cliff_rows)[-1] if len(cliff_rows) else None
     
-    # Verify cliff amplification
-    if baseline and cliff:
-        amplification = cliff / baseline
-        checks.append((
-            f"{mat.upper()}: k_azi=0.0 ({baseline:.0f}nm) → k_azi=0.8 ({cliff:.0f}nm) = {amplification:.1f}×",
-            amplification > 1.0
-        ))
+        # Verify cliff amplification
+        if baseline and cliff:
+            amplification = cliff / baseline
+            amplification_by_material[mat] = float(amplification)
+            checks.append((
+                f"{mat.upper()}: k_azi=0.0 ({baseline:.0f}nm) → k_azi=0.8 ({cliff:.0f}nm) = {amplification:.1f}×",
+                amplification > 1.0
+            ))
     
-    print()
-
-# ─────────────────────────────────────────────────────────────────────────────
-# Verification assertions
-# ─────────────────────────────────────────────────────────────────────────────
-
-print("=" * 70)
-print("VERIFICATION ASSERTIONS")
-print("=" * 70)
-
-# All cases have task IDs (real FEM provenance)
-has_task_ids = all(case.get('task_id') for case in data)
-checks.append(("All cases have Inductiva task IDs", has_task_ids))
-
-# At least 3 different materials tested
-checks.append((f"At least 3 materials tested (actual: {len(materials)})", len(materials) >= 3))
-
-# Total cases match expected
-checks.append((f"Total cases = {len(data)} (expected 15)", len(data) == 15))
-
-all_pass = True
-for desc, result in checks:
-    status = "PASS" if result else "FAIL"
-    if not result:
-        all_pass = False
-    print(f"  [{status}] {desc}")
-
-# ─────────────────────────────────────────────────────────────────────────────
-# Conclusion
-# ─────────────────────────────────────────────────────────────────────────────
-
-print("\n" + "=" * 70)
-if all_pass:
-    print("ALL VERIFICATIONS PASSED")
-    print()
-    print("CONCLUSION: The chaos cliff is MATERIAL-INVARIANT.")
-    print("It exists for InP, GaN, AND AlN — not just silicon.")
-    print("Competitors cannot avoid the cliff by switching substrate materials.")
-    print("This is a PHYSICS phenomenon, not a material-specific artifact.")
-else:
-    print("SOME VERIFICATIONS FAILED")
-    sys.exit(1)
-
-print("=" * 70)
+        print()
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Verification assertions
+    # ─────────────────────────────────────────────────────────────────────────
+
+    print("=" * 70)
+    print("VERIFICATION ASSERTIONS")
+    print("=" * 70)
+
+    # All cases have task IDs (real FEM provenance)
+    has_task_ids = bool(np.all(data.column('task_id') != ''))
+    checks.append(("All cases have Inductiva task IDs", has_task_ids))
+
+    # At least 3 different materials tested
+    checks.append((f"At least 3 materials tested (actual: {len(materials)})", len(materials) >= 3))
+
+    # Total cases match expected
+    checks.append((f"Total cases = {len(data)} (expected 15)", len(data) == 15))
+
+    all_pass = True
+    for desc, ok in checks:
+        status = "PASS" if ok else "FAIL"
+        if not ok:
+            all_pass = False
+        print(f"  [{status}] {desc}")
+
+    result = CheckResult("material_invariance", tuple(checks), {
+        "n_cases": len(data),
+        "materials": materials,
+        "amplification": amplification_by_material,
+    })
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Conclusion
+    # ─────────────────────────────────────────────────────────────────────────
+
+    print("\n" + "=" * 70)
+    if all_pass:
+        print("ALL VERIFICATIONS PASSED")
+        print()
+        print("CONCLUSION: The chaos cliff is MATERIAL-INVARIANT.")
+        print("It exists for InP, GaN, AND AlN — not just silicon.")
+        print("Competitors cannot avoid the cliff by switching substrate materials.")
+        print("This is a PHYSICS phenomenon, not a material-specific artifact.")
+    else:
+        print("SOME VERIFICATIONS FAILED")
+        return result
+
+    print("=" * 70)
+    return result
+
+def main():
+    return 0 if check_material_invariance(verbose=True).passed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,67 +12,89 @@ Method: CalculiX FEM (S4 shell + SPRING1), LOCAL execution
 import json
 import os
 import sys
-import numpy as np
+
+from verification import CheckResult, printer
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_FILE = os.path.join(os.path.dirname(SCRIPT_DIR), "EVIDENCE", "multi_die_comparison.json")
 
-print("=" * 70)
-print("MULTI-DIE SCALING VERIFICATION (Local CalculiX FEM)")
-print("=" * 70)
-
-with open(DATA_FILE) as f:
-    raw = json.load(f)
-
-meta = raw.get("metadata", {})
-summaries = raw.get("summaries", [])
-details = raw.get("details", [])
-
-print(f"\nMethod: {meta.get('method', 'Unknown')}")
-print(f"Solver: {meta.get('solver_path', meta.get('solver', 'Unknown'))}")
-print(f"Total FEM runs: {len(details)}")
-
-print("\n" + "-" * 70)
-for s in summaries:
-    print(f"  {s['config']:<20}: {s['samples']} runs, "
-          f"warpage {s.get('warpage_min_um', 0):.4f} – {s.get('warpage_max_um', 0):.4f} µm")
-print("-" * 70)
-
-# Assertions
-print("\n" + "=" * 70)
-print("VERIFICATION ASSERTIONS")
-print("=" * 70)
-
-checks = []
-
-# 1. Method is real FEM
-checks.append(("Method is CalculiX FEM", "CalculiX" in meta.get("method", "")))
-
-# 2. At least 15 real runs
-checks.append((f"Total runs = {len(details)} (>= 15)", len(details) >= 15))
-
-# 3. Warpage values are physically reasonable (> 0)
-if details:
-    all_wp = [d['warpage_um'] for d in details]
-    checks.append((f"All warpage > 0 (min={min(all_wp):.4f} µm)", min(all_wp) >= 0))
-
-# 4. Multiple HBM configs tested
-n_configs = len(set(d['n_hbm'] for d in details))
-checks.append((f"Tested {n_configs} HBM configurations (>= 3)", n_configs >= 3))
-
-all_pass = all(r for _, r in checks)
-for desc, result in checks:
-    print(f"  [{'PASS' if result else 'FAIL'}] {desc}")
-
-print("\n" + "=" * 70)
-if all_pass:
-    print("ALL VERIFICATIONS PASSED")
-    print()
-    print("CONCLUSION: Multi-die warpage scaling confirmed by LOCAL CalculiX FEM.")
-    print("Note: Absolute values are small due to simplified shell model.")
-    print("The full warpage crisis requires 3D solid elements with multilayer")
-    print("material stack, as in the 1,112-case Inductiva FEM database.")
-else:
-    print("SOME VERIFICATIONS FAILED")
-    sys.exit(1)
-print("=" * 70)
+def check_multi_die_scaling(verbose=False):
+    """
+    Check the local CalculiX multi-die runs (JSON fields only, no NumPy).
+
+    Returns:
+        CheckResult with metrics n_runs, n_configs, warpage_min_um, warpage_max_um
+    """
+    print = printer(verbose)
+    print("=" * 70)
+    print("MULTI-DIE SCALING VERIFICATION (Local CalculiX FEM)")
+    print("=" * 70)
+
+    with open(DATA_FILE) as f:
+        raw = json.load(f)
+
+    meta = raw.get("metadata", {})
+    summaries = raw.get("summaries", [])
+    details = raw.get("details", [])
+
+    print(f"\nMethod: {meta.get('method', 'Unknown')}")
+    print(f"Solver: {meta.get('solver_path', meta.get('solver', 'Unknown'))}")
+    print(f"Total FEM runs: {len(details)}")
+
+    print("\n" + "-" * 70)
+    for s in summaries:
+        print(f"  {s['config']:<20}: {s['samples']} runs, "
+              f"warpage {s.get('warpage_min_um', 0):.4f} – {s.get('warpage_max_um', 0):.4f} µm")
+    print("-" * 70)
+
+    # Assertions
+    print("\n" + "=" * 70)
+    print("VERIFICATION ASSERTIONS")
+    print("=" * 70)
+
+    checks = []
+
+    # 1. Method is real FEM
+    checks.append(("Method is CalculiX FEM", "CalculiX" in meta.get("method", "")))
+
+    # 2. At least 15 real runs
+    checks.append((f"Total runs = {len(details)} (>= 15)", len(details) >= 15))
+
+    # 3. Warpage values are physically reasonable (> 0)
+    if details:
+        all_wp = [d['warpage_um'] for d in details]
+        checks.append((f"All warpage > 0 (min={min(all_wp):.4f} µm)", min(all_wp) >= 0))
+
+    # 4. Multiple HBM configs tested
+    n_configs = len(set(d['n_hbm'] for d in details))
+    checks.append((f"Tested {n_configs} HBM configurations (>= 3)", n_configs >= 3))
+
+    all_pass = all(r for _, r in checks)
+    result = CheckResult("multi_die_scaling", tuple(checks), {
+        "n_runs": len(details),
+        "n_configs": n_configs,
+        "warpage_min_um": min((d['warpage_um'] for d in details), default=None),
+        "warpage_max_um": max((d['warpage_um'] for d in details), default=None),
+    })
+    for desc, ok in checks:
+        print(f"  [{'PASS' if ok else 'FAIL'}] {desc}")
+
+    print("\n" + "=" * 70)
+    if all_pass:
+        print("ALL VERIFICATIONS PASSED")
+        print()
+        print("CONCLUSION: Multi-die warpage scaling confirmed by LOCAL CalculiX FEM.")
+        print("Note: Absolute values are small due to simplified shell model.")
+        print("The full warpage crisis requires 3D solid elements with multilayer")
+        print("material stack, as in the 1,112-case Inductiva FEM database.")
+    else:
+        print("SOME VERIFICATIONS FAILED")
+        return result
+    print("=" * 70)
+    return result
+
+def main():
+    return 0 if check_multi_die_scaling(verbose=True).passed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
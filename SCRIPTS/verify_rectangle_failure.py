@@ -9,53 +9,64 @@ on rectangular substrates.
 Data source: rectangular_substrates_FINAL.json (Inductiva Cloud HPC, CalculiX)
 """
 
-import json
-import os
 import sys
-import numpy as np
 
-def main():
+from verification import CheckResult, printer
+
+def check_rectangle_failure(verbose=False):
+    """
+    Check that k_azi leaves warpage unchanged within every panel/load group.
+
+    Returns:
+        CheckResult with one check per group and metrics n_cases,
+        max_variation_percent
+    """
+    import numpy as np
+    from evidence_store import load_table
+
+    print = printer(verbose)
     print("="*60)
     print("VERIFICATION: Azimuthal k_azi Has Zero Effect on Rectangles")
     print("="*60)
     
-    # Load data
-    data_path = os.path.join(os.path.dirname(__file__), "..", "EVIDENCE", "rectangular_substrates_FINAL.json")
-    with open(data_path) as f:
-        cases = json.load(f)
+    # Load data (columnar cache of rectangular_substrates_FINAL.json)
+    cases = load_table("rectangular")
     
     print(f"\nLoaded {len(cases)} FEA cases")
-    print(f"All cases have Inductiva task_id: {all('task_id' in c for c in cases)}")
+    print(f"All cases have Inductiva task_id: {bool(np.all(cases['task_id'] != ''))}")
     
     # Group by panel size and load type
-    groups = {}
-    for case in cases:
-        key = f"{case['panel']}_{case['load']}"
-        if key not in groups:
-            groups[key] = []
-        groups[key].append(case)
+    keys = np.char.add(np.char.add(cases['panel'], "_"), cases['load'])
+    group_keys, group_of = np.unique(keys, return_inverse=True)
+    k_azi_all = cases['k_azi']
+    warpage_all = cases['W_pv_nm']
     
     print(f"\n{'Panel_Load':<25s} {'k_azi range':<15s} {'Warpage range (nm)':<20s} {'Max variation':<15s} {'Verdict'}")
     print("-"*90)
     
-    all_pass = True
-    for key, group_cases in sorted(groups.items()):
-        k_azi_values = [c['k_azi'] for c in group_cases]
-        warpages = [c['W_pv_nm'] for c in group_cases]
+    checks = []
+    variations = []
+    for g, key in enumerate(group_keys):
+        k_azi_values = k_azi_all[group_of == g]
+        warpages = warpage_all[group_of == g]
         
-        w_min = min(warpages)
-        w_max = max(warpages)
+        w_min = warpages.min()
+        w_max = warpages.max()
         variation = (w_max - w_min) / w_min * 100 if w_min > 0 else 0
         
         verdict = "PASS (0% effect)" if variation < 1.0 else "FAIL"
-        if verdict == "FAIL":
-            all_pass = False
+        variations.append(variation)
+        checks.append((f"{key}: k_azi variation {variation:.4f}% < 1%", variation < 1.0))
         
         print(f"  {key:<23s} {min(k_azi_values):.1f}-{max(k_azi_values):.1f}         "
               f"{w_min:.2f}-{w_max:.2f}         {variation:.4f}%         {verdict}")
     
+    result = CheckResult("rectangle_failure", tuple(checks), {
+        "n_cases": len(cases),
+        "max_variation_percent": float(max(variations)),
+    })
     print(f"\n{'='*60}")
-    if all_pass:
+    if result.passed:
         print("RESULT: ALL GROUPS PASS")
         print("  Azimuthal stiffness modulation has ZERO EFFECT on rectangular substrates.")
         print("  This confirms the central claim of Patent 2.")
@@ -63,15 +74,18 @@ def main():
         print(f"  All task_ids traceable to Inductiva Cloud HPC runs")
     else:
         print("RESULT: SOME GROUPS FAILED — investigation needed")
-        sys.exit(1)
+        return result
     
     # Print sample task IDs for traceability
     print(f"\nSample task IDs:")
-    for case in cases[:5]:
-        print(f"  {case['case_id']}: {case['task_id']}")
+    for case_id, task_id in zip(cases['case_id'][:5], cases['task_id'][:5]):
+        print(f"  {case_id}: {task_id}")
     
     print(f"\n{'='*60}")
-    return 0
+    return result
+
+def main():
+    return 0 if check_rectangle_failure(verbose=True).passed else 1
 
 if __name__ == "__main__":
     sys.exit(main())
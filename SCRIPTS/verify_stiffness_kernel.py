@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+VERIFY: Fused Cartesian Stiffness Kernel and Laplacian Backends
+
+compute_cartesian_stiffness_into() computes K(x,y), M_T and ∇²M_T in
+caller-supplied buffers with in-place ufuncs. This script checks it
+against a straightforward allocate-everything implementation of the
+Cartesian Stiffness Law:
+
+1. float64 results agree to round-off for every thermal pattern
+2. Supplied buffers are filled and returned, not replaced
+3. float32 buffers stay within single-precision tolerance
+4. The Laplacian backends converge at their design order on a Gaussian
+   hotspot (stencil: 2nd, stencil9: 4th, spectral: round-off)
+5. A (N, ny, nx) batch, whole or chunked, matches panel-by-panel calls
+
+Run: python verify_stiffness_kernel.py
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from compute_cartesian_stiffness import (
+    ALPHA_GLASS, E_GLASS, NU_GLASS, H_GLASS, PANEL_WIDTH, PANEL_HEIGHT, K_MIN, K_MAX,
+    LAPLACIAN_BACKENDS, generate_thermal_field, compute_laplacian,
+    compute_cartesian_stiffness, compute_cartesian_stiffness_into,
+    compute_cartesian_stiffness_batch,
+)
+from verification import CheckResult, printer
+
+PATTERNS = ["die_array", "uniform", "gradient", "scan", "hotspot"]
+
+def reference_cartesian_stiffness(T, dx, dy):
+    """Unfused reference: one temporary per step, float64 throughout."""
+    M_T = (ALPHA_GLASS * E_GLASS * H_GLASS**2) / (12 * (1 - NU_GLASS)) * T
+
+    lap = np.zeros_like(M_T)
+    lap[1:-1, 1:-1] = (
+        (M_T[0:-2, 1:-1] + M_T[2:, 1:-1] - 2 * M_T[1:-1, 1:-1]) / dy**2
+        + (M_T[1:-1, 0:-2] + M_T[1:-1, 2:] - 2 * M_T[1:-1, 1:-1]) / dx**2
+    )
+    lap[0, :] = lap[1, :]
+    lap[-1, :] = lap[-2, :]
+    lap[:, 0] = lap[:, 1]
+    lap[:, -1] = lap[:, -2]
+
+    lap_abs = np.abs(lap)
+    lap_max = np.max(lap_abs)
+    lap_norm = lap_abs / lap_max if lap_max > 0 else np.zeros_like(lap_abs)
+    return K_MIN + (K_MAX - K_MIN) * lap_norm, M_T, lap
+
+def check_stiffness_kernel(verbose=False):
+    """
+    Check the fused kernel, the Laplacian backends and the batched API.
+
+    Returns:
+        CheckResult with metrics float32_rel_err, convergence_order
+        (per backend) and batch_speedup on coarse grids
+    """
+    print = printer(verbose)
+    print("=" * 60)
+    print("VERIFICATION: Fused Cartesian Stiffness Kernel")
+    print("=" * 60)
+
+    nx, ny = 120, 97
+    dx = PANEL_WIDTH / (nx - 1)
+    dy = PANEL_HEIGHT / (ny - 1)
+    print(f"\nGrid: {nx} × {ny}, patterns: {', '.join(PATTERNS)}")
+
+    checks = []
+
+    # Check 1: float64 matches the reference to round-off, through both entry points
+    def close(a, r):
+        return np.max(np.abs(a - r)) <= 1e-12 * max(np.max(np.abs(r)), 1e-300)
+
+    buffers = tuple(np.empty((ny, nx)) for _ in range(3))
+    for pattern in PATTERNS:
+        T, _, _ = generate_thermal_field(nx, ny, pattern=pattern)
+        ref = reference_cartesian_stiffness(T, dx, dy)
+        wrapped = compute_cartesian_stiffness(T, dx, dy)
+        fused = compute_cartesian_stiffness_into(T, dx, dy, *buffers)
+        same = all(close(a, r) and np.array_equal(a, b)
+                   for a, b, r in zip(wrapped, fused, ref))
+        checks.append((f"{pattern}: float64 output matches reference", same))
+
+    # Check 2: the caller's buffers are the ones returned
+    checks.append(("Supplied out/M_T/lap_M_T buffers are reused",
+                   all(a is b for a, b in zip(fused, buffers))))
+
+    # Check 3: float32 path
+    T, _, _ = generate_thermal_field(nx, ny, pattern="die_array")
+    K_ref, _, _ = reference_cartesian_stiffness(T, dx, dy)
+    K32, M32, lap32 = compute_cartesian_stiffness_into(T.astype(np.float32), dx, dy)
+    rel_err = np.max(np.abs(K32 - K_ref)) / (K_MAX - K_MIN)
+    print(f"float32 max error: {rel_err:.2e} of the stiffness range")
+    checks.append(("float32 buffers stay float32",
+                   K32.dtype == M32.dtype == lap32.dtype == np.float32))
+    checks.append(("float32 K within 1e-5 of the stiffness range", rel_err < 1e-5))
+
+    # Check 4: backend accuracy against the analytic Laplacian of a Gaussian
+    s = 0.05
+    errors = {}
+    for n in (50, 100):
+        x = np.linspace(-PANEL_WIDTH/2, PANEL_WIDTH/2, n)
+        y = np.linspace(-PANEL_HEIGHT/2, PANEL_HEIGHT/2, n)
+        R2 = x[None, :]**2 + y[:, None]**2
+        f = np.exp(-R2 / s**2)
+        exact = (4 * R2 / s**4 - 4 / s**2) * f
+        for backend in LAPLACIAN_BACKENDS:
+            lap = compute_laplacian(f, x[1] - x[0], y[1] - y[0], backend=backend)
+            errors[backend, n] = np.max(np.abs(lap - exact)) / np.max(np.abs(exact))
+
+    print(f"\n{'Backend':<10} {'error n=50':>12} {'error n=100':>12} {'order':>7}")
+    for backend in LAPLACIAN_BACKENDS:
+        e50, e100 = errors[backend, 50], errors[backend, 100]
+        print(f"{backend:<10} {e50:>12.2e} {e100:>12.2e} {np.log2(e50 / e100):>7.1f}")
+    checks.append(("stencil converges at 2nd order",
+                   np.log2(errors["stencil", 50] / errors["stencil", 100]) > 1.8))
+    checks.append(("stencil9 converges at 4th order",
+                   np.log2(errors["stencil9", 50] / errors["stencil9", 100]) > 3.6))
+    checks.append(("spectral error below 1e-8 on the coarse grid", errors["spectral", 50] < 1e-8))
+
+    # Check 5: batched API, per-panel normalization, chunking
+    T_batch, _, _ = generate_thermal_field(nx, ny, pattern=PATTERNS * 40)
+    n_batch = len(T_batch)
+    for backend in LAPLACIAN_BACKENDS:
+        batch = compute_cartesian_stiffness(T_batch, dx, dy, backend=backend)
+        chunked = compute_cartesian_stiffness_batch(T_batch, dx, dy, backend=backend,
+                                                    memory_budget=3 * 4 * nx * ny * 8)
+        single = [compute_cartesian_stiffness(T_i, dx, dy, backend=backend) for T_i in T_batch]
+        same = all(np.array_equal(a, c) and np.array_equal(a, np.stack(s))
+                   for a, c, s in zip(batch, chunked, zip(*single)))
+        checks.append((f"{backend}: batch of {n_batch}, whole and chunked, matches per-panel", same))
+
+    # Per-panel overhead dominates on coarse screening grids
+    n_coarse = 33
+    T_coarse, _, _ = generate_thermal_field(n_coarse, n_coarse, pattern=PATTERNS * 400)
+    dxc, dyc = PANEL_WIDTH / (n_coarse - 1), PANEL_HEIGHT / (n_coarse - 1)
+    t0 = time.perf_counter()
+    for T_i in T_coarse:
+        compute_cartesian_stiffness(T_i, dxc, dyc)
+    t_loop = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    compute_cartesian_stiffness_batch(T_coarse, dxc, dyc)
+    t_batch = time.perf_counter() - t0
+    print(f"\n{len(T_coarse)} panels at {n_coarse} × {n_coarse}: loop {t_loop*1e3:.0f} ms, "
+          f"batched {t_batch*1e3:.0f} ms ({t_loop / t_batch:.1f}×)")
+
+    print(f"\n{'='*60}")
+    print("VERIFICATION CHECKS:")
+    all_pass = True
+    for name, ok in checks:
+        status = "PASS" if ok else "FAIL"
+        if not ok:
+            all_pass = False
+        print(f"  [{status}] {name}")
+
+    result = CheckResult("stiffness_kernel", tuple(checks), {
+        "float32_rel_err": rel_err,
+        "convergence_order": {b: float(np.log2(errors[b, 50] / errors[b, 100]))
+                              for b in LAPLACIAN_BACKENDS},
+        "batch_speedup": t_loop / t_batch,
+    })
+    if all_pass:
+        print(f"\nRESULT: ALL CHECKS PASS")
+        print(f"  The fused kernel reproduces the Cartesian Stiffness Law, and every")
+        print(f"  Laplacian backend converges at its design order.")
+    else:
+        print(f"\nRESULT: SOME CHECKS FAILED")
+        return result
+
+    print(f"{'='*60}")
+    return result
+
+def main():
+    return 0 if check_stiffness_kernel(verbose=True).passed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
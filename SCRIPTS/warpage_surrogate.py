@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+WARPAGE SURROGATE: Gaussian-Process Screening Model for W_pv
+
+EVIDENCE/inverse_design_result.json screened 200 candidate designs with a
+surrogate and sent only 5 to FEM. This module is an open surrogate of
+that kind, trained on the parameter → W_pv records of the sweep evidence:
+
+    kazi_dense, harmonic, material, kazi_boundary_mc    (evidence_store tables)
+
+Model:
+    target      log10(W_pv_nm)  (W_pv spans 460 nm .. 47 mm)
+    features    k_azi, n_harmonic, bow, log10(stiffness) standardized;
+                load, material and source table one-hot. A missing
+                numeric value is set to the training mean and a missing
+                category to its default level (n_harmonic = 2, load
+                "default", material "glass")
+    kernel      σ² exp(-½ Σ_f (x_f - x'_f)² / ℓ_f²) + σ²·τ²_s δ, with one
+                length scale per numeric feature and one shared by the
+                one-hot columns (automatic relevance determination), and
+                one noise ratio τ²_s per source table (the sweeps differ
+                in mesh and in how reproducible their cases are)
+    fit         σ² is profiled out of the log marginal likelihood
+                analytically; a grid search over a single shared ℓ and τ²
+                (one Cholesky per point) seeds L-BFGS-B over all log ℓ_f
+                and log τ²_s
+
+Prediction is a pair of GEMMs per chunk: the cross-kernel k* against the
+training set, then the mean k*ᵀα and the variance σ²(1 + τ²_s - |L⁻¹k*|²)
+with L⁻¹ precomputed. Chunks are sized by PREDICT_MEMORY_BUDGET. On one
+core (95 training cases) this measures about 0.85 M predictions/s with
+the variance and 2 M/s mean-only; float32 cross-kernels would double
+that but lose the variance to cancellation in 1 + τ² - |L⁻¹k*|².
+
+select_for_solver() keeps only the candidates a solver needs to see:
+those whose predictive interval straddles the spec limit. Mean-only
+prediction (return_std=False) skips the L⁻¹ product for pure ranking.
+
+Run: python warpage_surrogate.py
+"""
+
+import json
+from typing import NamedTuple
+
+import numpy as np
+import scipy.linalg
+import scipy.optimize
+
+# Evidence tables used for training, in feature-encoding order
+TRAINING_TABLES = ("kazi_dense", "harmonic", "material", "kazi_boundary_mc")
+
+NUMERIC_FEATURES = ("k_azi", "n_harmonic", "bow", "log10_stiffness")
+CATEGORICAL_FEATURES = ("load", "material", "source")
+DEFAULTS = {"n_harmonic": 2.0, "load": "default", "material": "glass"}
+
+# Seed grid: shared RBF length scale (standardized units) and noise / signal variance
+LENGTH_SCALES = np.geomspace(0.2, 20.0, 25)
+NOISE_RATIOS = np.geomspace(1e-6, 1e-1, 11)
+
+# Bounds of the refined hyperparameters
+LOG_LENGTH_SCALE_BOUNDS = (np.log(0.05), np.log(200.0))
+LOG_NOISE_RATIO_BOUNDS = (np.log(1e-8), np.log(1.0))
+
+# Cross-kernel bytes per prediction chunk. Cache-sized chunks keep the
+# exp and the L⁻¹ GEMM in L2: 2 MiB runs ~1.5× faster than 32 MiB.
+PREDICT_MEMORY_BUDGET = 2 * 2**20
+
+# =============================================================================
+# TRAINING DATA
+# =============================================================================
+
+def training_columns(tables=TRAINING_TABLES):
+    """
+    Concatenate the evidence tables into feature columns plus W_pv_nm.
+
+    Returns:
+        dict of equal-length arrays: the raw inputs of NUMERIC_FEATURES
+        (stiffness rather than its log), CATEGORICAL_FEATURES and W_pv_nm;
+        missing values are NaN / ""
+    """
+    from evidence_store import load_table
+
+    parts = []
+    for name in tables:
+        table = load_table(name)
+        n = len(table)
+        part = {"source": np.full(n, name)}
+        for col in ("k_azi", "n_harmonic", "bow", "stiffness", "W_pv_nm"):
+            part[col] = np.asarray(table[col], dtype=float) if col in table else np.full(n, np.nan)
+        for col in ("load", "material"):
+            part[col] = np.asarray(table[col]) if col in table else np.full(n, "")
+        parts.append(part)
+    return {col: np.concatenate([p[col] for p in parts]) for col in parts[0]}
+
+# =============================================================================
+# MODEL
+# =============================================================================
+
+def _n_rows(columns):
+    return max(np.size(v) for v in columns.values())
+
+def _raw_numeric(columns, name, n):
+    source = "stiffness" if name == "log10_stiffness" else name
+    if source not in columns:
+        return np.full(n, DEFAULTS.get(name, np.nan))
+    values = np.broadcast_to(np.asarray(columns[source], dtype=float), (n,))
+    if name == "log10_stiffness":
+        values = np.log10(values)
+    if name in DEFAULTS:
+        values = np.where(np.isnan(values), DEFAULTS[name], values)
+    return values
+
+def _raw_category(columns, name, n):
+    default = DEFAULTS.get(name, "")
+    if name not in columns:
+        return np.full(n, default)
+    values = np.broadcast_to(np.asarray(columns[name]).astype(str), (n,))
+    return np.where(values == "", default, values)
+
+def feature_spec(columns):
+    """Standardization (mean, std) per numeric feature and levels per category."""
+    n = _n_rows(columns)
+    numeric = {}
+    for name in NUMERIC_FEATURES:
+        present = _raw_numeric(columns, name, n)
+        present = present[~np.isnan(present)]
+        std = present.std() if len(present) > 1 else 0.0
+        numeric[name] = (float(present.mean()) if len(present) else 0.0, float(std) if std > 0 else 1.0)
+    levels = {name: sorted(set(_raw_category(columns, name, n).tolist()))
+              for name in CATEGORICAL_FEATURES}
+    return {"numeric": numeric, "levels": levels}
+
+def encode_features(spec, columns):
+    """
+    Feature matrix of candidate columns.
+
+    Args:
+        spec: feature_spec() of the training columns
+        columns: dict of arrays (scalars broadcast) keyed like
+            training_columns(); absent keys take their defaults
+
+    Returns:
+        (n, d) array: standardized numerics, then one-hot categories
+    """
+    n = _n_rows(columns)
+    blocks = []
+    for name in NUMERIC_FEATURES:
+        mean, std = spec["numeric"][name]
+        values = _raw_numeric(columns, name, n)
+        blocks.append(((np.where(np.isnan(values), mean, values) - mean) / std)[:, None])
+    for name in CATEGORICAL_FEATURES:
+        values = _raw_category(columns, name, n)
+        blocks.append((values[:, None] == np.array(spec["levels"][name])[None, :]).astype(float))
+    return np.hstack(blocks)
+
+def _feature_groups(spec):
+    """Length-scale index of every encoded column: one per numeric, one for all one-hots."""
+    n_onehot = sum(len(levels) for levels in spec["levels"].values())
+    return np.r_[np.arange(len(NUMERIC_FEATURES)), np.full(n_onehot, len(NUMERIC_FEATURES))]
+
+def _squared_distances(A, B, B_sq):
+    """|a - b|² for all pairs via one GEMM, clipped at 0."""
+    D2 = A @ B.T
+    D2 *= -2.0
+    D2 += np.einsum("ij,ij->i", A, A)[:, None]
+    D2 += B_sq[None, :]
+    return np.maximum(D2, 0.0, out=D2)
+
+def _source_onehot(spec, X):
+    """The one-hot source columns of an encoded feature matrix."""
+    return X[:, -len(spec["levels"]["source"]):]
+
+def _profile_likelihood(Z, r, noise_ratio):
+    """
+    Log marginal likelihood with σ² profiled out (constants dropped).
+
+    noise_ratio is τ² per training case (or one shared value).
+
+    Returns:
+        (lml, L, signal_var), or (-inf, None, None) if K is not positive definite
+    """
+    n = len(r)
+    R = np.exp(-0.5 * _squared_distances(Z, Z, np.einsum("ij,ij->i", Z, Z)))
+    R[np.diag_indices(n)] += noise_ratio
+    try:
+        L = np.linalg.cholesky(R)
+    except np.linalg.LinAlgError:
+        return -np.inf, None, None
+    v = scipy.linalg.solve_triangular(L, r, lower=True)
+    signal_var = v @ v / n
+    return -0.5 * n * np.log(signal_var) - np.log(np.diag(L)).sum(), L, signal_var
+
+class SurrogatePrediction(NamedTuple):
+    """Predictions per candidate; log10 quantities are of W_pv in nm."""
+    mean_log10: np.ndarray
+    std_log10: np.ndarray         # None for mean-only predictions
+
+    @property
+    def W_pv_nm(self):
+        """Median prediction (10 ** mean of the log)."""
+        return 10.0 ** self.mean_log10
+
+    def interval_nm(self, z=2.0):
+        """(low, high) W_pv bounds at ±z standard deviations of the log."""
+        return (10.0 ** (self.mean_log10 - z * self.std_log10),
+                10.0 ** (self.mean_log10 + z * self.std_log10))
+
+class WarpageSurrogate:
+    """
+    Fitted GP regression of log10(W_pv) on the encoded case parameters.
+
+    Build with WarpageSurrogate.fit(columns) or WarpageSurrogate.load(path).
+    """
+
+    def __init__(self, spec, length_scales, noise_ratios, signal_var, y_mean, Z, alpha, L_inv):
+        self.spec = spec                    # feature means/stds and category levels
+        self.length_scales = length_scales  # ℓ per feature group (see _feature_groups)
+        self.noise_ratios = noise_ratios    # τ²_s = noise variance / σ², per source level
+        self.signal_var = signal_var        # σ²
+        self.y_mean = y_mean
+        self.Z = Z                          # (n, d) training features divided by ℓ
+        self.alpha = alpha                  # K⁻¹ (y - y_mean), K in units of σ²
+        self.L_inv = L_inv                  # inverse Cholesky factor of K / σ²
+        self._scale = length_scales[_feature_groups(spec)]
+        self._Z_sq = np.einsum("ij,ij->i", Z, Z)
+
+    @classmethod
+    def fit(cls, columns, length_scales=LENGTH_SCALES, noise_ratios=NOISE_RATIOS):
+        """
+        Fit the GP on columns with a W_pv_nm target.
+
+        Args:
+            columns: training_columns() or any dict with the same keys
+            length_scales, noise_ratios: Seed grid for the shared-ℓ search
+
+        Returns:
+            WarpageSurrogate at the refined maximum-likelihood hyperparameters
+        """
+        spec = feature_spec(columns)
+        X = encode_features(spec, columns)
+        y = np.log10(np.asarray(columns["W_pv_nm"], dtype=float))
+        y_mean = float(y.mean())
+        r = y - y_mean
+        groups = _feature_groups(spec)
+        n_groups = groups.max() + 1
+        source = _source_onehot(spec, X)
+
+        # Seed: one shared length scale
+        seed = max(((_profile_likelihood(X / ls, r, tau2)[0], ls, tau2)
+                    for ls in length_scales for tau2 in noise_ratios), key=lambda t: t[0])
+
+        # Refine: one length scale per feature group, one noise ratio per source
+        def negative_lml(p):
+            ls, tau2 = np.exp(p[:n_groups]), np.exp(p[n_groups:])
+            lml = _profile_likelihood(X / ls[groups], r, source @ tau2)[0]
+            return -lml if np.isfinite(lml) else 1e10
+
+        p0 = np.r_[np.full(n_groups, np.log(seed[1])), np.full(source.shape[1], np.log(seed[2]))]
+        bounds = ([LOG_LENGTH_SCALE_BOUNDS] * n_groups
+                  + [LOG_NOISE_RATIO_BOUNDS] * source.shape[1])
+        p = scipy.optimize.minimize(negative_lml, p0, method="L-BFGS-B", bounds=bounds).x
+        if negative_lml(p) > negative_lml(p0):
+            p = p0
+
+        ls, tau2 = np.exp(p[:n_groups]), np.exp(p[n_groups:])
+        Z = X / ls[groups]
+        _, L, signal_var = _profile_likelihood(Z, r, source @ tau2)
+        L_inv = scipy.linalg.solve_triangular(L, np.eye(len(r)), lower=True)
+        alpha = L_inv.T @ (L_inv @ r)
+        return cls(spec, ls, tau2, float(signal_var), y_mean, Z, alpha, L_inv)
+
+    def loo_residuals(self):
+        """Closed-form leave-one-out residuals of log10(W_pv): α_i / [K⁻¹]_ii."""
+        return self.alpha / np.einsum("ij,ij->j", self.L_inv, self.L_inv)
+
+    def encode(self, columns):
+        """Feature matrix of candidate columns (see encode_features)."""
+        return encode_features(self.spec, columns)
+
+    def predict(self, columns=None, X=None, return_std=True, memory_budget=PREDICT_MEMORY_BUDGET):
+        """
+        Predictive mean and standard deviation of log10(W_pv), in chunks.
+
+        Args:
+            columns: Candidate columns (see encode_features), or
+            X: An already encoded (m, d) feature matrix
+            return_std: Also compute the predictive standard deviation
+            memory_budget: Bytes of cross-kernel per chunk
+
+        Returns:
+            SurrogatePrediction (std_log10 is None without return_std)
+        """
+        if X is None:
+            X = self.encode(columns)
+        m, n = len(X), len(self.Z)
+        mean = np.empty(m)
+        var = np.empty(m) if return_std else None
+        chunk = max(1, memory_budget // (16 * n))
+        for i0 in range(0, m, chunk):
+            i1 = min(i0 + chunk, m)
+            Ks = _squared_distances(X[i0:i1] / self._scale, self.Z, self._Z_sq)
+            Ks *= -0.5
+            np.exp(Ks, out=Ks)
+            mean[i0:i1] = Ks @ self.alpha
+            if return_std:
+                V = Ks @ self.L_inv.T
+                noise = _source_onehot(self.spec, X[i0:i1]) @ self.noise_ratios
+                var[i0:i1] = 1.0 + noise - np.einsum("ij,ij->i", V, V)
+        mean += self.y_mean
+        std = np.sqrt(np.maximum(var, 0.0) * self.signal_var) if return_std else None
+        return SurrogatePrediction(mean, std)
+
+    def save(self, path):
+        """Write the fitted model to one .npz file."""
+        np.savez_compressed(
+            path, length_scales=self.length_scales, noise_ratios=self.noise_ratios, Z=self.Z,
+            alpha=self.alpha, L_inv=self.L_inv, scalars=np.array([self.signal_var, self.y_mean]),
+            spec=np.array(json.dumps(self.spec)))
+
+    @classmethod
+    def load(cls, path):
+        """Read a model written by save()."""
+        with np.load(path, allow_pickle=False) as z:
+            signal_var, y_mean = map(float, z["scalars"])
+            return cls(json.loads(str(z["spec"])), z["length_scales"], z["noise_ratios"],
+                       signal_var, y_mean, z["Z"], z["alpha"], z["L_inv"])
+
+# =============================================================================
+# SCREENING
+# =============================================================================
+
+def select_for_solver(prediction, spec_nm, z=2.0):
+    """
+    Split candidates by what the surrogate can decide on its own.
+
+    Args:
+        prediction: SurrogatePrediction
+        spec_nm: Upper W_pv limit [nm]
+        z: Width of the predictive interval in standard deviations
+
+    Returns:
+        (passing, ambiguous) boolean masks: passing candidates are below
+        spec even at +z σ; ambiguous ones straddle it and need a solver
+        run; the rest fail even at -z σ
+    """
+    low, high = prediction.interval_nm(z)
+    passing = high <= spec_nm
+    ambiguous = (low <= spec_nm) & ~passing
+    return passing, ambiguous
+
+# =============================================================================
+# MAIN DEMONSTRATION
+# =============================================================================
+
+def main():
+    import os
+    import tempfile
+    import time
+
+    print("=" * 72)
+    print("WARPAGE SURROGATE: Gaussian Process on the Sweep Evidence")
+    print("=" * 72)
+
+    columns = training_columns()
+    t0 = time.perf_counter()
+    model = WarpageSurrogate.fit(columns)
+    t_fit = time.perf_counter() - t0
+    print(f"\nTraining cases: {len(columns['W_pv_nm'])} from {', '.join(TRAINING_TABLES)}")
+    print(f"Fit: {t_fit*1e3:.0f} ms, σ = {np.sqrt(model.signal_var):.2f} decades")
+    print(f"Length scales: " + ", ".join(f"{name} {ls:.2g}" for name, ls in
+                                         zip(NUMERIC_FEATURES + ("categories",), model.length_scales)))
+
+    loo = model.loo_residuals()
+    print(f"\nLeave-one-out error of log10(W_pv), per table:")
+    for name in TRAINING_TABLES:
+        mask = columns["source"] == name
+        rms = np.sqrt(np.mean(loo[mask]**2))
+        print(f"  {name:<18} RMS {rms:.3f} decades  (×{10**rms:.2f})")
+
+    # The k_azi curve of the dense sweep, with its uncertainty band
+    k = np.linspace(0.0, 2.0, 9)
+    pred = model.predict({"k_azi": k, "source": "kazi_dense"})
+    low, high = pred.interval_nm()
+    print(f"\nkazi_dense source, predicted W_pv (±2σ):")
+    for ki, w, lo, hi in zip(k, pred.W_pv_nm, low, high):
+        print(f"  k_azi = {ki:4.2f}: {w:7.0f} nm  [{lo:7.0f}, {hi:7.0f}]")
+
+    # Throughput on a million candidates, and screening against a spec
+    m = 1_000_000
+    rng = np.random.default_rng(0)
+    candidates = {"k_azi": rng.uniform(0, 2, m), "n_harmonic": rng.choice([2, 4, 6], m),
+                  "load": rng.choice(["scan", "gradient_z"], m), "source": "harmonic"}
+    X = model.encode(candidates)
+    t0 = time.perf_counter()
+    pred = model.predict(X=X)
+    t_pred = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    model.predict(X=X, return_std=False)
+    t_mean = time.perf_counter() - t0
+    print(f"\n{m:,} candidates: {t_pred:.2f} s ({m / t_pred / 1e6:.1f} M predictions/s, mean + variance), "
+          f"{t_mean:.2f} s mean only")
+    spec_nm = 1500.0
+    passing, ambiguous = select_for_solver(pred, spec_nm)
+    print(f"Spec W_pv ≤ {spec_nm:.0f} nm: {passing.sum():,} pass outright, "
+          f"{ambiguous.sum():,} need a solver, {(~passing & ~ambiguous).sum():,} fail outright")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "surrogate.npz")
+        model.save(path)
+        again = WarpageSurrogate.load(path).predict(X=X[:1000])
+        same = np.array_equal(again.mean_log10, pred.mean_log10[:1000])
+        print(f"\nSaved model: {os.path.getsize(path) / 1024:.0f} KiB; reloaded predictions identical: {same}")
+    print("=" * 72)
+
+if __name__ == "__main__":
+    main()